@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+from functools import partial
 from typing import TYPE_CHECKING
 
 from homeassistant.const import (
@@ -16,12 +17,14 @@ from homeassistant.core import (
 )
 from homeassistant.helpers import issue_registry as ir
 
-from .const import DOMAIN, LOGGER, PLATFORMS
+from .const import DATA_REPAIR_MANAGER, DOMAIN, LOGGER, PLATFORMS
+from .references import async_remove_persistent_references_cache
 from .repairs import SpookRepairManager
 from .services import SpookServiceManager
 from .util import (
     async_forward_setup_entry,
-    async_setup_all_entity_ids_cache_invalidation,
+    async_setup_registry_snapshot,
+    async_verify_ectoplasm_index,
     link_sub_integrations,
     unlink_sub_integrations,
 )
@@ -87,7 +90,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     entry.async_on_unload(services.async_on_unload)
 
     # Who you gonna call? SpookRepairManager!
-    repairs = SpookRepairManager(hass)
+    repairs = SpookRepairManager(hass, options=entry.options)
+    hass.data[DATA_REPAIR_MANAGER] = repairs
+    entry.async_on_unload(partial(hass.data.pop, DATA_REPAIR_MANAGER, None))
+
+    # Apply changed options to the repairs right away, without reloading
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
 
     _ghost_busters_unsub: Callable[[], None] | None = None
 
@@ -117,13 +125,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # Set up the all entity ids cache invalidation
-    entry.async_on_unload(async_setup_all_entity_ids_cache_invalidation(hass))
+    # Set up the incrementally maintained snapshot of all known IDs
+    entry.async_on_unload(async_setup_registry_snapshot(hass))
+
+    # Verify the ectoplasm index used during setup, without delaying startup
+    entry.async_create_background_task(
+        hass, async_verify_ectoplasm_index(hass), "spook_verify_ectoplasm_index"
+    )
 
     # Yay, we didn't got spooked!
     return True
 
 
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the Spook repairs."""
+    if (repairs := hass.data.get(DATA_REPAIR_MANAGER)) is not None:
+        await repairs.async_update_options(entry.options)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -132,3 +151,4 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_remove_entry(hass: HomeAssistant, _: ConfigEntry) -> None:
     """Remove a config entry."""
     await hass.async_add_executor_job(unlink_sub_integrations, hass)
+    await async_remove_persistent_references_cache(hass)
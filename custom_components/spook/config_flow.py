@@ -6,9 +6,40 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.selector import (
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+)
 
-from .const import DOMAIN
+from .const import (
+    CONF_DISABLED_REPAIRS,
+    CONF_MAX_RUNTIME,
+    CONF_MIN_INTERVAL,
+    CONF_PLACEHOLDER_LIST_LIMIT,
+    CONF_PRESET,
+    CONF_REFERENCE_ANALYSIS_WORKERS,
+    CONF_REPAIR,
+    CONF_REPAIRS,
+    CONF_SLICE_LENGTH,
+    CONF_STARTUP_IDLE_PERIOD,
+    CONF_STARTUP_WINDOW,
+    DOMAIN,
+    PLACEHOLDER_LIST_LIMIT,
+    PRESET_BALANCED,
+    PRESETS,
+)
+from .util import get_ectoplasm_index
 
 
 class UptimeConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -16,6 +47,12 @@ class UptimeConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(_: ConfigEntry) -> SpookOptionsFlow:
+        """Get the options flow for Spook."""
+        return SpookOptionsFlow()
+
     async def async_step_user(
         self,
         user_input: dict[str, Any] | None = None,
@@ -59,3 +96,199 @@ class UptimeConfigFlow(ConfigFlow, domain=DOMAIN):
         """
         self.hass.data[DOMAIN] = "Boo!"
         return await self.async_step_restart_later()
+
+
+class SpookOptionsFlow(OptionsFlow):
+    """Options flow for Spook, to tune the workload of its repairs."""
+
+    def __init__(self) -> None:
+        """Initialize the options flow."""
+        self._options: dict[str, Any] = {}
+        self._repair = ""
+
+    async def async_step_init(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> ConfigFlowResult:
+        """Handle the preset and the repairs to disable.
+
+        Optionally, a single repair can be picked to fine-tune next.
+        """
+        if user_input is not None:
+            self._options = {
+                **{
+                    key: value
+                    for key, value in self.config_entry.options.items()
+                    if key not in (CONF_STARTUP_WINDOW, CONF_STARTUP_IDLE_PERIOD)
+                },
+                **{
+                    key: user_input[key]
+                    for key in (CONF_STARTUP_WINDOW, CONF_STARTUP_IDLE_PERIOD)
+                    if user_input.get(key) is not None
+                },
+                CONF_PRESET: user_input[CONF_PRESET],
+                CONF_DISABLED_REPAIRS: user_input.get(CONF_DISABLED_REPAIRS, []),
+                CONF_REFERENCE_ANALYSIS_WORKERS: int(
+                    user_input[CONF_REFERENCE_ANALYSIS_WORKERS]
+                ),
+                CONF_PLACEHOLDER_LIST_LIMIT: int(
+                    user_input[CONF_PLACEHOLDER_LIST_LIMIT]
+                ),
+            }
+            self._repair = user_input.get(CONF_REPAIR, "")
+            if self._repair:
+                return await self.async_step_repair()
+            return self.async_create_entry(data=self._options)
+
+        repairs = _get_repair_names()
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                vol.Schema(
+                    {
+                        vol.Required(
+                            CONF_PRESET, default=PRESET_BALANCED
+                        ): SelectSelector(
+                            SelectSelectorConfig(
+                                options=list(PRESETS),
+                                mode=SelectSelectorMode.LIST,
+                                translation_key=CONF_PRESET,
+                            )
+                        ),
+                        vol.Optional(CONF_DISABLED_REPAIRS): SelectSelector(
+                            SelectSelectorConfig(
+                                options=repairs,
+                                multiple=True,
+                                mode=SelectSelectorMode.DROPDOWN,
+                            )
+                        ),
+                        vol.Required(
+                            CONF_REFERENCE_ANALYSIS_WORKERS, default=0
+                        ): NumberSelector(
+                            NumberSelectorConfig(
+                                min=0,
+                                max=8,
+                                step=1,
+                                mode=NumberSelectorMode.BOX,
+                            )
+                        ),
+                        vol.Required(
+                            CONF_PLACEHOLDER_LIST_LIMIT,
+                            default=PLACEHOLDER_LIST_LIMIT,
+                        ): NumberSelector(
+                            NumberSelectorConfig(
+                                min=1,
+                                max=500,
+                                step=1,
+                                mode=NumberSelectorMode.BOX,
+                            )
+                        ),
+                        vol.Optional(CONF_STARTUP_WINDOW): NumberSelector(
+                            NumberSelectorConfig(
+                                min=0,
+                                max=600,
+                                step=1,
+                                unit_of_measurement="s",
+                                mode=NumberSelectorMode.BOX,
+                            )
+                        ),
+                        vol.Optional(CONF_STARTUP_IDLE_PERIOD): NumberSelector(
+                            NumberSelectorConfig(
+                                min=0,
+                                max=600,
+                                step=1,
+                                unit_of_measurement="s",
+                                mode=NumberSelectorMode.BOX,
+                            )
+                        ),
+                        vol.Optional(CONF_REPAIR): SelectSelector(
+                            SelectSelectorConfig(
+                                options=repairs,
+                                mode=SelectSelectorMode.DROPDOWN,
+                            )
+                        ),
+                    }
+                ),
+                self.config_entry.options,
+            ),
+        )
+
+    async def async_step_repair(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> ConfigFlowResult:
+        """Handle the settings of a single repair.
+
+        Settings left empty, fall back to those of the preset.
+        """
+        repairs = dict(self._options.get(CONF_REPAIRS, {}))
+
+        if user_input is not None:
+            if settings := {
+                key: user_input[key]
+                for key in (CONF_MIN_INTERVAL, CONF_SLICE_LENGTH, CONF_MAX_RUNTIME)
+                if user_input.get(key) is not None
+            }:
+                repairs[self._repair] = settings
+            else:
+                repairs.pop(self._repair, None)
+            return self.async_create_entry(
+                data={**self._options, CONF_REPAIRS: repairs}
+            )
+
+        preset = PRESETS[self._options[CONF_PRESET]]
+        return self.async_show_form(
+            step_id="repair",
+            data_schema=self.add_suggested_values_to_schema(
+                vol.Schema(
+                    {
+                        vol.Optional(CONF_MIN_INTERVAL): NumberSelector(
+                            NumberSelectorConfig(
+                                min=0.1,
+                                max=3600,
+                                step=0.1,
+                                unit_of_measurement="s",
+                                mode=NumberSelectorMode.BOX,
+                            )
+                        ),
+                        vol.Optional(CONF_SLICE_LENGTH): NumberSelector(
+                            NumberSelectorConfig(
+                                min=1,
+                                max=1000,
+                                step=1,
+                                unit_of_measurement="ms",
+                                mode=NumberSelectorMode.BOX,
+                            )
+                        ),
+                        vol.Optional(CONF_MAX_RUNTIME): NumberSelector(
+                            NumberSelectorConfig(
+                                min=10,
+                                max=60000,
+                                step=10,
+                                unit_of_measurement="ms",
+                                mode=NumberSelectorMode.BOX,
+                            )
+                        ),
+                    }
+                ),
+                repairs.get(self._repair, {}),
+            ),
+            description_placeholders={
+                "repair": self._repair,
+                "preset_min_interval": str(preset[CONF_MIN_INTERVAL]),
+                "preset_slice_length": str(preset[CONF_SLICE_LENGTH]),
+                "preset_max_runtime": str(preset[CONF_MAX_RUNTIME]),
+            },
+        )
+
+
+def _get_repair_names() -> list[str]:
+    """Return the names of all Spook repairs.
+
+    The name of a repair is its domain, followed by the name of its module.
+    """
+    return sorted(
+        f"{domain}_{module_path.rpartition('.')[2]}"
+        for domain, module_paths in get_ectoplasm_index().repairs.items()
+        for module_path in module_paths
+    )
@@ -1,13 +1,21 @@
 """Spook - Your homie."""
 
+from __future__ import annotations
+
 import logging
-from typing import Final
+from typing import TYPE_CHECKING, Final
 
 from homeassistant.const import Platform
+from homeassistant.util.hass_dict import HassKey
+
+if TYPE_CHECKING:
+    from .repairs import SpookRepairManager
 
 DOMAIN: Final = "spook"
 LOGGER = logging.getLogger(__package__)
 
+DATA_REPAIR_MANAGER: HassKey[SpookRepairManager] = HassKey(f"{DOMAIN}_repairs")
+
 PLATFORMS: Final = [
     Platform.BINARY_SENSOR,
     Platform.BUTTON,
@@ -18,3 +26,58 @@ PLATFORMS: Final = [
     Platform.SWITCH,
     Platform.TIME,
 ]
+
+CONF_DISABLED_REPAIRS: Final = "disabled_repairs"
+CONF_MAX_INTERVAL: Final = "max_interval"
+CONF_MAX_RUNTIME: Final = "max_runtime"
+CONF_MIN_INTERVAL: Final = "min_interval"
+CONF_PLACEHOLDER_LIST_LIMIT: Final = "placeholder_list_limit"
+CONF_PRESET: Final = "preset"
+CONF_REFERENCE_ANALYSIS_WORKERS: Final = "reference_analysis_workers"
+CONF_REPAIR: Final = "repair"
+CONF_REPAIRS: Final = "repairs"
+CONF_SLICE_LENGTH: Final = "slice_length"
+CONF_STARTUP_IDLE_PERIOD: Final = "startup_idle_period"
+CONF_STARTUP_WINDOW: Final = "startup_window"
+
+# Number of IDs listed in the placeholders of an issue, at most, by default;
+# the full lists are available through the repairs.list_references action
+PLACEHOLDER_LIST_LIMIT: Final = 25
+
+PRESET_LOW_POWER: Final = "low_power"
+PRESET_BALANCED: Final = "balanced"
+PRESET_THOROUGH: Final = "thorough"
+
+# Inspection settings of the presets: the minimum and maximum seconds between
+# inspections of a repair, the length in milliseconds of the slices an
+# inspection runs in, before it yields back to the event loop, and the
+# milliseconds an inspection may run in total, before the rest of its work
+# is deferred to the next inspection. After startup,
+# the seconds over which the first inspections are spread, and the seconds
+# Home Assistant has to be quiet before expensive repairs inspect.
+PRESETS: Final[dict[str, dict[str, float]]] = {
+    PRESET_LOW_POWER: {
+        CONF_MIN_INTERVAL: 10,
+        CONF_MAX_INTERVAL: 300,
+        CONF_SLICE_LENGTH: 5,
+        CONF_MAX_RUNTIME: 100,
+        CONF_STARTUP_WINDOW: 60,
+        CONF_STARTUP_IDLE_PERIOD: 60,
+    },
+    PRESET_BALANCED: {
+        CONF_MIN_INTERVAL: 0.5,
+        CONF_MAX_INTERVAL: 60,
+        CONF_SLICE_LENGTH: 10,
+        CONF_MAX_RUNTIME: 250,
+        CONF_STARTUP_WINDOW: 30,
+        CONF_STARTUP_IDLE_PERIOD: 30,
+    },
+    PRESET_THOROUGH: {
+        CONF_MIN_INTERVAL: 0.1,
+        CONF_MAX_INTERVAL: 15,
+        CONF_SLICE_LENGTH: 25,
+        CONF_MAX_RUNTIME: 1000,
+        CONF_STARTUP_WINDOW: 10,
+        CONF_STARTUP_IDLE_PERIOD: 10,
+    },
+}
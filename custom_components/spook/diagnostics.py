@@ -0,0 +1,42 @@
+"""Spook - Your homie."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .const import DATA_REPAIR_MANAGER
+from .references import (
+    async_get_persistent_references_cache,
+    async_get_reference_analysis_pool,
+    async_get_reference_graph,
+)
+from .util import (
+    async_get_ectoplasm_index_stats,
+    async_get_template_entities_cache_stats,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    _entry: ConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    diagnostics: dict[str, Any] = {
+        "ectoplasm_index": async_get_ectoplasm_index_stats(),
+        "reference_graph": async_get_reference_graph().async_get_stats(),
+        "template_entities_cache": async_get_template_entities_cache_stats(),
+    }
+    if (cache := async_get_persistent_references_cache()) is not None:
+        diagnostics["persistent_references_cache"] = cache.async_get_stats()
+    if (pool := async_get_reference_analysis_pool()) is not None:
+        diagnostics["reference_analysis_pool"] = pool.async_get_stats()
+    if (repairs := hass.data.get(DATA_REPAIR_MANAGER)) is not None:
+        diagnostics["scheduler"] = repairs.scheduler.async_get_stats()
+        diagnostics["startup"] = repairs.startup_planner.async_get_stats()
+        diagnostics["totals"] = repairs.async_get_telemetry_totals()
+        diagnostics["repairs"] = repairs.async_get_telemetry()
+    return diagnostics
@@ -0,0 +1,127 @@
+"""Spook - Your homie.
+
+Index of all Spook ectoplasms and their modules.
+
+This file is generated by script/generate_ectoplasm_index.py, do not
+edit it manually. Generate it again after adding or removing modules.
+"""
+
+from typing import Final
+
+ECTOPLASMS: Final = ()
+
+PLATFORMS: Final = {
+    "button": (
+        "ectoplasms.homeassistant.button",
+        "ectoplasms.repairs.button",
+    ),
+    "event": ("ectoplasms.repairs.event",),
+    "sensor": (
+        "ectoplasms.homeassistant.sensor",
+        "ectoplasms.repairs.sensor",
+    ),
+    "switch": ("ectoplasms.cloud.switch",),
+}
+
+SERVICES: Final = (
+    "ectoplasms.blueprint.services.importer",
+    "ectoplasms.homeassistant.services.add_alias_to_area",
+    "ectoplasms.homeassistant.services.add_alias_to_floor",
+    "ectoplasms.homeassistant.services.add_area_to_floor",
+    "ectoplasms.homeassistant.services.add_device_to_area",
+    "ectoplasms.homeassistant.services.add_entity_to_area",
+    "ectoplasms.homeassistant.services.add_label_to_area",
+    "ectoplasms.homeassistant.services.add_label_to_device",
+    "ectoplasms.homeassistant.services.add_label_to_entity",
+    "ectoplasms.homeassistant.services.create_area",
+    "ectoplasms.homeassistant.services.create_floor",
+    "ectoplasms.homeassistant.services.create_label",
+    "ectoplasms.homeassistant.services.delete_all_orphaned_entities",
+    "ectoplasms.homeassistant.services.delete_area",
+    "ectoplasms.homeassistant.services.delete_floor",
+    "ectoplasms.homeassistant.services.delete_label",
+    "ectoplasms.homeassistant.services.disable_config_entry",
+    "ectoplasms.homeassistant.services.disable_device",
+    "ectoplasms.homeassistant.services.disable_entity",
+    "ectoplasms.homeassistant.services.disable_polling",
+    "ectoplasms.homeassistant.services.enable_config_entry",
+    "ectoplasms.homeassistant.services.enable_device",
+    "ectoplasms.homeassistant.services.enable_entity",
+    "ectoplasms.homeassistant.services.enable_polling",
+    "ectoplasms.homeassistant.services.hide_entity",
+    "ectoplasms.homeassistant.services.ignore_all_discovered",
+    "ectoplasms.homeassistant.services.list_orphaned_database_entities",
+    "ectoplasms.homeassistant.services.remove_alias_from_area",
+    "ectoplasms.homeassistant.services.remove_alias_from_floor",
+    "ectoplasms.homeassistant.services.remove_area_from_floor",
+    "ectoplasms.homeassistant.services.remove_device_from_area",
+    "ectoplasms.homeassistant.services.remove_entity_from_area",
+    "ectoplasms.homeassistant.services.remove_label_from_area",
+    "ectoplasms.homeassistant.services.remove_label_from_device",
+    "ectoplasms.homeassistant.services.remove_label_from_entity",
+    "ectoplasms.homeassistant.services.rename_entity",
+    "ectoplasms.homeassistant.services.restart",
+    "ectoplasms.homeassistant.services.set_area_aliases",
+    "ectoplasms.homeassistant.services.set_floor_aliases",
+    "ectoplasms.homeassistant.services.unhide_entity",
+    "ectoplasms.homeassistant.services.update_entity_id",
+    "ectoplasms.input_number.services.decrement",
+    "ectoplasms.input_number.services.increment",
+    "ectoplasms.input_number.services.max",
+    "ectoplasms.input_number.services.min",
+    "ectoplasms.input_select.services.random",
+    "ectoplasms.input_select.services.shuffle",
+    "ectoplasms.input_select.services.sort",
+    "ectoplasms.number.services.decrement",
+    "ectoplasms.number.services.increment",
+    "ectoplasms.number.services.max",
+    "ectoplasms.number.services.min",
+    "ectoplasms.person.services.add_device_tracker",
+    "ectoplasms.person.services.remove_device_tracker",
+    "ectoplasms.recorder.services.import_statistics",
+    "ectoplasms.repairs.services.create",
+    "ectoplasms.repairs.services.ignore_all",
+    "ectoplasms.repairs.services.list_references",
+    "ectoplasms.repairs.services.remove",
+    "ectoplasms.repairs.services.unignore_all",
+    "ectoplasms.select.services.random",
+    "ectoplasms.spook.services.boo",
+    "ectoplasms.spook.services.inspect",
+    "ectoplasms.spook.services.random_fail",
+    "ectoplasms.timer.services.set_duration",
+    "ectoplasms.zone.services.create",
+    "ectoplasms.zone.services.delete",
+    "ectoplasms.zone.services.update",
+)
+
+REPAIRS: Final = {
+    "automation": (
+        "ectoplasms.automation.repairs.unknown_area_references",
+        "ectoplasms.automation.repairs.unknown_device_references",
+        "ectoplasms.automation.repairs.unknown_entity_references",
+        "ectoplasms.automation.repairs.unknown_floor_references",
+        "ectoplasms.automation.repairs.unknown_label_references",
+        "ectoplasms.automation.repairs.unknown_service_references",
+    ),
+    "group": ("ectoplasms.group.repairs.unknown_members",),
+    "integration": ("ectoplasms.integration.repairs.unknown_source",),
+    "lovelace": ("ectoplasms.lovelace.repairs.unknown_entity_references",),
+    "proximity": (
+        "ectoplasms.proximity.repairs.unknown_ignored_zones",
+        "ectoplasms.proximity.repairs.unknown_tracked_entities",
+        "ectoplasms.proximity.repairs.unknown_zone",
+    ),
+    "scene": ("ectoplasms.scene.repairs.unknown_entity_references",),
+    "script": (
+        "ectoplasms.script.repairs.unknown_area_references",
+        "ectoplasms.script.repairs.unknown_device_references",
+        "ectoplasms.script.repairs.unknown_entity_references",
+        "ectoplasms.script.repairs.unknown_floor_references",
+        "ectoplasms.script.repairs.unknown_label_references",
+    ),
+    "switch_as_x": ("ectoplasms.switch_as_x.repairs.unknown_source",),
+    "trend": ("ectoplasms.trend.repairs.unknown_source",),
+    "utility_meter": ("ectoplasms.utility_meter.repairs.unknown_source",),
+}
+
+INTEGRATIONS: Final = ("spook_inverse",)
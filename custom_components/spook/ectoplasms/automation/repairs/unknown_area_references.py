@@ -7,8 +7,12 @@ from homeassistant.helpers import area_registry as ar
 from homeassistant.helpers.entity_component import DATA_INSTANCES, EntityComponent
 
 from ....const import LOGGER
+from ....references import (
+    async_get_automation_references,
+    async_prefetch_automation_references,
+)
 from ....repairs import AbstractSpookRepair
-from ....util import async_filter_known_area_ids, async_get_all_area_ids
+from ....util import async_filter_known_area_ids
 
 
 class SpookRepair(AbstractSpookRepair):
@@ -16,6 +20,7 @@ class SpookRepair(AbstractSpookRepair):
 
     domain = automation.DOMAIN
     repair = "automation_unknown_area_references"
+    reference_kind = "area"
     inspect_events = {
         automation.EVENT_AUTOMATION_RELOADED,
         ar.EVENT_AREA_REGISTRY_UPDATED,
@@ -35,25 +40,37 @@ class SpookRepair(AbstractSpookRepair):
 
         LOGGER.debug("Spook is inspecting: %s", self.repair)
 
-        known_area_ids = async_get_all_area_ids(self.hass)
+        known_area_ids = self.registry_snapshot.area_ids
+        self.references.async_start(known_area_ids)
 
-        for entity in entity_component.entities:
+        await self.async_wait(
+            async_prefetch_automation_references(entity_component.entities)
+        )
+        async for entity in self.async_iterate(entity_component.entities):
             self.possible_issue_ids.add(entity.entity_id)
-            if not isinstance(entity, automation.UnavailableAutomationEntity) and (
-                unknown_areas := async_filter_known_area_ids(
-                    self.hass,
-                    area_ids=entity.referenced_areas,
-                    known_area_ids=known_area_ids,
-                )
+            if isinstance(entity, automation.UnavailableAutomationEntity):
+                continue
+
+            references = async_get_automation_references(self.hass, entity)
+            translation_placeholders = {
+                "automation": entity.name,
+                "edit": f"/config/automation/edit/{entity.unique_id}",
+                "entity_id": entity.entity_id,
+            }
+            if not self.references.async_is_dirty(
+                entity.entity_id, references.config_hash, references.areas
+            ) and self.async_keep_issue(entity.entity_id, translation_placeholders):
+                continue
+
+            if unknown_areas := async_filter_known_area_ids(
+                self.hass,
+                area_ids=references.areas,
+                known_area_ids=known_area_ids,
             ):
                 self.async_create_issue(
                     issue_id=entity.entity_id,
-                    translation_placeholders={
-                        "areas": "\n".join(f"- `{area}`" for area in unknown_areas),
-                        "automation": entity.name,
-                        "edit": f"/config/automation/edit/{entity.unique_id}",
-                        "entity_id": entity.entity_id,
-                    },
+                    placeholder_lists={"areas": unknown_areas},
+                    translation_placeholders=translation_placeholders,
                 )
                 LOGGER.debug(
                     (
@@ -63,3 +80,5 @@ class SpookRepair(AbstractSpookRepair):
                     entity.entity_id,
                     ", ".join(unknown_areas),
                 )
+
+        self.references.async_finish()
@@ -7,8 +7,12 @@ from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.entity_component import DATA_INSTANCES, EntityComponent
 
 from ....const import LOGGER
+from ....references import (
+    async_get_automation_references,
+    async_prefetch_automation_references,
+)
 from ....repairs import AbstractSpookRepair
-from ....util import async_filter_known_device_ids, async_get_all_device_ids
+from ....util import async_filter_known_device_ids
 
 
 class SpookRepair(AbstractSpookRepair):
@@ -16,6 +20,7 @@ class SpookRepair(AbstractSpookRepair):
 
     domain = automation.DOMAIN
     repair = "automation_unknown_device_references"
+    reference_kind = "device"
     inspect_events = {
         automation.EVENT_AUTOMATION_RELOADED,
         dr.EVENT_DEVICE_REGISTRY_UPDATED,
@@ -36,27 +41,37 @@ class SpookRepair(AbstractSpookRepair):
 
         LOGGER.debug("Spook is inspecting: %s", self.repair)
 
-        known_device_ids = async_get_all_device_ids(self.hass)
+        known_device_ids = self.registry_snapshot.device_ids
+        self.references.async_start(known_device_ids)
 
-        for entity in entity_component.entities:
+        await self.async_wait(
+            async_prefetch_automation_references(entity_component.entities)
+        )
+        async for entity in self.async_iterate(entity_component.entities):
             self.possible_issue_ids.add(entity.entity_id)
-            if not isinstance(entity, automation.UnavailableAutomationEntity) and (
-                unknown_devices := async_filter_known_device_ids(
-                    self.hass,
-                    device_ids=entity.referenced_devices,
-                    known_device_ids=known_device_ids,
-                )
+            if isinstance(entity, automation.UnavailableAutomationEntity):
+                continue
+
+            references = async_get_automation_references(self.hass, entity)
+            translation_placeholders = {
+                "automation": entity.name,
+                "edit": f"/config/automation/edit/{entity.unique_id}",
+                "entity_id": entity.entity_id,
+            }
+            if not self.references.async_is_dirty(
+                entity.entity_id, references.config_hash, references.devices
+            ) and self.async_keep_issue(entity.entity_id, translation_placeholders):
+                continue
+
+            if unknown_devices := async_filter_known_device_ids(
+                self.hass,
+                device_ids=references.devices,
+                known_device_ids=known_device_ids,
             ):
                 self.async_create_issue(
                     issue_id=entity.entity_id,
-                    translation_placeholders={
-                        "devices": "\n".join(
-                            f"- `{device}`" for device in unknown_devices
-                        ),
-                        "automation": entity.name,
-                        "edit": f"/config/automation/edit/{entity.unique_id}",
-                        "entity_id": entity.entity_id,
-                    },
+                    placeholder_lists={"devices": unknown_devices},
+                    translation_placeholders=translation_placeholders,
                 )
                 LOGGER.debug(
                     (
@@ -66,3 +81,5 @@ class SpookRepair(AbstractSpookRepair):
                     entity.entity_id,
                     ", ".join(unknown_devices),
                 )
+
+        self.references.async_finish()
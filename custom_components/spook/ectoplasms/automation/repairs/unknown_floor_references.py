@@ -7,8 +7,12 @@ from homeassistant.helpers import floor_registry as fr
 from homeassistant.helpers.entity_component import DATA_INSTANCES, EntityComponent
 
 from ....const import LOGGER
+from ....references import (
+    async_get_automation_references,
+    async_prefetch_automation_references,
+)
 from ....repairs import AbstractSpookRepair
-from ....util import async_filter_known_floor_ids, async_get_all_floor_ids
+from ....util import async_filter_known_floor_ids
 
 
 class SpookRepair(AbstractSpookRepair):
@@ -16,6 +20,7 @@ class SpookRepair(AbstractSpookRepair):
 
     domain = automation.DOMAIN
     repair = "automation_unknown_floor_references"
+    reference_kind = "floor"
     inspect_events = {
         fr.EVENT_FLOOR_REGISTRY_UPDATED,
     }
@@ -34,25 +39,37 @@ class SpookRepair(AbstractSpookRepair):
 
         LOGGER.debug("Spook is inspecting: %s", self.repair)
 
-        known_floor_ids = async_get_all_floor_ids(self.hass)
+        known_floor_ids = self.registry_snapshot.floor_ids
+        self.references.async_start(known_floor_ids)
 
-        for entity in entity_component.entities:
+        await self.async_wait(
+            async_prefetch_automation_references(entity_component.entities)
+        )
+        async for entity in self.async_iterate(entity_component.entities):
             self.possible_issue_ids.add(entity.entity_id)
-            if not isinstance(entity, automation.UnavailableAutomationEntity) and (
-                unknown_floors := async_filter_known_floor_ids(
-                    self.hass,
-                    floor_ids=entity.referenced_floors,
-                    known_floor_ids=known_floor_ids,
-                )
+            if isinstance(entity, automation.UnavailableAutomationEntity):
+                continue
+
+            references = async_get_automation_references(self.hass, entity)
+            translation_placeholders = {
+                "automation": entity.name,
+                "edit": f"/config/automation/edit/{entity.unique_id}",
+                "entity_id": entity.entity_id,
+            }
+            if not self.references.async_is_dirty(
+                entity.entity_id, references.config_hash, references.floors
+            ) and self.async_keep_issue(entity.entity_id, translation_placeholders):
+                continue
+
+            if unknown_floors := async_filter_known_floor_ids(
+                self.hass,
+                floor_ids=references.floors,
+                known_floor_ids=known_floor_ids,
             ):
                 self.async_create_issue(
                     issue_id=entity.entity_id,
-                    translation_placeholders={
-                        "floors": "\n".join(f"- `{floor}`" for floor in unknown_floors),
-                        "automation": entity.name,
-                        "edit": f"/config/automation/edit/{entity.unique_id}",
-                        "entity_id": entity.entity_id,
-                    },
+                    placeholder_lists={"floors": unknown_floors},
+                    translation_placeholders=translation_placeholders,
                 )
                 LOGGER.debug(
                     (
@@ -62,3 +79,5 @@ class SpookRepair(AbstractSpookRepair):
                     entity.entity_id,
                     ", ".join(unknown_floors),
                 )
+
+        self.references.async_finish()
@@ -10,11 +10,13 @@ from homeassistant.const import (
 from homeassistant.helpers.entity_component import DATA_INSTANCES, EntityComponent
 
 from ....const import LOGGER
+from ....references import (
+    async_get_automation_references,
+    async_prefetch_automation_references,
+)
 from ....repairs import AbstractSpookRepair
 from ....util import (
     async_filter_known_services,
-    async_find_services_in_sequence,
-    async_get_all_services,
 )
 
 
@@ -23,6 +25,7 @@ class SpookRepair(AbstractSpookRepair):
 
     domain = automation.DOMAIN
     repair = "automation_unknown_service_references"
+    reference_kind = "service"
     inspect_events = {
         automation.EVENT_AUTOMATION_RELOADED,
         EVENT_SERVICE_REGISTERED,
@@ -44,29 +47,38 @@ class SpookRepair(AbstractSpookRepair):
 
         LOGGER.debug("Spook is inspecting: %s", self.repair)
 
-        known_services = async_get_all_services(self.hass)
+        known_services = self.registry_snapshot.services
+        self.references.async_start(known_services)
 
-        for entity in entity_component.entities:
+        await self.async_wait(
+            async_prefetch_automation_references(entity_component.entities)
+        )
+        async for entity in self.async_iterate(entity_component.entities):
             self.possible_issue_ids.add(entity.entity_id)
 
             if isinstance(entity, automation.UnavailableAutomationEntity):
                 continue
 
+            references = async_get_automation_references(self.hass, entity)
+            translation_placeholders = {
+                "automation": entity.name,
+                "edit": f"/config/automation/edit/{entity.unique_id}",
+                "entity_id": entity.entity_id,
+            }
+            if not self.references.async_is_dirty(
+                entity.entity_id, references.config_hash, references.services
+            ) and self.async_keep_issue(entity.entity_id, translation_placeholders):
+                continue
+
             if unknown_services := async_filter_known_services(
                 self.hass,
-                services=async_find_services_in_sequence(entity.action_script.sequence),
+                services=references.services,
                 known_services=known_services,
             ):
                 self.async_create_issue(
                     issue_id=entity.entity_id,
-                    translation_placeholders={
-                        "services": "\n".join(
-                            f"- `{service}`" for service in unknown_services
-                        ),
-                        "automation": entity.name,
-                        "edit": f"/config/automation/edit/{entity.unique_id}",
-                        "entity_id": entity.entity_id,
-                    },
+                    placeholder_lists={"services": unknown_services},
+                    translation_placeholders=translation_placeholders,
                 )
                 LOGGER.debug(
                     (
@@ -76,3 +88,5 @@ class SpookRepair(AbstractSpookRepair):
                     entity.entity_id,
                     ", ".join(unknown_services),
                 )
+
+        self.references.async_finish()
@@ -11,7 +11,7 @@ from homeassistant.helpers.entity_platform import DATA_ENTITY_PLATFORM, EntityPl
 
 from ....const import LOGGER
 from ....repairs import AbstractSpookRepair
-from ....util import async_filter_known_entity_ids, async_get_all_entity_ids
+from ....util import async_filter_known_entity_ids
 
 
 class SpookRepair(AbstractSpookRepair):
@@ -24,7 +24,7 @@ class SpookRepair(AbstractSpookRepair):
         er.EVENT_ENTITY_REGISTRY_UPDATED,
     }
     inspect_config_entry_changed = group.DOMAIN
-    inspect_on_reload = True
+    inspect_on_reload = group.DOMAIN
 
     automatically_clean_up_issues = True
 
@@ -32,15 +32,17 @@ class SpookRepair(AbstractSpookRepair):
         """Trigger a inspection."""
         LOGGER.debug("Spook is inspecting: %s", self.repair)
 
-        known_entity_ids = async_get_all_entity_ids(self.hass)
+        known_entity_ids = self.registry_snapshot.entity_ids
 
         platforms: list[EntityPlatform] | None
         if not (platforms := self.hass.data[DATA_ENTITY_PLATFORM].get(self.domain)):
             return  # Nothing to do.
 
+        self.references.async_start(known_entity_ids)
+
         for platform in platforms:
             # We don't want to check the old style group platform
-            for entity in platform.entities.values():
+            async for entity in self.async_iterate(platform.entities.values()):
                 self.possible_issue_ids.add(entity.entity_id)
                 members = []
                 if platform.domain == group.DOMAIN:
@@ -52,18 +54,22 @@ class SpookRepair(AbstractSpookRepair):
                     # pylint: disable-next=protected-access
                     members = entity._entities  # noqa: SLF001
 
+                translation_placeholders = {
+                    "group": entity.name,
+                    "entity_id": entity.entity_id,
+                }
+                if not self.references.async_is_dirty(
+                    entity.entity_id, None, frozenset(members)
+                ) and self.async_keep_issue(entity.entity_id, translation_placeholders):
+                    continue
+
                 if unknown_entities := async_filter_known_entity_ids(
                     self.hass, entity_ids=members, known_entity_ids=known_entity_ids
                 ):
                     self.async_create_issue(
                         issue_id=entity.entity_id,
-                        translation_placeholders={
-                            "entities": "\n".join(
-                                f"- `{entity_id}`" for entity_id in unknown_entities
-                            ),
-                            "group": entity.name,
-                            "entity_id": entity.entity_id,
-                        },
+                        placeholder_lists={"entities": unknown_entities},
+                        translation_placeholders=translation_placeholders,
                     )
                     LOGGER.debug(
                         "Spook found unknown member entities in %s "
@@ -71,3 +77,5 @@ class SpookRepair(AbstractSpookRepair):
                         entity.entity_id,
                         ", ".join(unknown_entities),
                     )
+
+        self.references.async_finish()
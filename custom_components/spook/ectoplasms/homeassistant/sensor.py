@@ -20,6 +20,7 @@ from homeassistant.components import (
     zone,
 )
 from homeassistant.components.sensor import (
+    SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
@@ -29,6 +30,7 @@ from homeassistant.const import (
     EVENT_HOMEASSISTANT_STARTED,
     EntityCategory,
     Platform,
+    UnitOfTime,
 )
 from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers import (
@@ -38,6 +40,7 @@ from homeassistant.helpers import (
 )
 from homeassistant.helpers.event import async_call_later
 
+from ...const import DATA_REPAIR_MANAGER
 from ...entity import SpookEntityDescription
 from .entity import HomeAssistantSpookEntity
 
@@ -57,10 +60,17 @@ class HomeAssistantSpookSensorEntityDescription(
 ):
     """Class describing Spook Home Assistant sensor entities."""
 
-    value_fn: Callable[[HomeAssistant], int | None]
+    value_fn: Callable[[HomeAssistant], float | None]
     update_events: set[EventType[Any] | str] = field(default_factory=set)
 
 
+def _inspection_telemetry(hass: HomeAssistant, key: str) -> float | None:
+    """Return a total of the inspection telemetry of the Spook repairs."""
+    if (repairs := hass.data.get(DATA_REPAIR_MANAGER)) is None:
+        return None
+    return repairs.async_get_telemetry_totals()[key]
+
+
 SENSORS: tuple[HomeAssistantSpookSensorEntityDescription, ...] = (
     HomeAssistantSpookSensorEntityDescription(
         key=Platform.AIR_QUALITY,
@@ -563,6 +573,50 @@ SENSORS: tuple[HomeAssistantSpookSensorEntityDescription, ...] = (
         update_events={EVENT_COMPONENT_LOADED, er.EVENT_ENTITY_REGISTRY_UPDATED},
         value_fn=lambda hass: len(hass.states.async_entity_ids(zone.DOMAIN)),
     ),
+    HomeAssistantSpookSensorEntityDescription(
+        key="spook_inspections",
+        translation_key="homeassistant_spook_inspections",
+        entity_id="sensor.spook_inspections",
+        icon="mdi:magnify-scan",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda hass: _inspection_telemetry(hass, "inspections"),
+    ),
+    HomeAssistantSpookSensorEntityDescription(
+        key="spook_slowest_inspection",
+        translation_key="homeassistant_spook_slowest_inspection",
+        entity_id="sensor.spook_slowest_inspection",
+        icon="mdi:timer-sand",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=1,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda hass: _inspection_telemetry(hass, "slowest_inspection"),
+    ),
+    HomeAssistantSpookSensorEntityDescription(
+        key="spook_inspection_issues_created",
+        translation_key="homeassistant_spook_inspection_issues_created",
+        entity_id="sensor.spook_inspection_issues_created",
+        icon="mdi:alert-plus-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda hass: _inspection_telemetry(hass, "issues_created"),
+    ),
+    HomeAssistantSpookSensorEntityDescription(
+        key="spook_inspection_issues_removed",
+        translation_key="homeassistant_spook_inspection_issues_removed",
+        entity_id="sensor.spook_inspection_issues_removed",
+        icon="mdi:alert-minus-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda hass: _inspection_telemetry(hass, "issues_removed"),
+    ),
 )
 
 
@@ -616,6 +670,6 @@ class HomeAssistantSpookSensorEntity(HomeAssistantSpookEntity, SensorEntity):
         await super().async_will_remove_from_hass()
 
     @property
-    def native_value(self) -> int | None:
+    def native_value(self) -> float | None:
         """Return the sensor value."""
         return self.entity_description.value_fn(self.hass)
@@ -9,7 +9,6 @@ from homeassistant.helpers.entity_platform import DATA_ENTITY_PLATFORM, EntityPl
 
 from ....const import LOGGER
 from ....repairs import AbstractSpookRepair
-from ....util import async_get_all_entity_ids
 
 
 class SpookRepair(AbstractSpookRepair):
@@ -34,25 +33,32 @@ class SpookRepair(AbstractSpookRepair):
         if not (platforms := self.hass.data[DATA_ENTITY_PLATFORM].get(self.domain)):
             return  # Nothing to do.
 
-        known_entity_ids = async_get_all_entity_ids(self.hass)
+        known_entity_ids = self.registry_snapshot.entity_ids
+        self.references.async_start(known_entity_ids)
 
         for platform in platforms:
             # We only care about the sensor domain
             if platform.domain != sensor.DOMAIN:
                 continue
 
-            for entity in platform.entities.values():
+            async for entity in self.async_iterate(platform.entities.values()):
                 self.possible_issue_ids.add(entity.entity_id)
                 # pylint: disable-next=protected-access
                 source = entity._sensor_source_id  # noqa: SLF001
+                translation_placeholders = {
+                    "entity_id": entity.entity_id,
+                    "helper": entity.name,
+                    "source": source,
+                }
+                if not self.references.async_is_dirty(
+                    entity.entity_id, None, {source}
+                ) and self.async_keep_issue(entity.entity_id, translation_placeholders):
+                    continue
+
                 if source not in known_entity_ids:
                     self.async_create_issue(
                         issue_id=entity.entity_id,
-                        translation_placeholders={
-                            "entity_id": entity.entity_id,
-                            "helper": entity.name,
-                            "source": source,
-                        },
+                        translation_placeholders=translation_placeholders,
                     )
                     LOGGER.debug(
                         "Spook found unknown source entity %s in %s "
@@ -60,3 +66,5 @@ class SpookRepair(AbstractSpookRepair):
                         source,
                         entity.entity_id,
                     )
+
+        self.references.async_finish()
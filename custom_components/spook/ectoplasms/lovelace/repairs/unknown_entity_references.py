@@ -10,12 +10,13 @@ from homeassistant.const import (
     EVENT_COMPONENT_LOADED,
     EVENT_LOVELACE_UPDATED,
 )
-from homeassistant.core import callback
+from homeassistant.core import Event, callback
 from homeassistant.helpers import entity_registry as er
 
 from ....const import LOGGER
+from ....references import ScriptReferences, async_get_dashboard_references
 from ....repairs import AbstractSpookRepair
-from ....util import async_filter_known_entity_ids, async_get_all_entity_ids
+from ....util import async_filter_known_entity_ids
 
 if TYPE_CHECKING:
     from homeassistant.components.lovelace.dashboard import (
@@ -29,56 +30,113 @@ class SpookRepair(AbstractSpookRepair):
 
     domain = DOMAIN
     repair = "lovelace_unknown_entity_references"
+    # Lovelace updates are listened for separately, to track which
+    # dashboard got updated.
     inspect_events = {
         EVENT_COMPONENT_LOADED,
-        EVENT_LOVELACE_UPDATED,
         er.EVENT_ENTITY_REGISTRY_UPDATED,
     }
     inspect_config_entry_changed = True
     inspect_on_reload = True
+    # Loading dashboards takes a while, let other repairs go first
+    inspect_priority = -1
+    inspect_startup_cost = 3
     automatically_clean_up_issues = True
 
     _dashboards: dict[str, LovelaceStorage | LovelaceYAML]
+    # The references of each dashboard, with the dashboard they were found
+    # in; kept until the dashboard is updated or replaced.
+    _dashboard_references: dict[
+        str, tuple[LovelaceStorage | LovelaceYAML, ScriptReferences]
+    ]
+    _updated_dashboards: set[str]
 
     async def async_activate(self) -> None:
         """Handle the activating a repair."""
         self._dashboards = self.hass.data["lovelace"].dashboards
+        self._dashboard_references = {}
+        self._updated_dashboards = set()
+
+        @callback
+        def _async_lovelace_updated(event: Event) -> None:
+            """Handle an updated dashboard."""
+            self._updated_dashboards.add(event.data.get("url_path") or "lovelace")
+            self.async_request_inspection(event.event_type)
+
+        self._event_subs.add(
+            self.hass.bus.async_listen(EVENT_LOVELACE_UPDATED, _async_lovelace_updated)
+        )
         await super().async_activate()
 
+    async def async_deactivate(self) -> None:
+        """Unregister the repair."""
+        self._dashboard_references.clear()
+        await super().async_deactivate()
+
     async def async_inspect(self) -> None:
         """Trigger a inspection."""
         LOGGER.debug("Spook is inspecting: %s", self.repair)
 
-        known_entity_ids = async_get_all_entity_ids(self.hass, include_all_none=True)
+        known_entity_ids = self.registry_snapshot.entity_ids_with_all_none
+        self.references.async_start(known_entity_ids)
+
+        seen: set[str] = set()
+        # A dry-run loads all dashboards, and leaves the cache alone
+        dashboard_references = {} if self.dry_run else self._dashboard_references
 
         # Loop over all dashboards and check if there are unknown entities
         # referenced in the dashboards.
-        for dashboard in self._dashboards.values():
+        async for dashboard in self.async_iterate(self._dashboards.values()):
             url_path = dashboard.url_path or "lovelace"
             self.possible_issue_ids.add(url_path)
-            try:
-                config = await dashboard.async_load(force=False)
-            except ConfigNotFound:
-                LOGGER.debug("Config for dashboard %s not found, skipping", url_path)
+            seen.add(url_path)
+
+            # Only dashboards that got updated (or are new) are loaded and
+            # walked again. For all others, the references found before are
+            # compared against the entities currently known.
+            cached = dashboard_references.get(url_path)
+            if (
+                cached is not None
+                and cached[0] is dashboard
+                and url_path not in self._updated_dashboards
+            ):
+                references = cached[1]
+            else:
+                if not self.dry_run:
+                    self._updated_dashboards.discard(url_path)
+                try:
+                    config = await self.async_wait(dashboard.async_load(force=False))
+                except ConfigNotFound:
+                    LOGGER.debug(
+                        "Config for dashboard %s not found, skipping", url_path
+                    )
+                    continue
+                references = async_get_dashboard_references(
+                    config, self.__async_extract_entities
+                )
+                dashboard_references[url_path] = (dashboard, references)
+
+            title = "Overview"
+            if dashboard.config:
+                title = dashboard.config.get("title", url_path)
+            translation_placeholders = {
+                "dashboard": title,
+                "edit": f"/{url_path}/0?edit=1",
+            }
+            if not self.references.async_is_dirty(
+                url_path, references.config_hash, references.entities
+            ) and self.async_keep_issue(url_path, translation_placeholders):
                 continue
 
             if unknown_entities := async_filter_known_entity_ids(
                 self.hass,
-                entity_ids=self.__async_extract_entities(config),
+                entity_ids=references.entities,
                 known_entity_ids=known_entity_ids,
             ):
-                title = "Overview"
-                if dashboard.config:
-                    title = dashboard.config.get("title", url_path)
                 self.async_create_issue(
                     issue_id=url_path,
-                    translation_placeholders={
-                        "entities": "\n".join(
-                            f"- `{entity_id}`" for entity_id in unknown_entities
-                        ),
-                        "dashboard": title,
-                        "edit": f"/{url_path}/0?edit=1",
-                    },
+                    placeholder_lists={"entities": unknown_entities},
+                    translation_placeholders=translation_placeholders,
                 )
                 LOGGER.debug(
                     (
@@ -89,6 +147,11 @@ class SpookRepair(AbstractSpookRepair):
                     ", ".join(unknown_entities),
                 )
 
+        # Forget dashboards that are gone
+        for url_path in dashboard_references.keys() - seen:
+            del dashboard_references[url_path]
+        self.references.async_finish()
+
     @callback
     def __async_extract_entities(self, config: dict[str, Any]) -> set[str]:
         """Extract entities from a dashboard config."""
@@ -9,7 +9,7 @@ from homeassistant.helpers import entity_registry as er
 
 from ....const import LOGGER
 from ....repairs import AbstractSpookRepair
-from ....util import async_filter_known_entity_ids, async_get_all_entity_ids
+from ....util import async_filter_known_entity_ids
 
 if TYPE_CHECKING:
     from homeassistant.components.proximity.coordinator import (
@@ -38,10 +38,19 @@ class SpookRepair(AbstractSpookRepair):
         if not (coordinators := self.hass.data.get(self.domain)):
             return  # Nothing to do, proximity is not loaded
 
-        known_entity_ids = async_get_all_entity_ids(self.hass)
+        known_entity_ids = self.registry_snapshot.entity_ids
+        self.references.async_start(known_entity_ids)
 
-        for entry_id, coordinator in coordinators.items():
+        async for entry_id, coordinator in self.async_iterate(coordinators.items()):
             self.possible_issue_ids.add(entry_id)
+            translation_placeholders = {
+                "name": coordinator.name,
+            }
+            if not self.references.async_is_dirty(
+                entry_id, None, frozenset(coordinator.tracked_entities)
+            ) and self.async_keep_issue(entry_id, translation_placeholders):
+                continue
+
             if unknown_entities := async_filter_known_entity_ids(
                 self.hass,
                 entity_ids=coordinator.tracked_entities,
@@ -49,12 +58,8 @@ class SpookRepair(AbstractSpookRepair):
             ):
                 self.async_create_issue(
                     issue_id=entry_id,
-                    translation_placeholders={
-                        "name": coordinator.name,
-                        "entities": "\n".join(
-                            f"- `{entity_id}`" for entity_id in unknown_entities
-                        ),
-                    },
+                    placeholder_lists={"entities": unknown_entities},
+                    translation_placeholders=translation_placeholders,
                 )
                 LOGGER.debug(
                     "Spook found unknown entities tracked in proximity %s "
@@ -62,3 +67,5 @@ class SpookRepair(AbstractSpookRepair):
                     coordinator.name,
                     ", ".join(unknown_entities),
                 )
+
+        self.references.async_finish()
@@ -9,7 +9,6 @@ from homeassistant.helpers import entity_registry as er
 
 from ....const import LOGGER
 from ....repairs import AbstractSpookRepair
-from ....util import async_get_all_entity_ids
 
 if TYPE_CHECKING:
     from homeassistant.components.proximity.coordinator import (
@@ -38,17 +37,24 @@ class SpookRepair(AbstractSpookRepair):
         if not (coordinators := self.hass.data.get(self.domain)):
             return  # Nothing to do, proximity is not loaded
 
-        known_entity_ids = async_get_all_entity_ids(self.hass)
+        known_entity_ids = self.registry_snapshot.entity_ids
+        self.references.async_start(known_entity_ids)
+
+        async for entry_id, coordinator in self.async_iterate(coordinators.items()):
+            translation_placeholders = {
+                "name": coordinator.name,
+                "zone": coordinator.proximity_zone_id,
+            }
+            if not self.references.async_is_dirty(
+                entry_id, None, {coordinator.proximity_zone_id}
+            ) and self.async_keep_issue(entry_id, translation_placeholders):
+                continue
 
-        for entry_id, coordinator in coordinators.items():
             if coordinator.proximity_zone_id not in known_entity_ids:
                 self.possible_issue_ids.add(entry_id)
                 self.async_create_issue(
                     issue_id=entry_id,
-                    translation_placeholders={
-                        "name": coordinator.name,
-                        "zone": coordinator.proximity_zone_id,
-                    },
+                    translation_placeholders=translation_placeholders,
                 )
                 LOGGER.debug(
                     "Spook found unknown zone %s in proximity %s "
@@ -56,3 +62,5 @@ class SpookRepair(AbstractSpookRepair):
                     coordinator.proximity_zone_id,
                     coordinator.name,
                 )
+
+        self.references.async_finish()
@@ -0,0 +1,32 @@
+"""Spook - Your homie."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.components.repairs import DOMAIN as REPAIRS_DOMAIN
+from homeassistant.core import ServiceResponse, SupportsResponse
+from homeassistant.helpers import config_validation as cv
+
+from ....const import DATA_REPAIR_MANAGER
+from ....services import AbstractSpookService
+
+if TYPE_CHECKING:
+    from homeassistant.core import ServiceCall
+
+
+class SpookService(AbstractSpookService):
+    """Home Assistant Repairs service to list the references of Spook issues."""
+
+    domain = REPAIRS_DOMAIN
+    service = "list_references"
+    schema = {vol.Optional("issue_id"): cv.string}
+    supports_response = SupportsResponse.ONLY
+
+    async def async_handle_service(self, call: ServiceCall) -> ServiceResponse:
+        """Handle the service call."""
+        if (repairs := self.hass.data.get(DATA_REPAIR_MANAGER)) is None:
+            return {"issues": {}}
+        return {"issues": repairs.async_get_issue_lists(call.data.get("issue_id"))}
@@ -9,7 +9,7 @@ from homeassistant.helpers import entity_registry as er
 
 from ....const import LOGGER
 from ....repairs import AbstractSpookRepair
-from ....util import async_filter_known_entity_ids, async_get_all_entity_ids
+from ....util import async_filter_known_entity_ids
 
 if TYPE_CHECKING:
     from homeassistant.components.homeassistant import scene
@@ -40,10 +40,21 @@ class SpookRepair(AbstractSpookRepair):
             "homeassistant_scene"
         ].entities.values()
 
-        known_entity_ids = async_get_all_entity_ids(self.hass)
+        known_entity_ids = self.registry_snapshot.entity_ids
+        self.references.async_start(known_entity_ids)
 
-        for entity in scenes:
+        async for entity in self.async_iterate(scenes):
             self.possible_issue_ids.add(entity.entity_id)
+            translation_placeholders = {
+                "scene": entity.name,
+                "entity_id": entity.entity_id,
+                "edit": f"/config/scene/edit/{entity.unique_id}",
+            }
+            if not self.references.async_is_dirty(
+                entity.entity_id, None, entity.scene_config.states.keys()
+            ) and self.async_keep_issue(entity.entity_id, translation_placeholders):
+                continue
+
             if unknown_entities := async_filter_known_entity_ids(
                 self.hass,
                 entity_ids=entity.scene_config.states,
@@ -51,14 +62,8 @@ class SpookRepair(AbstractSpookRepair):
             ):
                 self.async_create_issue(
                     issue_id=entity.entity_id,
-                    translation_placeholders={
-                        "entities": "\n".join(
-                            f"- `{entity_id}`" for entity_id in unknown_entities
-                        ),
-                        "scene": entity.name,
-                        "entity_id": entity.entity_id,
-                        "edit": f"/config/scene/edit/{entity.unique_id}",
-                    },
+                    placeholder_lists={"entities": unknown_entities},
+                    translation_placeholders=translation_placeholders,
                 )
                 LOGGER.debug(
                     "Spook found unknown entities references in %s "
@@ -66,3 +71,5 @@ class SpookRepair(AbstractSpookRepair):
                     entity.entity_id,
                     ", ".join(unknown_entities),
                 )
+
+        self.references.async_finish()
@@ -7,8 +7,12 @@ from homeassistant.helpers import floor_registry as fr
 from homeassistant.helpers.entity_component import DATA_INSTANCES, EntityComponent
 
 from ....const import LOGGER
+from ....references import (
+    async_get_script_references,
+    async_prefetch_script_references,
+)
 from ....repairs import AbstractSpookRepair
-from ....util import async_filter_known_floor_ids, async_get_all_floor_ids
+from ....util import async_filter_known_floor_ids
 
 
 class SpookRepair(AbstractSpookRepair):
@@ -16,6 +20,7 @@ class SpookRepair(AbstractSpookRepair):
 
     domain = script.DOMAIN
     repair = "script_unknown_floor_references"
+    reference_kind = "floor"
     inspect_events = {fr.EVENT_FLOOR_REGISTRY_UPDATED}
     inspect_on_reload = True
 
@@ -30,26 +35,38 @@ class SpookRepair(AbstractSpookRepair):
             DATA_INSTANCES
         ][self.domain]
 
-        known_floor_ids = async_get_all_floor_ids(self.hass)
+        known_floor_ids = self.registry_snapshot.floor_ids
+        self.references.async_start(known_floor_ids)
 
         LOGGER.debug("Spook is inspecting: %s", self.repair)
-        for entity in entity_component.entities:
+        await self.async_wait(
+            async_prefetch_script_references(entity_component.entities)
+        )
+        async for entity in self.async_iterate(entity_component.entities):
             self.possible_issue_ids.add(entity.entity_id)
-            if not isinstance(entity, script.UnavailableScriptEntity) and (
-                unknown_floors := async_filter_known_floor_ids(
-                    self.hass,
-                    floor_ids=entity.script.referenced_floors,
-                    known_floor_ids=known_floor_ids,
-                )
+            if isinstance(entity, script.UnavailableScriptEntity):
+                continue
+
+            references = async_get_script_references(self.hass, entity)
+            translation_placeholders = {
+                "script": entity.name,
+                "edit": f"/config/script/edit/{entity.unique_id}",
+                "entity_id": entity.entity_id,
+            }
+            if not self.references.async_is_dirty(
+                entity.entity_id, references.config_hash, references.floors
+            ) and self.async_keep_issue(entity.entity_id, translation_placeholders):
+                continue
+
+            if unknown_floors := async_filter_known_floor_ids(
+                self.hass,
+                floor_ids=references.floors,
+                known_floor_ids=known_floor_ids,
             ):
                 self.async_create_issue(
                     issue_id=entity.entity_id,
-                    translation_placeholders={
-                        "floors": "\n".join(f"- `{floor}`" for floor in unknown_floors),
-                        "script": entity.name,
-                        "edit": f"/config/script/edit/{entity.unique_id}",
-                        "entity_id": entity.entity_id,
-                    },
+                    placeholder_lists={"floors": unknown_floors},
+                    translation_placeholders=translation_placeholders,
                 )
                 LOGGER.debug(
                     (
@@ -59,3 +76,5 @@ class SpookRepair(AbstractSpookRepair):
                     entity.entity_id,
                     ", ".join(unknown_floors),
                 )
+
+        self.references.async_finish()
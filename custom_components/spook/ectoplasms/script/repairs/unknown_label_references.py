@@ -7,8 +7,12 @@ from homeassistant.helpers import label_registry as lr
 from homeassistant.helpers.entity_component import DATA_INSTANCES, EntityComponent
 
 from ....const import LOGGER
+from ....references import (
+    async_get_script_references,
+    async_prefetch_script_references,
+)
 from ....repairs import AbstractSpookRepair
-from ....util import async_filter_known_label_ids, async_get_all_label_ids
+from ....util import async_filter_known_label_ids
 
 
 class SpookRepair(AbstractSpookRepair):
@@ -16,6 +20,7 @@ class SpookRepair(AbstractSpookRepair):
 
     domain = script.DOMAIN
     repair = "script_unknown_label_references"
+    reference_kind = "label"
     inspect_events = {lr.EVENT_LABEL_REGISTRY_UPDATED}
     inspect_on_reload = True
 
@@ -30,26 +35,38 @@ class SpookRepair(AbstractSpookRepair):
             DATA_INSTANCES
         ][self.domain]
 
-        known_label_ids = async_get_all_label_ids(self.hass)
+        known_label_ids = self.registry_snapshot.label_ids
+        self.references.async_start(known_label_ids)
 
         LOGGER.debug("Spook is inspecting: %s", self.repair)
-        for entity in entity_component.entities:
+        await self.async_wait(
+            async_prefetch_script_references(entity_component.entities)
+        )
+        async for entity in self.async_iterate(entity_component.entities):
             self.possible_issue_ids.add(entity.entity_id)
-            if not isinstance(entity, script.UnavailableScriptEntity) and (
-                unknown_labels := async_filter_known_label_ids(
-                    self.hass,
-                    label_ids=entity.script.referenced_labels,
-                    known_label_ids=known_label_ids,
-                )
+            if isinstance(entity, script.UnavailableScriptEntity):
+                continue
+
+            references = async_get_script_references(self.hass, entity)
+            translation_placeholders = {
+                "script": entity.name,
+                "edit": f"/config/script/edit/{entity.unique_id}",
+                "entity_id": entity.entity_id,
+            }
+            if not self.references.async_is_dirty(
+                entity.entity_id, references.config_hash, references.labels
+            ) and self.async_keep_issue(entity.entity_id, translation_placeholders):
+                continue
+
+            if unknown_labels := async_filter_known_label_ids(
+                self.hass,
+                label_ids=references.labels,
+                known_label_ids=known_label_ids,
             ):
                 self.async_create_issue(
                     issue_id=entity.entity_id,
-                    translation_placeholders={
-                        "labels": "\n".join(f"- `{label}`" for label in unknown_labels),
-                        "script": entity.name,
-                        "edit": f"/config/script/edit/{entity.unique_id}",
-                        "entity_id": entity.entity_id,
-                    },
+                    placeholder_lists={"labels": unknown_labels},
+                    translation_placeholders=translation_placeholders,
                 )
                 LOGGER.debug(
                     (
@@ -59,3 +76,5 @@ class SpookRepair(AbstractSpookRepair):
                     entity.entity_id,
                     ", ".join(unknown_labels),
                 )
+
+        self.references.async_finish()
@@ -0,0 +1,41 @@
+"""Spook - Your homie."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.core import ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from ....const import DATA_REPAIR_MANAGER, DOMAIN
+from ....services import AbstractSpookService
+
+if TYPE_CHECKING:
+    from homeassistant.core import ServiceCall
+
+
+class SpookService(AbstractSpookService):
+    """Spook service to inspect repairs right away."""
+
+    domain = DOMAIN
+    service = "inspect"
+    schema = {
+        vol.Optional("repairs"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("dry_run", default=False): cv.boolean,
+    }
+    supports_response = SupportsResponse.ONLY
+
+    async def async_handle_service(self, call: ServiceCall) -> ServiceResponse:
+        """Handle the service call."""
+        if (repairs := self.hass.data.get(DATA_REPAIR_MANAGER)) is None:
+            msg = "Spook repairs are not set up yet"
+            raise HomeAssistantError(msg)
+        return {
+            "dry_run": call.data["dry_run"],
+            "repairs": await repairs.async_inspect(
+                call.data.get("repairs"), dry_run=call.data["dry_run"]
+            ),
+        }
@@ -0,0 +1,1025 @@
+"""Spook - Your homie."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+import hashlib
+import itertools
+import json
+import multiprocessing
+import sys
+import time
+from typing import TYPE_CHECKING, Any
+from weakref import WeakKeyDictionary, WeakValueDictionary
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, LOGGER
+from .util import (
+    async_find_services_in_sequence,
+    async_get_known_domains,
+    async_get_template_entities,
+    extract_template_entities,
+    is_template_string,
+    split_comma_separated_entity_ids,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence, Set as AbstractSet
+
+    from homeassistant.components.automation import AutomationEntity
+    from homeassistant.components.script import ScriptEntity
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.script import Script
+
+# Configuration keys that hold entity IDs in automations and scripts
+_ENTITY_CONFIG_KEYS = frozenset(
+    {"area_id", "device_id", "entity_id", "label_id", "zone"}
+)
+
+# Top level automation configuration keys to extract entity IDs from
+_AUTOMATION_CONFIG_KEYS = frozenset(
+    {"action", "actions", "condition", "conditions", "trigger", "triggers"}
+)
+
+# Minimum number of configurations to analyze, before it is worth sending
+# them to worker processes. For less, the IPC costs more than it saves.
+OFFLOAD_MIN_CONFIGS = 50
+
+# Version of the persisted analysis results. Bump it whenever the way
+# references are found changes; results of an other version are dropped.
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.references"
+
+# Seconds to wait before saving the analysis results, so reloading many
+# automations or scripts results in a single save.
+STORAGE_SAVE_DELAY = 60
+
+# Number of restarts a persisted analysis result is kept, while unused
+STORAGE_MAX_UNUSED = 3
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class ScriptReferences:
+    """All references of an automation or script, found in a single pass.
+
+    The entities are possible entity IDs; they still need to be validated,
+    for example, by async_filter_known_entity_ids. Entities referenced by
+    templates are already included.
+
+    The config hash is a hash of the content of the configuration the
+    references were found in; it only changes when the configuration changes.
+
+    The domains are the known domains the entities in templates were resolved
+    for, None if unknown (like for persisted results). Known domains only
+    grow, so entities in templates are resolved again when they changed.
+    """
+
+    config_hash: str
+    entities: frozenset[str]
+    devices: frozenset[str]
+    areas: frozenset[str]
+    floors: frozenset[str]
+    labels: frozenset[str]
+    services: frozenset[str]
+    templates: frozenset[str]
+    domains: frozenset[str] | None = field(default=None, compare=False)
+
+
+# Analysis results, cached on the identity of the (automation action) script.
+# Home Assistant creates new script objects when automations or scripts are
+# reloaded, so a reload automatically results in a new analysis.
+_REFERENCES_CACHE: WeakKeyDictionary[Script, ScriptReferences] = WeakKeyDictionary()
+
+# Analysis results by configuration hash, so reloading a configuration that
+# didn't change, doesn't result in a new analysis. Entries are removed
+# automatically once no (automation action) script uses them anymore.
+_REFERENCES_BY_HASH: WeakValueDictionary[str, ScriptReferences] = WeakValueDictionary()
+
+
+# Configurations based on a blueprint can change, without their own content
+# changing, so their hash is made unique. The same goes for configurations
+# that aren't available. Counts those configurations.
+_UNIQUE_CONFIGS = itertools.count()
+
+# Prefix of unique configuration hashes; these are never persisted, as they
+# are only unique within a single run of Home Assistant.
+_UNIQUE_HASH_PREFIX = "unique:"
+
+
+def _hash_config(config: Any, *, unique: bool = False) -> str:
+    """Return a hash of the content of an automation or script configuration."""
+    if unique or config is None:
+        return f"{_UNIQUE_HASH_PREFIX}{next(_UNIQUE_CONFIGS)}"
+    try:
+        serialized = json.dumps(config, sort_keys=True, default=repr)
+    except TypeError:
+        # Keys of mixed types can't be sorted
+        serialized = json.dumps(config, default=repr)
+    return hashlib.blake2b(serialized.encode(), digest_size=16).hexdigest()
+
+
+class _ReferencesStore(Store[dict[str, Any]]):
+    """Store of analysis results."""
+
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,
+        old_minor_version: int,
+        _old_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Drop analysis results of an other version; they are analyzed again."""
+        LOGGER.debug(
+            "Dropping persisted Spook references of version %s.%s",
+            old_major_version,
+            old_minor_version,
+        )
+        return {"references": {}}
+
+
+class PersistentReferencesCache:
+    """Analysis results, persisted across restarts of Home Assistant.
+
+    On startup, the results of the previous run are loaded; automations and
+    scripts with a configuration that didn't change, use those instead of
+    being analyzed again. Results that go unused for a number of restarts,
+    for example, because the automation was removed, are dropped.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the persistent references cache."""
+        self._store = _ReferencesStore(hass, STORAGE_VERSION, STORAGE_KEY, private=True)
+        # Loaded results that are not used (yet), with the number of
+        # restarts they went unused.
+        self._unused: dict[str, tuple[ScriptReferences, int]] = {}
+        self._loaded = 0
+        self._hits = 0
+        self._load_time = 0.0
+
+    async def async_load(self) -> None:
+        """Load the analysis results of the previous run."""
+        start = time.perf_counter()
+        try:
+            data = await self._store.async_load()
+        # pylint: disable-next=broad-exception-caught
+        except Exception:  # noqa: BLE001
+            LOGGER.warning(
+                "Could not load persisted Spook references, analyzing all again",
+                exc_info=True,
+            )
+            data = None
+
+        for config_hash, item in ((data or {}).get("references") or {}).items():
+            unused = item.get("unused", 0) + 1
+            if unused > STORAGE_MAX_UNUSED:
+                continue
+            self._unused[config_hash] = (
+                ScriptReferences(
+                    config_hash=config_hash,
+                    entities=frozenset(item.get("entities", ())),
+                    devices=frozenset(item.get("devices", ())),
+                    areas=frozenset(item.get("areas", ())),
+                    floors=frozenset(item.get("floors", ())),
+                    labels=frozenset(item.get("labels", ())),
+                    services=frozenset(item.get("services", ())),
+                    templates=frozenset(item.get("templates", ())),
+                ),
+                unused,
+            )
+        self._loaded = len(self._unused)
+        self._load_time = time.perf_counter() - start
+
+        # Save once, even if nothing gets analyzed during this run, so
+        # results that went unused are eventually dropped.
+        if self._loaded:
+            self.async_schedule_save()
+        LOGGER.debug(
+            "Loaded %s persisted Spook references in %.3f seconds",
+            self._loaded,
+            self._load_time,
+        )
+
+    @callback
+    def async_pop(self, config_hash: str) -> ScriptReferences | None:
+        """Return and take the loaded analysis result of a configuration."""
+        if (item := self._unused.pop(config_hash, None)) is None:
+            return None
+        self._hits += 1
+        return item[0]
+
+    @callback
+    def async_schedule_save(self, delay: float = STORAGE_SAVE_DELAY) -> None:
+        """Schedule saving the analysis results."""
+        self._store.async_delay_save(self._async_data_to_save, delay)
+
+    @callback
+    def _async_data_to_save(self) -> dict[str, Any]:
+        """Return the analysis results to persist.
+
+        Those are the results in use, and the loaded results that have not
+        been used (yet). Results of unique configurations are left out.
+        """
+        persisted: dict[str, dict[str, Any]] = {
+            config_hash: _references_as_dict(references)
+            for config_hash, references in list(_REFERENCES_BY_HASH.items())
+            if not config_hash.startswith(_UNIQUE_HASH_PREFIX)
+        }
+        for config_hash, (references, unused) in self._unused.items():
+            if config_hash not in persisted:
+                persisted[config_hash] = {
+                    **_references_as_dict(references),
+                    "unused": unused,
+                }
+        return {"references": persisted}
+
+    @callback
+    def async_get_stats(self) -> dict[str, Any]:
+        """Return statistics of the persistent references cache."""
+        return {
+            "loaded": self._loaded,
+            "hits": self._hits,
+            "unused": len(self._unused),
+            "load_time": round(self._load_time, 6),
+        }
+
+
+def _references_as_dict(references: ScriptReferences) -> dict[str, Any]:
+    """Return analysis results in their persisted form."""
+    return {
+        "entities": sorted(references.entities),
+        "devices": sorted(references.devices),
+        "areas": sorted(references.areas),
+        "floors": sorted(references.floors),
+        "labels": sorted(references.labels),
+        "services": sorted(references.services),
+        "templates": sorted(references.templates),
+    }
+
+
+_PERSISTENT_CACHE: PersistentReferencesCache | None = None
+
+
+async def async_setup_persistent_references_cache(
+    hass: HomeAssistant,
+) -> Callable[[], None]:
+    """Set up persisting analysis results across restarts.
+
+    Returns a callable to stop persisting; it saves the results right away.
+    """
+    # pylint: disable-next=global-statement
+    global _PERSISTENT_CACHE  # noqa: PLW0603
+
+    cache = PersistentReferencesCache(hass)
+    await cache.async_load()
+    _PERSISTENT_CACHE = cache
+
+    @callback
+    def _async_shutdown() -> None:
+        """Save the analysis results and stop persisting them."""
+        # pylint: disable-next=global-statement
+        global _PERSISTENT_CACHE  # noqa: PLW0603
+        cache.async_schedule_save(0)
+        if _PERSISTENT_CACHE is cache:
+            _PERSISTENT_CACHE = None
+
+    return _async_shutdown
+
+
+async def async_remove_persistent_references_cache(hass: HomeAssistant) -> None:
+    """Remove the persisted analysis results."""
+    await _ReferencesStore(hass, STORAGE_VERSION, STORAGE_KEY).async_remove()
+
+
+@callback
+def async_get_persistent_references_cache() -> PersistentReferencesCache | None:
+    """Return the persistent references cache, if set up."""
+    return _PERSISTENT_CACHE
+
+
+@callback
+def _async_get_references_by_hash(config_hash: str) -> ScriptReferences | None:
+    """Return the analysis result of a configuration, if known.
+
+    Looks in the results of this run first, and then in the results that
+    were persisted by the previous run.
+    """
+    if (references := _REFERENCES_BY_HASH.get(config_hash)) is not None:
+        return references
+    if (
+        _PERSISTENT_CACHE is None
+        or (references := _PERSISTENT_CACHE.async_pop(config_hash)) is None
+    ):
+        return None
+    _REFERENCES_BY_HASH[config_hash] = references
+    return references
+
+
+def _extract_entity_candidates_from_value(value: Any, entities: set[str]) -> None:
+    """Extract possible entity IDs from a configuration value."""
+    if isinstance(value, str):
+        if not is_template_string(value) and "." in value and not value.startswith("!"):
+            entities.add(value)
+    elif isinstance(value, list):
+        for item in value:
+            _extract_entity_candidates_from_value(item, entities)
+    elif isinstance(value, dict) and isinstance(value.get("entity"), str):
+        # Handle entity dict format like {"entity": "light.living_room"}
+        entities.add(value["entity"])
+
+
+def _walk_config(
+    config: Any,
+    templates: set[str],
+    entities: set[str] | None,
+) -> None:
+    """Walk an automation or script configuration once, collecting references.
+
+    Template strings are collected into templates. If entities is given, the
+    values of fields holding entity IDs and of action data are collected into
+    it as possible entity IDs.
+    """
+    if isinstance(config, str):
+        if is_template_string(config):
+            templates.add(config)
+    elif isinstance(config, dict):
+        for key, value in config.items():
+            if entities is not None:
+                if key in _ENTITY_CONFIG_KEYS:
+                    _extract_entity_candidates_from_value(value, entities)
+                elif key == "data":
+                    _extract_entity_candidates_from_value(
+                        list(value.values()) if isinstance(value, dict) else value,
+                        entities,
+                    )
+            _walk_config(value, templates, entities)
+    elif isinstance(config, (list, tuple)):
+        for item in config:
+            _walk_config(item, templates, entities)
+
+
+def _walk_automation_config(
+    config: Any,
+    templates: set[str],
+    entities: set[str],
+) -> None:
+    """Walk an automation configuration, collecting references."""
+    if not isinstance(config, dict):
+        return
+    for key, value in config.items():
+        _walk_config(
+            value,
+            templates,
+            entities if key in _AUTOMATION_CONFIG_KEYS else None,
+        )
+
+
+def _walk_script_config(
+    config: Any,
+    blueprint_inputs: Iterable[Any],
+    templates: set[str],
+    entities: set[str],
+) -> None:
+    """Walk a script configuration and its blueprint inputs, collecting references.
+
+    Blueprint inputs might contain triggers (like discard_when), entities are
+    only collected from those.
+    """
+    if config:
+        _walk_config(config, templates, None)
+    for value in blueprint_inputs:
+        if isinstance(value, (dict, list)) and "trigger" in str(value):
+            _walk_config(value, templates, entities)
+
+
+def _script_blueprint_inputs(entity: ScriptEntity) -> list[Any]:
+    """Return the blueprint inputs of a script, if it uses a blueprint."""
+    entity_config = getattr(entity, "_config", None) or {}
+    if getattr(entity, "referenced_blueprint", None) and isinstance(
+        blueprint_config := entity_config.get("use_blueprint"),
+        dict,
+    ):
+        return list(blueprint_config.get("input", {}).values())
+    return []
+
+
+def _script_config(entity: ScriptEntity) -> Any:
+    """Return the configuration of a script."""
+    return getattr(entity.script, "config", None) or getattr(
+        entity.script, "_config", None
+    )
+
+
+def analyze_configs(
+    configs: Sequence[tuple[bool, str]],
+    domains: frozenset[str] | None,
+) -> tuple[list[tuple[frozenset[str], frozenset[str]]], float]:
+    """Analyze serialized automation and script configurations.
+
+    Runs in a worker process. Each configuration is a tuple of whether it is
+    an automation, and its configuration serialized as JSON. For scripts,
+    that is the configuration and the blueprint inputs.
+
+    Returns the templates and possible entity IDs (including the entities
+    in templates) of each configuration, and the time spent analyzing.
+    """
+    start = time.perf_counter()
+    results: list[tuple[frozenset[str], frozenset[str]]] = []
+    for automation, serialized in configs:
+        templates: set[str] = set()
+        entities: set[str] = set()
+        config = json.loads(serialized)
+        if automation:
+            _walk_automation_config(config, templates, entities)
+        else:
+            _walk_script_config(config[0], config[1], templates, entities)
+        for template in templates:
+            entities.update(extract_template_entities(template, domains))
+        results.append((frozenset(templates), frozenset(entities)))
+    return results, time.perf_counter() - start
+
+
+def _serialize_for_analysis(config: Any) -> str:
+    """Serialize a configuration as compact JSON, for a worker process.
+
+    Values that can't be serialized are left out, just like they are
+    ignored when walking the configuration.
+    """
+    return json.dumps(config, separators=(",", ":"), default=lambda _: None)
+
+
+@callback
+def _async_resolve_templates(
+    hass: HomeAssistant,
+    script: Script,
+    references: ScriptReferences,
+) -> ScriptReferences:
+    """Return the references, with entities in templates resolved.
+
+    Only resolves the templates again if the known domains changed since
+    they were last resolved, adding the entities of the new domains.
+    """
+    domains = async_get_known_domains(hass)
+    if not references.templates or references.domains is domains:
+        return references
+
+    entities = set(references.entities)
+    for template in references.templates:
+        entities.update(async_get_template_entities(hass, template))
+    references = replace(references, entities=frozenset(entities), domains=domains)
+    _REFERENCES_CACHE[script] = references
+    _REFERENCES_BY_HASH[references.config_hash] = references
+    return references
+
+
+@callback
+def _async_build_references(  # noqa: PLR0913
+    hass: HomeAssistant,
+    *,
+    script: Script,
+    config_hash: str,
+    entities: set[str],
+    templates: set[str],
+    devices: set[str],
+    areas: set[str],
+    floors: set[str],
+    labels: set[str],
+    domains: frozenset[str] | None = None,
+) -> ScriptReferences:
+    """Build and cache the references, resolving the entities in templates.
+
+    If domains are given, the entities in templates were already resolved
+    for those known domains (by a worker process).
+    """
+    if domains is None:
+        domains = async_get_known_domains(hass)
+        for template in templates:
+            entities.update(async_get_template_entities(hass, template))
+
+    references = ScriptReferences(
+        config_hash=config_hash,
+        entities=frozenset(
+            entity_id
+            for entity_ids in entities
+            if isinstance(entity_ids, str)
+            for entity_id in split_comma_separated_entity_ids(entity_ids)
+        ),
+        devices=frozenset(devices),
+        areas=frozenset(areas),
+        floors=frozenset(floors),
+        labels=frozenset(labels),
+        services=frozenset(async_find_services_in_sequence(script.sequence)),
+        templates=frozenset(templates),
+        domains=domains,
+    )
+    _REFERENCES_CACHE[script] = references
+    _REFERENCES_BY_HASH[config_hash] = references
+    if _PERSISTENT_CACHE is not None:
+        _PERSISTENT_CACHE.async_schedule_save()
+    return references
+
+
+@callback
+def async_get_automation_references(
+    hass: HomeAssistant,
+    entity: AutomationEntity,
+) -> ScriptReferences:
+    """Return all references of an automation.
+
+    The automation configuration is only walked once; the result is cached
+    and shared by all automation repairs until the automation is reloaded.
+    Reloading an automation without changes to its configuration, reuses
+    the previous result.
+    """
+    if (references := _REFERENCES_CACHE.get(entity.action_script)) is not None:
+        return _async_resolve_templates(hass, entity.action_script, references)
+
+    templates: set[str] = set()
+    entities = set(entity.referenced_entities)
+    domains: frozenset[str] | None = None
+
+    if (analyzed := _ANALYZED.pop(entity.action_script, None)) is not None:
+        config_hash, analyzed_templates, analyzed_entities, domains = analyzed
+        templates.update(analyzed_templates)
+        entities.update(analyzed_entities)
+    else:
+        config = getattr(entity, "raw_config", None)
+        config_hash = _hash_config(config, unique=bool(entity.referenced_blueprint))
+        if (references := _async_get_references_by_hash(config_hash)) is not None:
+            _REFERENCES_CACHE[entity.action_script] = references
+            return _async_resolve_templates(hass, entity.action_script, references)
+        _walk_automation_config(config, templates, entities)
+
+    return _async_build_references(
+        hass,
+        script=entity.action_script,
+        config_hash=config_hash,
+        entities=entities,
+        templates=templates,
+        devices=set(entity.referenced_devices),
+        areas=set(entity.referenced_areas),
+        floors=set(entity.referenced_floors),
+        labels=set(entity.referenced_labels),
+        domains=domains,
+    )
+
+
+@callback
+def async_get_script_references(
+    hass: HomeAssistant,
+    entity: ScriptEntity,
+) -> ScriptReferences:
+    """Return all references of a script.
+
+    The script configuration is only walked once; the result is cached
+    and shared by all script repairs until the script is reloaded.
+    Reloading a script without changes to its configuration, reuses
+    the previous result.
+    """
+    if (references := _REFERENCES_CACHE.get(entity.script)) is not None:
+        return _async_resolve_templates(hass, entity.script, references)
+
+    templates: set[str] = set()
+    entities = set(entity.script.referenced_entities)
+    domains: frozenset[str] | None = None
+
+    if (analyzed := _ANALYZED.pop(entity.script, None)) is not None:
+        config_hash, analyzed_templates, analyzed_entities, domains = analyzed
+        templates.update(analyzed_templates)
+        entities.update(analyzed_entities)
+    else:
+        config_hash = _hash_config(
+            getattr(entity, "raw_config", None),
+            unique=bool(getattr(entity, "referenced_blueprint", None)),
+        )
+        if (references := _async_get_references_by_hash(config_hash)) is not None:
+            _REFERENCES_CACHE[entity.script] = references
+            return _async_resolve_templates(hass, entity.script, references)
+        _walk_script_config(
+            _script_config(entity),
+            _script_blueprint_inputs(entity),
+            templates,
+            entities,
+        )
+
+    return _async_build_references(
+        hass,
+        script=entity.script,
+        config_hash=config_hash,
+        entities=entities,
+        templates=templates,
+        devices=set(entity.script.referenced_devices),
+        areas=set(entity.script.referenced_areas),
+        floors=set(entity.script.referenced_floors),
+        labels=set(entity.script.referenced_labels),
+        domains=domains,
+    )
+
+
+@callback
+def async_get_dashboard_references(
+    config: Any,
+    extract_entities: Callable[[Any], AbstractSet[str]],
+) -> ScriptReferences:
+    """Return the references of a dashboard configuration.
+
+    Only entities are extracted from dashboards. A dashboard configuration
+    that didn't change (since it was last seen in this run, or during the
+    previous run), isn't walked again.
+    """
+    config_hash = _hash_config({"dashboard": config})
+    if (references := _async_get_references_by_hash(config_hash)) is not None:
+        return references
+
+    references = ScriptReferences(
+        config_hash=config_hash,
+        entities=frozenset(
+            entity_id
+            for entity_id in extract_entities(config)
+            if isinstance(entity_id, str)
+        ),
+        devices=frozenset(),
+        areas=frozenset(),
+        floors=frozenset(),
+        labels=frozenset(),
+        services=frozenset(),
+        templates=frozenset(),
+    )
+    _REFERENCES_BY_HASH[config_hash] = references
+    if _PERSISTENT_CACHE is not None:
+        _PERSISTENT_CACHE.async_schedule_save()
+    return references
+
+
+class ReferenceAnalysisPool:
+    """Analyze automation and script configurations in worker processes.
+
+    Configurations that were not analyzed before, are serialized as compact
+    JSON and sent to the workers in a single batch, split over the workers.
+    Only the templates and possible entity IDs come back; the references
+    are built from those on the event loop, without walking the
+    configurations again.
+
+    Keeps track of the time spent on the event loop (serializing and
+    applying), in the workers, and waiting for the workers (including the
+    IPC), so the cost of offloading can be compared with what it saves.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_workers: int) -> None:
+        """Initialize the reference analysis pool."""
+        self.hass = hass
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = asyncio.Lock()
+        self._shut_down = False
+        self.batches = 0
+        self.configs = 0
+        self.loop_time = 0.0
+        self.worker_time = 0.0
+        self.wait_time = 0.0
+
+    async def async_prefetch(
+        self,
+        jobs: list[tuple[Script, str, bool, Any]],
+    ) -> None:
+        """Analyze configurations ahead of building their references.
+
+        Each job is a tuple of the (automation action) script, the hash
+        of its configuration, whether it is an automation, and the
+        configuration to analyze.
+        """
+        async with self._lock:
+            # Another inspection might have analyzed them in the meantime
+            jobs = [
+                job
+                for job in jobs
+                if job[0] not in _REFERENCES_CACHE and job[0] not in _ANALYZED
+            ]
+            if len(jobs) < OFFLOAD_MIN_CONFIGS:
+                return
+
+            start = time.perf_counter()
+            configs = [
+                (automation, _serialize_for_analysis(config))
+                for _, _, automation, config in jobs
+            ]
+            self.loop_time += time.perf_counter() - start
+
+            domains = async_get_known_domains(self.hass)
+            try:
+                results = await self.async_analyze(configs, domains)
+            # pylint: disable-next=broad-exception-caught
+            except Exception:  # noqa: BLE001
+                LOGGER.exception(
+                    "Spook failed analyzing references in worker processes, "
+                    "analyzing them in the event loop instead"
+                )
+                return
+
+            start = time.perf_counter()
+            for (script, config_hash, _, _), (templates, entities) in zip(
+                jobs, results, strict=True
+            ):
+                _ANALYZED[script] = (config_hash, templates, entities, domains)
+            self.loop_time += time.perf_counter() - start
+
+    async def async_analyze(
+        self,
+        configs: list[tuple[bool, str]],
+        domains: frozenset[str],
+    ) -> list[tuple[frozenset[str], frozenset[str]]]:
+        """Analyze serialized configurations, in the worker processes.
+
+        Entities in templates are resolved for the given known domains.
+        """
+        if self._executor is None:
+            # Starting worker processes blocks, don't do that in the event loop
+            executor = await self.hass.async_add_executor_job(self._start_executor)
+            if self._shut_down:
+                executor.shutdown(wait=False)
+                msg = "Reference analysis pool was shut down"
+                raise RuntimeError(msg)
+            self._executor = executor
+
+        size = -(-len(configs) // self.max_workers)
+        start = time.perf_counter()
+        batches = await asyncio.gather(
+            *(
+                self.hass.loop.run_in_executor(
+                    self._executor,
+                    analyze_configs,
+                    configs[index : index + size],
+                    domains,
+                )
+                for index in range(0, len(configs), size)
+            )
+        )
+        self.wait_time += time.perf_counter() - start
+        self.batches += 1
+        self.configs += len(configs)
+        self.worker_time += sum(worker_time for _, worker_time in batches)
+        return [result for results, _ in batches for result in results]
+
+    def _start_executor(self) -> ProcessPoolExecutor:
+        """Start the worker processes."""
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            # Forking a process running Home Assistant isn't safe
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        for _ in range(self.max_workers):
+            executor.submit(time.perf_counter).result()
+        return executor
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Shut down the worker processes.
+
+        Analyses that are running still complete, so inspections waiting
+        for them are not interrupted.
+        """
+        self._shut_down = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @callback
+    def async_get_stats(self) -> dict[str, Any]:
+        """Return statistics of the reference analysis pool."""
+        return {
+            "max_workers": self.max_workers,
+            "batches": self.batches,
+            "configs": self.configs,
+            "loop_time": round(self.loop_time, 4),
+            "worker_time": round(self.worker_time, 4),
+            "wait_time": round(self.wait_time, 4),
+        }
+
+
+# Results of analyses done by worker processes, waiting to be built into
+# references: the configuration hash, templates, possible entity IDs and the
+# known domains the entities in templates were resolved for.
+_ANALYZED: WeakKeyDictionary[
+    Script, tuple[str, frozenset[str], frozenset[str], frozenset[str]]
+] = WeakKeyDictionary()
+
+_ANALYSIS_POOL: ReferenceAnalysisPool | None = None
+
+
+@callback
+def async_setup_reference_analysis_pool(
+    hass: HomeAssistant,
+    max_workers: int,
+) -> Callable[[], None]:
+    """Set up analyzing references in worker processes.
+
+    Returns a callable to shut the worker processes down again.
+    """
+    # pylint: disable-next=global-statement
+    global _ANALYSIS_POOL  # noqa: PLW0603
+
+    pool = _ANALYSIS_POOL = ReferenceAnalysisPool(hass, max_workers)
+
+    @callback
+    def _async_shutdown() -> None:
+        """Shut down the reference analysis pool."""
+        # pylint: disable-next=global-statement
+        global _ANALYSIS_POOL  # noqa: PLW0603
+        pool.async_shutdown()
+        if _ANALYSIS_POOL is pool:
+            _ANALYSIS_POOL = None
+
+    return _async_shutdown
+
+
+@callback
+def async_get_reference_analysis_pool() -> ReferenceAnalysisPool | None:
+    """Return the reference analysis pool, if analyzing is offloaded."""
+    return _ANALYSIS_POOL
+
+
+async def async_prefetch_automation_references(
+    entities: Iterable[AutomationEntity],
+) -> None:
+    """Analyze the references of automations in worker processes, if enabled.
+
+    Only does something if analyzing is offloaded and there are enough
+    automations that were not analyzed before. Automations that can't
+    be analyzed ahead (like those using a blueprint), are left alone.
+    """
+    if (pool := _ANALYSIS_POOL) is None:
+        return
+    jobs: list[tuple[Script, str, bool, Any]] = []
+    for entity in entities:
+        script = getattr(entity, "action_script", None)
+        config = getattr(entity, "raw_config", None)
+        if (
+            script is None
+            or script in _REFERENCES_CACHE
+            or config is None
+            or entity.referenced_blueprint
+        ):
+            continue
+        config_hash = _hash_config(config)
+        if (references := _async_get_references_by_hash(config_hash)) is not None:
+            _REFERENCES_CACHE[script] = references
+            continue
+        jobs.append((script, config_hash, True, config))
+    await pool.async_prefetch(jobs)
+
+
+async def async_prefetch_script_references(
+    entities: Iterable[ScriptEntity],
+) -> None:
+    """Analyze the references of scripts in worker processes, if enabled.
+
+    Only does something if analyzing is offloaded and there are enough
+    scripts that were not analyzed before. Scripts that can't be
+    analyzed ahead (like those using a blueprint), are left alone.
+    """
+    if (pool := _ANALYSIS_POOL) is None:
+        return
+    jobs: list[tuple[Script, str, bool, Any]] = []
+    for entity in entities:
+        script = getattr(entity, "script", None)
+        raw_config = getattr(entity, "raw_config", None)
+        if (
+            script is None
+            or script in _REFERENCES_CACHE
+            or raw_config is None
+            or getattr(entity, "referenced_blueprint", None)
+        ):
+            continue
+        config_hash = _hash_config(raw_config)
+        if (references := _async_get_references_by_hash(config_hash)) is not None:
+            _REFERENCES_CACHE[script] = references
+            continue
+        jobs.append((script, config_hash, False, (_script_config(entity), [])))
+    await pool.async_prefetch(jobs)
+
+
+class ReferenceGraph:
+    """Reverse dependency graph, of referenced IDs to the consumers using them.
+
+    Consumers are the things that reference IDs, like automations, scripts,
+    scenes, groups, dashboards or helpers. A consumer is identified by the
+    repair that found its references (the source) and its own ID, for
+    example, the entity ID of an automation.
+
+    Referenced IDs are grouped by their kind: entity, device, area, floor,
+    label or service. IDs are interned, so every ID is only kept in memory
+    once, no matter how many consumers reference it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the reference graph."""
+        self._references: dict[tuple[str, str], tuple[str, frozenset[str]]] = {}
+        self._consumers: dict[str, dict[str, set[tuple[str, str]]]] = {}
+
+    @callback
+    def async_set_references(
+        self,
+        source: str,
+        consumer_id: str,
+        kind: str,
+        referenced_ids: AbstractSet[str],
+    ) -> bool:
+        """Set the IDs a consumer references, returns if they changed.
+
+        Only the difference with the previously set references is applied.
+        """
+        consumer = (sys.intern(source), sys.intern(str(consumer_id)))
+        previous_kind, previous_ids = self._references.get(
+            consumer, (kind, frozenset())
+        )
+        if previous_kind != kind:
+            self.async_remove_consumer(source, consumer_id)
+            previous_ids = frozenset()
+        elif consumer in self._references and previous_ids == referenced_ids:
+            return False
+
+        referenced_ids = frozenset(
+            sys.intern(str(referenced_id))
+            for referenced_id in referenced_ids
+            if isinstance(referenced_id, str)
+        )
+        consumers = self._consumers.setdefault(kind, {})
+        for referenced_id in previous_ids - referenced_ids:
+            self._async_unlink(consumers, referenced_id, consumer)
+        for referenced_id in referenced_ids - previous_ids:
+            consumers.setdefault(referenced_id, set()).add(consumer)
+
+        self._references[consumer] = (kind, referenced_ids)
+        return True
+
+    @callback
+    def async_remove_consumer(self, source: str, consumer_id: str) -> None:
+        """Remove a consumer and all its references from the graph."""
+        if (references := self._references.pop((source, consumer_id), None)) is None:
+            return
+        kind, referenced_ids = references
+        consumers = self._consumers[kind]
+        for referenced_id in referenced_ids:
+            self._async_unlink(consumers, referenced_id, (source, consumer_id))
+
+    @callback
+    def async_remove_source(self, source: str) -> None:
+        """Remove all consumers found by a source from the graph."""
+        for consumer_source, consumer_id in list(self._references):
+            if consumer_source == source:
+                self.async_remove_consumer(consumer_source, consumer_id)
+
+    @callback
+    def async_get_consumers(
+        self, kind: str, referenced_id: str
+    ) -> AbstractSet[tuple[str, str]]:
+        """Return the consumers (source, consumer ID) that reference an ID.
+
+        The returned set is owned by the graph and must not be modified.
+        """
+        return self._consumers.get(kind, {}).get(referenced_id, frozenset())
+
+    @callback
+    def async_get_references(self, source: str, consumer_id: str) -> frozenset[str]:
+        """Return the IDs a consumer references."""
+        if (references := self._references.get((source, consumer_id))) is None:
+            return frozenset()
+        return references[1]
+
+    @callback
+    def async_get_stats(self) -> dict[str, int]:
+        """Return statistics of the reference graph."""
+        return {
+            "consumers": len(self._references),
+            "referenced_ids": sum(
+                len(consumers) for consumers in self._consumers.values()
+            ),
+            "references": sum(
+                len(referenced_ids) for _, referenced_ids in self._references.values()
+            ),
+        }
+
+    @staticmethod
+    @callback
+    def _async_unlink(
+        consumers: dict[str, set[tuple[str, str]]],
+        referenced_id: str,
+        consumer: tuple[str, str],
+    ) -> None:
+        """Unlink a referenced ID from a consumer."""
+        if (referencing := consumers.get(referenced_id)) is None:
+            return
+        referencing.discard(consumer)
+        if not referencing:
+            del consumers[referenced_id]
+
+
+_REFERENCE_GRAPH = ReferenceGraph()
+
+
+@callback
+def async_get_reference_graph() -> ReferenceGraph:
+    """Return the reference graph, shared by all Spook repairs."""
+    return _REFERENCE_GRAPH
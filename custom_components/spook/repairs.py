@@ -4,38 +4,226 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 import asyncio
+from collections import Counter, deque
 from dataclasses import dataclass, field
+from functools import partial
 import importlib
-from pathlib import Path
-from typing import TYPE_CHECKING, Any, final
+import math
+import time
+from typing import TYPE_CHECKING, Any, TypeVar, final
 
-from homeassistant.components.homeassistant import SERVICE_HOMEASSISTANT_RESTART
+from homeassistant.components.homeassistant import (
+    SERVICE_HOMEASSISTANT_RESTART,
+    SERVICE_RELOAD_ALL,
+)
 from homeassistant.components.repairs import ConfirmRepairFlow, RepairsFlow
 from homeassistant.config_entries import (
     SIGNAL_CONFIG_ENTRY_CHANGED,
     ConfigEntry,
     ConfigEntryChange,
+    ConfigEntryState,
+)
+from homeassistant.const import (
+    EVENT_CALL_SERVICE,
+    EVENT_COMPONENT_LOADED,
+    SERVICE_RELOAD,
+)
+from homeassistant.core import (
+    DOMAIN as HOMEASSISTANT_DOMAIN,
+    Event,
+    HomeAssistant,
+    callback,
 )
-from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import (
     area_registry as ar,
     device_registry as dr,
     entity_registry as er,
+    floor_registry as fr,
     issue_registry as ir,
+    label_registry as lr,
 )
-from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_at, async_call_later
 from homeassistant.util.async_ import create_eager_task
 
-from .const import DOMAIN, LOGGER
+from .const import (
+    CONF_DISABLED_REPAIRS,
+    CONF_MAX_INTERVAL,
+    CONF_MAX_RUNTIME,
+    CONF_MIN_INTERVAL,
+    CONF_PLACEHOLDER_LIST_LIMIT,
+    CONF_PRESET,
+    CONF_REFERENCE_ANALYSIS_WORKERS,
+    CONF_REPAIRS,
+    CONF_SLICE_LENGTH,
+    CONF_STARTUP_IDLE_PERIOD,
+    CONF_STARTUP_WINDOW,
+    DOMAIN,
+    LOGGER,
+    PLACEHOLDER_LIST_LIMIT,
+    PRESET_BALANCED,
+    PRESETS,
+)
+from .references import (
+    async_get_reference_analysis_pool,
+    async_get_reference_graph,
+    async_setup_persistent_references_cache,
+    async_setup_reference_analysis_pool,
+)
+from .util import async_get_registry_snapshot, get_ectoplasm_index
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Coroutine, Mapping
+    from collections.abc import (
+        AsyncIterator,
+        Awaitable,
+        Callable,
+        Iterable,
+        Mapping,
+        Sequence,
+        Set as AbstractSet,
+    )
+    from datetime import datetime
     from types import ModuleType
 
     from homeassistant.data_entry_flow import FlowResult
     from homeassistant.util.event_type import EventType
 
+    from .util import RegistrySnapshot
+
+# Seconds a repair collects inspection requests before it is inspected (its
+# cooldown), as long as the cost of inspecting it is still unknown
+INSPECTION_COOLDOWN = 3
+
+# Seconds the cooldown of a repair is at least and at most
+INSPECTION_MIN_COOLDOWN = 0.5
+INSPECTION_MAX_COOLDOWN = 60
+
+# Seconds of cooldown, per second an inspection of the repair takes
+INSPECTION_COST_FACTOR = 50
+
+# Number of times the cooldown of a repair doubles, at most, under churn
+INSPECTION_MAX_BACKOFF = 7
+
+# Number of cooldowns without requests, after which a repair is quiet again
+INSPECTION_QUIET_FACTOR = 4
+
+# Seconds within which repairs that are due, are inspected in the same cycle
+INSPECTION_CYCLE_SLACK = 0.5
+
+# Maximum number of repairs inspecting at the same time, during a cycle
+MAX_CONCURRENT_INSPECTIONS = 4
+
+# Seconds an inspection may run in total, before the rest of its work is
+# deferred to the next inspection
+INSPECTION_RUNTIME_BUDGET = 0.25
+
+# Number of inspections in a row that may be deferred; the next one runs
+# to completion, whatever the budget
+INSPECTION_MAX_DEFERRALS = 3
+
+# Trigger of the inspection that continues a deferred inspection
+INSPECTION_DEFERRED = "deferred"
+
+# Trigger of the inspection after the options changed how issues are rendered
+INSPECTION_OPTIONS = "options"
+
+# Seconds an inspection may run, before it yields back to the event loop
+INSPECTION_SLICE_BUDGET = 0.01
+
+# Number of recent inspections the telemetry percentiles are taken over
+TELEMETRY_WINDOW = 100
+
+# Seconds over which the first inspections after startup are spread
+STARTUP_WINDOW = 30
+
+# Estimated cost of a first inspection, from which a repair waits for Home
+# Assistant to be idle, before inspecting for the first time
+STARTUP_COST_EXPENSIVE = 3
+
+# Seconds the event loop has to be quiet, for Home Assistant to be idle
+STARTUP_IDLE_PERIOD = 30
+
+# Seconds an expensive repair waits for Home Assistant to be idle, at most
+STARTUP_IDLE_MAX_WAIT = 300
+
+# Seconds between probes of the event loop, while waiting for it to be idle
+STARTUP_IDLE_PROBE_INTERVAL = 1
+
+# Seconds a probe may be late, for the event loop to still be quiet
+STARTUP_IDLE_MAX_LAG = 0.05
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True, slots=True)
+class InspectEventFilter:
+    """Declares which events of a type are relevant to an inspection.
+
+    An event is relevant if its action is one of the given actions. For
+    updates, at least one of the given fields has to be changed as well;
+    if no fields are given, any update is relevant.
+    """
+
+    actions: frozenset[str] = frozenset({"create", "remove", "update"})
+    changes: frozenset[str] | None = None
+
+    @callback
+    def async_compile(self) -> Callable[[Mapping[str, Any]], bool]:
+        """Compile the declaration into an event filter for the event bus."""
+        actions = self.actions
+        changes = self.changes
+
+        @callback
+        def _async_event_filter(event_data: Mapping[str, Any]) -> bool:
+            """Filter events that are relevant to an inspection."""
+            if (action := event_data.get("action")) not in actions:
+                return False
+            if action != "update" or changes is None:
+                return True
+            return not changes.isdisjoint(event_data.get("changes", ()))
+
+        return _async_event_filter
+
+
+# Events fired once a domain completed reloading. Domains not listed here,
+# that reload using the reload helper, fire an event_<domain>_reloaded event.
+# Reloading all YAML configuration results in these events for each domain.
+RELOAD_EVENTS: Mapping[str, str] = {
+    "automation": "automation_reloaded",
+    "scene": "scene_reloaded",
+    "script": "script_reloaded",
+    "template": "event_template_reloaded",
+}
+
+# Domains that fire no event once they completed reloading. For these, the
+# call of their reload action (or of reloading all YAML configuration) is
+# hooked instead; the cooldown of the repairs covers the reload itself.
+RELOAD_SERVICE_DOMAINS: frozenset[str] = frozenset({"group"})
+
+
+# Registry events are only relevant to inspections when the set of known IDs
+# changes, or the name of an entity does; issues name the entity they were
+# found in. Changing its icon doesn't matter; changing its entity ID does.
+# Events not listed here are not filtered.
+INSPECT_EVENT_FILTERS: Mapping[str, InspectEventFilter] = {
+    er.EVENT_ENTITY_REGISTRY_UPDATED: InspectEventFilter(
+        changes=frozenset({"entity_id", "name", "original_name"}),
+    ),
+    ar.EVENT_AREA_REGISTRY_UPDATED: InspectEventFilter(
+        actions=frozenset({"create", "remove"}),
+    ),
+    dr.EVENT_DEVICE_REGISTRY_UPDATED: InspectEventFilter(
+        actions=frozenset({"create", "remove"}),
+    ),
+    fr.EVENT_FLOOR_REGISTRY_UPDATED: InspectEventFilter(
+        actions=frozenset({"create", "remove"}),
+    ),
+    lr.EVENT_LABEL_REGISTRY_UPDATED: InspectEventFilter(
+        actions=frozenset({"create", "remove"}),
+    ),
+}
+
 
 class AbstractSpookRepairBase(ABC):
     """Abstract base class to hold a Spook repairs."""
@@ -50,6 +238,10 @@ class AbstractSpookRepairBase(ABC):
     entity_registry: er.EntityRegistry
 
     issue_ids: set[str]
+    issue_lists: dict[str, dict[str, list[str]]]
+    placeholder_list_limit: int = PLACEHOLDER_LIST_LIMIT
+
+    _issue_batch: dict[str, dict[str, Any] | None] | None = None
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the service."""
@@ -59,10 +251,10 @@ class AbstractSpookRepairBase(ABC):
         self.device_registry = dr.async_get(hass)
         self.entity_registry = er.async_get(hass)
         self.issue_ids = set()
+        self.issue_lists = {}
 
     @final
     @callback
-    # pylint: disable-next=too-many-arguments
     def async_create_issue(  # noqa: PLR0913
         self,
         *,
@@ -75,38 +267,154 @@ class AbstractSpookRepairBase(ABC):
         learn_more_url: str | None = None,
         severity: ir.IssueSeverity = ir.IssueSeverity.WARNING,
         translation_placeholders: dict[str, str] | None = None,
+        placeholder_lists: Mapping[str, Iterable[str]] | None = None,
     ) -> None:
-        """Create an issue."""
+        """Create an issue.
+
+        Placeholder lists are rendered into the translation placeholders as
+        markdown lists, capped at the placeholder list limit, so the issue
+        registry stays small. The full lists are kept by the repair.
+
+        During an issue batch, the issue is only created when the batch
+        is applied, and only if it differs from the issue registered.
+        """
         self.issue_ids.add(issue_id)
+        if placeholder_lists:
+            translation_placeholders = dict(translation_placeholders or {})
+            self.issue_lists[issue_id] = {}
+            for key, values in placeholder_lists.items():
+                items = self.issue_lists[issue_id][key] = sorted(values)
+                translation_placeholders[key] = format_placeholder_list(
+                    items, self.placeholder_list_limit
+                )
+        else:
+            self.issue_lists.pop(issue_id, None)
+        issue = {
+            "breaks_in_ha_version": breaks_in_ha_version,
+            "data": data,
+            "is_fixable": is_fixable,
+            "is_persistent": is_persistent,
+            "issue_domain": issue_domain or self.domain,
+            "learn_more_url": learn_more_url,
+            "severity": severity,
+            "translation_key": self.repair,
+            "translation_placeholders": translation_placeholders,
+        }
+        if self._issue_batch is not None:
+            self._issue_batch[issue_id] = issue
+            return
         ir.async_create_issue(
             self.hass,
-            breaks_in_ha_version=breaks_in_ha_version,
-            data=data,
             domain=DOMAIN,
-            is_fixable=is_fixable,
-            is_persistent=is_persistent,
-            issue_domain=issue_domain or self.domain,
             issue_id=f"{self.repair}_{issue_id}",
-            learn_more_url=learn_more_url,
-            severity=severity,
-            translation_key=self.repair,
-            translation_placeholders=translation_placeholders,
+            **issue,
         )
 
+    @final
+    @callback
+    def async_keep_issue(
+        self,
+        issue_id: str,
+        translation_placeholders: Mapping[str, str] | None = None,
+    ) -> bool:
+        """Keep an issue, created by a previous inspection, if it still exists.
+
+        Used by inspections that skip things that didn't change since the
+        previous inspection, so the issue isn't cleaned up automatically.
+
+        The issue is only kept if its translation placeholders are still the
+        given ones (for example, the thing got renamed otherwise), and its
+        placeholder lists are known (they aren't after a restart) and rendered
+        with the current placeholder list limit. Returns False if the issue
+        can't be kept as is; the inspection then has to evaluate it again,
+        to create the issue anew.
+        """
+        entry = self.issue_registry.async_get_issue(DOMAIN, f"{self.repair}_{issue_id}")
+        if entry is None:
+            return True
+
+        placeholders = entry.translation_placeholders or {}
+        translation_placeholders = translation_placeholders or {}
+        lists = self.issue_lists.get(issue_id, {})
+        if any(
+            placeholders.get(key) != value
+            for key, value in translation_placeholders.items()
+        ) or any(
+            key not in lists
+            or value != format_placeholder_list(lists[key], self.placeholder_list_limit)
+            for key, value in placeholders.items()
+            if key not in translation_placeholders
+        ):
+            return False
+
+        self.issue_ids.add(issue_id)
+        return True
+
     @final
     @callback
     def async_delete_issue(
         self,
         issue_id: str,
     ) -> None:
-        """Remove an issue."""
+        """Remove an issue.
+
+        During an issue batch, the issue is only removed when the batch
+        is applied.
+        """
         self.issue_ids.discard(issue_id)
+        self.issue_lists.pop(issue_id, None)
+        if self._issue_batch is not None:
+            self._issue_batch[issue_id] = None
+            return
         ir.async_delete_issue(
             self.hass,
             domain=DOMAIN,
             issue_id=f"{self.repair}_{issue_id}",
         )
 
+    @final
+    @callback
+    def async_start_issue_batch(self) -> None:
+        """Start collecting issue changes, instead of applying them directly."""
+        self._issue_batch = {}
+
+    @final
+    @callback
+    def async_apply_issue_batch(self) -> tuple[int, int]:
+        """Apply the collected issue changes, in a single batch.
+
+        The desired issues are compared with the issue registry, and only
+        real changes are applied. Issues that are registered already and
+        didn't change, are not rewritten; issues that don't exist, are not
+        removed. As the issue registry delays saving, all changes of the
+        batch end up in a single save.
+
+        Returns the number of issues created (or updated) and removed.
+        """
+        if (batch := self._issue_batch) is None:
+            return (0, 0)
+        self._issue_batch = None
+
+        created = removed = 0
+        for issue_id, issue in batch.items():
+            registry_issue_id = f"{self.repair}_{issue_id}"
+            entry = self.issue_registry.async_get_issue(DOMAIN, registry_issue_id)
+            if issue is None:
+                if entry is not None:
+                    ir.async_delete_issue(
+                        self.hass, domain=DOMAIN, issue_id=registry_issue_id
+                    )
+                    removed += 1
+            elif entry is None or not _issue_entry_matches(entry, issue):
+                ir.async_create_issue(
+                    self.hass,
+                    domain=DOMAIN,
+                    issue_id=registry_issue_id,
+                    **issue,
+                )
+                created += 1
+        return (created, removed)
+
     @abstractmethod
     async def async_activate(self) -> None:
         """Handle the activating a repair."""
@@ -119,43 +427,426 @@ class AbstractSpookRepairBase(ABC):
 
     async def async_deactivate(self) -> None:
         """Unregister the repair."""
-        for issue_id in self.issue_ids:
+        for issue_id in list(self.issue_ids):
             self.async_delete_issue(issue_id)
 
 
+def format_placeholder_list(items: Sequence[str], limit: int) -> str:
+    """Return IDs as a markdown list for a placeholder, capped at the limit."""
+    lines = [f"- `{item}`" for item in items[:limit]]
+    if (more := len(items) - limit) > 0:
+        lines.append(f"- _+{more} more_")
+    return "\n".join(lines)
+
+
+def _issue_entry_matches(entry: ir.IssueEntry, issue: dict[str, Any]) -> bool:
+    """Return if a registered issue matches the issue to create."""
+    return entry.active and all(
+        getattr(entry, key) == value for key, value in issue.items()
+    )
+
+
+class RollingStats:
+    """Rolling aggregates of a measurement: count, p50, p95 and max.
+
+    The count and max cover all samples, the percentiles are taken over
+    the most recent samples only.
+    """
+
+    def __init__(self, window: int = TELEMETRY_WINDOW) -> None:
+        """Initialize the rolling statistics."""
+        self.count = 0
+        self.max: float = 0
+        self._samples: deque[float] = deque(maxlen=window)
+
+    @callback
+    def async_add(self, value: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        self.max = max(self.max, value)
+        self._samples.append(value)
+
+    @callback
+    def async_get_percentile(self, percentile: float) -> float:
+        """Return a percentile (0-1) of the recent samples, by nearest rank."""
+        if not self._samples:
+            return 0
+        samples = sorted(self._samples)
+        return samples[max(0, math.ceil(len(samples) * percentile) - 1)]
+
+    @callback
+    def as_dict(self) -> dict[str, float]:
+        """Return the aggregates as a dictionary."""
+        return {
+            "count": self.count,
+            "p50": self.async_get_percentile(0.5),
+            "p95": self.async_get_percentile(0.95),
+            "max": self.max,
+        }
+
+
+@dataclass
+class InspectionTelemetry:
+    """Telemetry of the inspections of a repair."""
+
+    wall_time: RollingStats = field(default_factory=RollingStats)
+    cpu_time: RollingStats = field(default_factory=RollingStats)
+    consumers: RollingStats = field(default_factory=RollingStats)
+    checked_ids: RollingStats = field(default_factory=RollingStats)
+    issues_created: int = 0
+    issues_removed: int = 0
+    deferrals: int = 0
+    triggers: Counter[str] = field(default_factory=Counter)
+    first_inspected: float | None = None
+
+    @callback
+    def async_record(  # noqa: PLR0913
+        self,
+        *,
+        wall_time: float,
+        cpu_time: float,
+        consumers: int,
+        checked_ids: int,
+        issues_created: int,
+        issues_removed: int,
+        triggers: Iterable[str],
+    ) -> None:
+        """Record an inspection."""
+        if self.first_inspected is None:
+            self.first_inspected = time.monotonic()
+        self.wall_time.async_add(wall_time)
+        self.cpu_time.async_add(cpu_time)
+        self.consumers.async_add(consumers)
+        self.checked_ids.async_add(checked_ids)
+        self.issues_created += issues_created
+        self.issues_removed += issues_removed
+        self.triggers.update(triggers)
+
+    @callback
+    def as_dict(self) -> dict[str, Any]:
+        """Return the telemetry as a dictionary."""
+        return {
+            "wall_time": self.wall_time.as_dict(),
+            "cpu_time": self.cpu_time.as_dict(),
+            "consumers": self.consumers.as_dict(),
+            "checked_ids": self.checked_ids.as_dict(),
+            "issues_created": self.issues_created,
+            "issues_removed": self.issues_removed,
+            "deferrals": self.deferrals,
+            "triggers": dict(self.triggers),
+        }
+
+
+class ReferencesTracker:
+    """Track what the consumers inspected by a repair reference.
+
+    Consumers are things like automations, scripts or helpers. The IDs each
+    consumer references are kept in the shared reference graph, together
+    with the hash of its configuration, if it has one. An inspection then
+    only has to re-evaluate consumers of which the configuration changed,
+    or that reference IDs that were added or removed since the previous
+    inspection; the latter are looked up in the reference graph.
+    """
+
+    def __init__(self, source: str, kind: str) -> None:
+        """Initialize the tracker."""
+        self.source = source
+        self.kind = kind
+        self._graph = async_get_reference_graph()
+        self._config_hashes: dict[str, str | None] = {}
+        self._dirty: set[str] | None = None
+        self._deferred: set[str] = set()
+        self._seen: set[str] = set()
+        self._known_ids: AbstractSet[str] | None = None
+        self.checked_ids = 0
+
+    @callback
+    def async_start(self, known_ids: AbstractSet[str]) -> None:
+        """Start an inspection against the IDs that are currently known."""
+        if self._known_ids is None:
+            self._dirty = None
+        elif self._known_ids is known_ids:
+            self._dirty = set(self._deferred)
+        else:
+            self._dirty = self._deferred | {
+                consumer_id
+                for referenced_id in self._known_ids ^ known_ids
+                for source, consumer_id in self._graph.async_get_consumers(
+                    self.kind, referenced_id
+                )
+                if source == self.source
+            }
+        self._deferred = set()
+        self._known_ids = known_ids
+        self._seen.clear()
+        self.checked_ids = 0
+
+    @callback
+    def async_is_dirty(
+        self,
+        consumer_id: str,
+        config_hash: str | None,
+        referenced_ids: AbstractSet[str],
+    ) -> bool:
+        """Return if a consumer needs to be re-evaluated."""
+        self._seen.add(consumer_id)
+        is_new = consumer_id not in self._config_hashes
+        hash_changed = self._config_hashes.get(consumer_id) != config_hash
+        self._config_hashes[consumer_id] = config_hash
+        references_changed = self._graph.async_set_references(
+            self.source, consumer_id, self.kind, referenced_ids
+        )
+        if (
+            self._dirty is None
+            or is_new
+            or hash_changed
+            or references_changed
+            or consumer_id in self._dirty
+        ):
+            self.checked_ids += len(referenced_ids)
+            return True
+        return False
+
+    @callback
+    def async_defer(self) -> AbstractSet[str]:
+        """Stop an inspection halfway, deferring the rest to the next one.
+
+        Consumers that still had to be re-evaluated, are re-evaluated by the
+        next inspection. Returns the consumers that were inspected.
+        """
+        if self._dirty is not None:
+            self._deferred = self._dirty - self._seen
+        return self._seen
+
+    @callback
+    def async_finish(self) -> None:
+        """Finish an inspection, forgetting consumers that weren't inspected."""
+        for consumer_id in self._config_hashes.keys() - self._seen:
+            del self._config_hashes[consumer_id]
+            self._graph.async_remove_consumer(self.source, consumer_id)
+
+    @callback
+    def async_clear(self) -> None:
+        """Forget all consumers."""
+        self._config_hashes.clear()
+        self._deferred.clear()
+        self._known_ids = None
+        self._graph.async_remove_source(self.source)
+
+
+class DetachedReferencesTracker(ReferencesTracker):
+    """Tracker that re-evaluates all consumers, and remembers nothing.
+
+    Used for dry-run inspections, so they leave the references tracked by
+    the repair (and the shared reference graph) alone.
+    """
+
+    @callback
+    def async_start(self, _known_ids: AbstractSet[str]) -> None:
+        """Start an inspection."""
+        self.checked_ids = 0
+
+    @callback
+    def async_is_dirty(
+        self,
+        _consumer_id: str,
+        _config_hash: str | None,
+        referenced_ids: AbstractSet[str],
+    ) -> bool:
+        """Return that the consumer needs to be re-evaluated; always."""
+        self.checked_ids += len(referenced_ids)
+        return True
+
+    @callback
+    def async_finish(self) -> None:
+        """Finish an inspection."""
+
+    @callback
+    def async_clear(self) -> None:
+        """Forget all consumers."""
+
+
+class _InspectionDeferredError(Exception):
+    """Raised when an inspection ran out of its runtime budget."""
+
+
 class AbstractSpookRepair(AbstractSpookRepairBase):
     """Abstract base class to hold a Spook repairs."""
 
     inspect_events: set[EventType[Any] | str] | None = None
-    inspect_debouncer: Debouncer[Coroutine[Any, Any, None]]
+    inspect_event_filters: Mapping[str, InspectEventFilter] = INSPECT_EVENT_FILTERS
     inspect_config_entry_changed: bool | str = False
     inspect_on_reload: bool | str = False
+    inspect_priority: int = 0
+    inspect_scheduler: SpookInspectionScheduler
+    inspect_slice_budget: float = INSPECTION_SLICE_BUDGET
+    # Seconds an inspection may run in total, before the rest of its work is
+    # deferred to the next inspection
+    inspect_runtime_budget: float = INSPECTION_RUNTIME_BUDGET
+    # Estimated cost of the first inspection; 1 is cheap, from
+    # STARTUP_COST_EXPENSIVE it waits for Home Assistant to be idle
+    inspect_startup_cost: int = 1
+    startup_planner: SpookStartupPlanner
+    reload_notifier: SpookReloadNotifier
 
     automatically_clean_up_issues: bool = False
     possible_issue_ids: set[str]
 
+    # Set while a dry-run inspection runs; state the repair keeps between
+    # inspections must not be changed by it
+    dry_run: bool
+    reference_kind: str = "entity"
+    references: ReferencesTracker
+    registry_snapshot: RegistrySnapshot
+
+    slices: int
+    worst_slice: float
+    telemetry: InspectionTelemetry
+    # CPU time of the last inspection, summed over its time slices
+    cpu_time: float
+
+    _active: bool
+    _budget: float | None
+    _consecutive_deferrals: int
+    _consumers_scanned: int
     _event_subs: set[Callable[[], None]]
+    _inspect_lock: asyncio.Lock
+    _runtime: float
+    _slice_start: float
+    _slice_start_cpu: float
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the repair."""
         super().__init__(hass)
+        self._active = False
+        self._budget = None
+        self._consecutive_deferrals = 0
+        self.dry_run = False
+        self._runtime = 0.0
         self._event_subs = set()
+        self._inspect_lock = asyncio.Lock()
         self.possible_issue_ids = set()
+        self.references = ReferencesTracker(self.repair, self.reference_kind)
+        self.slices = 0
+        self.worst_slice = 0.0
+        self.telemetry = InspectionTelemetry()
+        self.cpu_time = 0.0
+        self._consumers_scanned = 0
+        self._async_start_slice()
 
-    async def async_activate(self) -> None:  # noqa: C901
-        """Handle the activating a repair."""
+    @final
+    async def async_iterate(self, items: Iterable[_T]) -> AsyncIterator[_T]:
+        """Iterate over items during an inspection, in time slices.
+
+        Once the inspection ran for longer than the slice budget, control is
+        handed back to the event loop before continuing with the next item.
+        This keeps large inspections from blocking the event loop. The items
+        are copied first, so they can change while the inspection yields.
+
+        Once the inspection ran for longer than its runtime budget in total,
+        it stops and the rest of the items is deferred to the next inspection.
+        """
+        for item in list(items):
+            self._consumers_scanned += 1
+            yield item
+            elapsed = time.perf_counter() - self._slice_start
+            if self._budget is not None and self._runtime + elapsed >= self._budget:
+                raise _InspectionDeferredError
+            if elapsed >= self.inspect_slice_budget:
+                self._async_end_slice()
+                await asyncio.sleep(0)
+                self._async_start_slice()
 
-        async def _async_inspect() -> None:
-            # Don't inspect if we are stopping
-            if self.hass.is_stopping:
-                return
+    @final
+    async def async_wait(self, awaitable: Awaitable[_T]) -> _T:
+        """Wait for work done outside the event loop, during an inspection.
+
+        The wait ends the current time slice, so it isn't counted as time
+        the inspection blocked the event loop.
+        """
+        self._async_end_slice()
+        try:
+            return await awaitable
+        finally:
+            self._async_start_slice()
 
-            if self.automatically_clean_up_issues:
-                # Reset registered issues. If they are still valid, they will be
-                # re-registered during the inspection.
-                self.issue_ids.clear()
+    @callback
+    def _async_start_slice(self) -> None:
+        """Start a time slice, when the inspection resumes."""
+        self._slice_start = time.perf_counter()
+        self._slice_start_cpu = time.thread_time()
+
+    @callback
+    def _async_end_slice(self) -> None:
+        """Record the duration of the current time slice.
+
+        The CPU time is measured per slice, from resuming to yielding, so the
+        CPU time of other work done on the event loop in between isn't counted.
+        """
+        duration = time.perf_counter() - self._slice_start
+        self._runtime += duration
+        self.cpu_time += time.thread_time() - self._slice_start_cpu
+        if self.dry_run:
+            return
+        self.slices += 1
+        self.worst_slice = max(self.worst_slice, duration)
 
+    @final
+    @callback
+    def async_request_inspection(self, trigger: str) -> None:
+        """Request an inspection from the scheduler."""
+        self.inspect_scheduler.async_schedule(self, trigger)
+
+    @final
+    async def async_run_inspection(
+        self,
+        snapshot: RegistrySnapshot,
+        triggers: Iterable[str] = (),
+    ) -> tuple[int, int]:
+        """Run an inspection against a snapshot of all known IDs.
+
+        Returns the number of issues created (or updated) and removed.
+        """
+        # Don't inspect if we are stopping
+        if self.hass.is_stopping:
+            return (0, 0)
+
+        async with self._inspect_lock:
+            # The repair might have been deactivated while waiting
+            if not self._active:
+                self.cpu_time = 0.0
+                return (0, 0)
+            return await self._async_run_inspection(snapshot, triggers)
+
+    async def _async_run_inspection(
+        self,
+        snapshot: RegistrySnapshot,
+        triggers: Iterable[str],
+    ) -> tuple[int, int]:
+        """Run an inspection, while holding the inspection lock."""
+        self.registry_snapshot = snapshot
+        self._consumers_scanned = 0
+        self.references.checked_ids = 0
+        start = time.perf_counter()
+        self._runtime = 0.0
+        self.cpu_time = 0.0
+        self._async_start_slice()
+        # After too many deferrals in a row, the inspection has to complete
+        if self._consecutive_deferrals < INSPECTION_MAX_DEFERRALS:
+            self._budget = self.inspect_runtime_budget
+
+        previous_issue_ids = set(self.issue_ids)
+        if self.automatically_clean_up_issues:
+            # Reset registered issues. If they are still valid, they will be
+            # re-registered during the inspection.
+            self.issue_ids.clear()
+
+        # Collect all issue changes and reconcile them with the issue
+        # registry afterwards, so only real changes are applied.
+        self.async_start_issue_batch()
+        try:
             await self.async_inspect()
+            self._consecutive_deferrals = 0
 
             if self.automatically_clean_up_issues:
                 # Remove issues that are not longer created after inspection.
@@ -164,58 +855,159 @@ class AbstractSpookRepair(AbstractSpookRepairBase):
                 # Remove issues that are no longer valid.
                 for issue_id in self.issue_ids - self.possible_issue_ids:
                     self.async_delete_issue(issue_id)
+        except _InspectionDeferredError:
+            self._async_defer_inspection(previous_issue_ids)
+        finally:
+            self._budget = None
+            issues_created, issues_removed = self.async_apply_issue_batch()
+            self._async_end_slice()
+            self.telemetry.async_record(
+                wall_time=time.perf_counter() - start,
+                cpu_time=self.cpu_time,
+                consumers=self._consumers_scanned,
+                checked_ids=self.references.checked_ids,
+                issues_created=issues_created,
+                issues_removed=issues_removed,
+                triggers=triggers,
+            )
+        return (issues_created, issues_removed)
 
-        # Debouncer to prevent multiple inspections / inspections fired quickly
-        # after each other.
-        self.inspect_debouncer = Debouncer(
-            self.hass,
-            LOGGER,
-            cooldown=3,
-            immediate=False,
-            function=_async_inspect,
+    @callback
+    def _async_defer_inspection(self, previous_issue_ids: set[str]) -> None:
+        """Defer the rest of an inspection that ran out of its runtime budget.
+
+        Only the issues of the consumers that were inspected are updated; the
+        issues of all other consumers stay as they are, until the next
+        inspection, which is requested right away, gets to them.
+        """
+        inspected = self.references.async_defer()
+        if self.automatically_clean_up_issues:
+            for issue_id in inspected - self.issue_ids:
+                self.async_delete_issue(issue_id)
+        self.issue_ids.update(previous_issue_ids - inspected)
+        self._consecutive_deferrals += 1
+        self.telemetry.deferrals += 1
+        LOGGER.debug(
+            "Spook deferred the rest of the inspection of %s, "
+            "it ran out of its runtime budget",
+            self.repair,
         )
+        self.async_request_inspection(INSPECTION_DEFERRED)
+
+    @final
+    async def async_run_dry_inspection(
+        self,
+        snapshot: RegistrySnapshot,
+    ) -> dict[str, dict[str, Any]]:
+        """Run an inspection that doesn't change the issue registry.
+
+        All consumers are evaluated, as if the repair never inspected before.
+        The inspection runs against detached state; the issues, tracked
+        references, registry snapshot, slices and telemetry of the repair are
+        left alone. Returns the issues the inspection found, by issue ID.
+        """
+        async with self._inspect_lock:
+            references, issue_ids, issue_lists, possible_issue_ids = (
+                self.references,
+                self.issue_ids,
+                self.issue_lists,
+                self.possible_issue_ids,
+            )
+            # There is no snapshot yet, if the repair never inspected before
+            previous_snapshot: RegistrySnapshot | None = vars(self).get(
+                "registry_snapshot"
+            )
+            consumers_scanned = self._consumers_scanned
+            self.references = DetachedReferencesTracker(
+                references.source, references.kind
+            )
+            self.issue_ids = set()
+            self.issue_lists = {}
+            self.possible_issue_ids = set(possible_issue_ids)
+            self.registry_snapshot = snapshot
+            self.dry_run = True
+            self._runtime = 0.0
+            self.cpu_time = 0.0
+            self._async_start_slice()
+            self.async_start_issue_batch()
+            try:
+                await self.async_inspect()
+                batch = self._issue_batch or {}
+                return {
+                    f"{self.repair}_{issue_id}": {
+                        "translation_placeholders": issue["translation_placeholders"],
+                        "references": self.issue_lists.get(issue_id, {}),
+                    }
+                    for issue_id, issue in batch.items()
+                    if issue is not None and issue_id in self.issue_ids
+                }
+            finally:
+                self._async_end_slice()
+                self._issue_batch = None
+                self.dry_run = False
+                self._consumers_scanned = consumers_scanned
+                self.references, self.issue_ids, self.issue_lists = (
+                    references,
+                    issue_ids,
+                    issue_lists,
+                )
+                self.possible_issue_ids = possible_issue_ids
+                if previous_snapshot is None:
+                    del self.registry_snapshot
+                else:
+                    self.registry_snapshot = previous_snapshot
+
+    @final
+    @callback
+    def async_get_findings(self) -> dict[str, dict[str, Any]]:
+        """Return the issues found by the last inspection, by issue ID."""
+        findings: dict[str, dict[str, Any]] = {}
+        for issue_id in self.issue_ids:
+            registry_issue_id = f"{self.repair}_{issue_id}"
+            if entry := self.issue_registry.async_get_issue(DOMAIN, registry_issue_id):
+                findings[registry_issue_id] = {
+                    "translation_placeholders": entry.translation_placeholders,
+                    "references": self.issue_lists.get(issue_id, {}),
+                }
+        return findings
+
+    async def async_activate(self) -> None:
+        """Handle the activating a repair."""
+        self._active = True
 
         # Spook says: Bounce!
-        await self.inspect_debouncer.async_call()
+        self.startup_planner.async_request_first_inspection(self)
 
         if self.inspect_events is None:
             return
 
-        async def _async_call_inspect_debouncer(_: Event) -> None:
+        @callback
+        def _async_request_inspection(event: Event) -> None:
             # Trigger an inspection when an event is received from the event bus.
-            await self.inspect_debouncer.async_call()
+            self.async_request_inspection(event.event_type)
 
         for event in self.inspect_events:
+            event_filter = self.inspect_event_filters.get(str(event))
             self._event_subs.add(
-                self.hass.bus.async_listen(event, _async_call_inspect_debouncer),
+                self.hass.bus.async_listen(
+                    event,
+                    _async_request_inspection,
+                    event_filter=event_filter.async_compile() if event_filter else None,
+                ),
             )
 
         if self.inspect_on_reload:
-
-            @callback
-            def _filter_event(data: Mapping[str, Any] | Event) -> bool:
-                """Filter for reload events."""
-                event_data = data.data if isinstance(data, Event) else data
-                service = event_data.get("service")
-                if service is None:
-                    return False
-                if service == "reload_all":
-                    return True
-                if service != "reload":
-                    return False
-                if self.inspect_on_reload is True:
-                    return True
-                return self.inspect_on_reload == event_data.get("domain")
-
-            self.hass.bus.async_listen(
-                "call_service",
-                _async_call_inspect_debouncer,
-                event_filter=_filter_event,
+            self._event_subs.add(
+                self.reload_notifier.async_register(
+                    self,
+                    None if self.inspect_on_reload is True else self.inspect_on_reload,
+                )
             )
 
         if self.inspect_config_entry_changed:
 
-            async def _async_config_entry_changed(  # pylint: disable=unused-argument
+            @callback
+            def _async_config_entry_changed(  # pylint: disable=unused-argument
                 change: ConfigEntryChange,  # noqa: ARG001
                 entry: ConfigEntry,
             ) -> None:
@@ -225,19 +1017,31 @@ class AbstractSpookRepair(AbstractSpookRepairBase):
                     and entry.domain != self.inspect_config_entry_changed
                 ):
                     return
-                await self.inspect_debouncer.async_call()
+                self.async_request_inspection(SIGNAL_CONFIG_ENTRY_CHANGED)
 
-            async_dispatcher_connect(
-                self.hass,
-                SIGNAL_CONFIG_ENTRY_CHANGED,
-                _async_config_entry_changed,
+            self._event_subs.add(
+                async_dispatcher_connect(
+                    self.hass,
+                    SIGNAL_CONFIG_ENTRY_CHANGED,
+                    _async_config_entry_changed,
+                )
             )
 
     async def async_deactivate(self) -> None:
-        """Unregister the repair."""
+        """Unregister the repair.
+
+        Waits for a running inspection to finish first, so it can't create
+        issues after the repair got deactivated. Inspections that are still
+        scheduled, are cancelled.
+        """
+        self._active = False
         for sub in self._event_subs:
             sub()
-        await super().async_deactivate()
+        self._event_subs.clear()
+        self.inspect_scheduler.async_cancel(self)
+        async with self._inspect_lock:
+            self.references.async_clear()
+            await super().async_deactivate()
 
 
 class AbstractSpookSingleShotRepairs(AbstractSpookRepairBase, ABC):
@@ -246,7 +1050,11 @@ class AbstractSpookSingleShotRepairs(AbstractSpookRepairBase, ABC):
     @final
     async def async_activate(self) -> None:
         """Actives the repairs."""
-        await self.async_inspect()
+        self.async_start_issue_batch()
+        try:
+            await self.async_inspect()
+        finally:
+            self.async_apply_issue_batch()
 
     @final
     async def async_deactivate(self) -> None:
@@ -254,6 +1062,647 @@ class AbstractSpookSingleShotRepairs(AbstractSpookRepairBase, ABC):
         await super().async_deactivate()
 
 
+@dataclass(slots=True)
+class AdaptiveCooldown:
+    """Cooldown of a repair, adapting to its cost and how often it is requested.
+
+    The base cooldown scales with how long inspecting the repair takes. A
+    repair that is requested again within its cooldown after inspecting, is
+    under churn; each time that happens, its cooldown doubles. Once the
+    repair is requested after a quiet period, it returns to the base cooldown
+    and responds fast again. In between, it backs down a step at a time.
+    """
+
+    min_cooldown: float = INSPECTION_MIN_COOLDOWN
+    max_cooldown: float = INSPECTION_MAX_COOLDOWN
+    window: float = INSPECTION_COOLDOWN
+    backoff: int = 0
+    last_inspected: float | None = None
+
+    @callback
+    def async_next_window(self, now: float, cost: float | None) -> float:
+        """Adapt and return the cooldown, for a request at the given time."""
+        if self.last_inspected is not None:
+            since = now - self.last_inspected
+            if since < self.window:
+                self.backoff = min(self.backoff + 1, INSPECTION_MAX_BACKOFF)
+            elif since > self.window * INSPECTION_QUIET_FACTOR:
+                self.backoff = 0
+            else:
+                self.backoff = max(self.backoff - 1, 0)
+
+        base = INSPECTION_COOLDOWN if cost is None else cost * INSPECTION_COST_FACTOR
+        self.window = min(
+            max(base, self.min_cooldown) * 2**self.backoff,
+            self.max_cooldown,
+        )
+        return self.window
+
+    @callback
+    def as_dict(self) -> dict[str, Any]:
+        """Return the cooldown as a dictionary."""
+        return {"window": round(self.window, 3), "backoff": self.backoff}
+
+
+class SpookInspectionScheduler:
+    """Schedule the inspections of all Spook repairs, in cycles.
+
+    Repairs don't inspect on their own when triggered, but request an
+    inspection from the scheduler instead. The scheduler collects all
+    requests (triggers) of a repair during its cooldown, which adapts to
+    the cost of the repair and how often it is requested. Once a repair
+    is due, a cycle runs: a single snapshot of all known IDs is taken, and
+    each repair that is due (or almost due) is inspected once against it.
+    The number of concurrent inspections is limited; repairs with a higher
+    priority go first, and for the same priority, the repair that inspected
+    the fastest last time goes first.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        min_cooldown: float = INSPECTION_MIN_COOLDOWN,
+        max_cooldown: float = INSPECTION_MAX_COOLDOWN,
+        max_concurrent_inspections: int = MAX_CONCURRENT_INSPECTIONS,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.min_cooldown = min_cooldown
+        self.max_cooldown = max_cooldown
+        self._pending: dict[AbstractSpookRepair, set[str]] = {}
+        self._due: dict[AbstractSpookRepair, float] = {}
+        self._cooldowns: dict[AbstractSpookRepair, AdaptiveCooldown] = {}
+        self._limits: dict[AbstractSpookRepair, tuple[float, float]] = {}
+        self._durations: dict[AbstractSpookRepair, float] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent_inspections)
+        self._unsub_timer: Callable[[], None] | None = None
+        self._timer_at: float | None = None
+        self.cycles = 0
+        self.triggers = 0
+        self.inspections = 0
+        self.last_cycle: dict[str, Any] = {}
+        self._running = False
+
+    @property
+    def is_idle(self) -> bool:
+        """Return if no inspections are pending or running."""
+        return not self._pending and not self._running
+
+    @callback
+    def async_schedule(self, repair: AbstractSpookRepair, trigger: str) -> None:
+        """Schedule an inspection of a repair, once its cooldown passed."""
+        self._pending.setdefault(repair, set()).add(trigger)
+        self.triggers += 1
+        if repair in self._due:
+            return
+
+        now = self.hass.loop.time()
+        if (cooldown := self._cooldowns.get(repair)) is None:
+            min_cooldown, max_cooldown = self._limits.get(
+                repair, (self.min_cooldown, self.max_cooldown)
+            )
+            cooldown = self._cooldowns[repair] = AdaptiveCooldown(
+                min_cooldown=min_cooldown,
+                max_cooldown=max_cooldown,
+            )
+        cost = (
+            repair.telemetry.wall_time.async_get_percentile(0.95)
+            if repair.telemetry.wall_time.count
+            else None
+        )
+        self._due[repair] = now + cooldown.async_next_window(now, cost)
+        self._async_schedule_cycle()
+
+    @callback
+    def async_configure(
+        self,
+        repair: AbstractSpookRepair,
+        *,
+        min_cooldown: float,
+        max_cooldown: float,
+    ) -> None:
+        """Set the limits of the cooldown of a repair."""
+        max_cooldown = max(min_cooldown, max_cooldown)
+        self._limits[repair] = (min_cooldown, max_cooldown)
+        if (cooldown := self._cooldowns.get(repair)) is not None:
+            cooldown.min_cooldown = min_cooldown
+            cooldown.max_cooldown = max_cooldown
+
+    @callback
+    def async_cancel(self, repair: AbstractSpookRepair) -> None:
+        """Cancel a scheduled inspection of a repair."""
+        self._pending.pop(repair, None)
+        self._due.pop(repair, None)
+        self._cooldowns.pop(repair, None)
+        self._limits.pop(repair, None)
+        self._durations.pop(repair, None)
+
+    @callback
+    def async_get_cooldown(self, repair: AbstractSpookRepair) -> dict[str, Any]:
+        """Return the current cooldown of a repair."""
+        if (cooldown := self._cooldowns.get(repair)) is None:
+            min_cooldown, max_cooldown = self._limits.get(
+                repair, (self.min_cooldown, self.max_cooldown)
+            )
+            return AdaptiveCooldown(
+                min_cooldown=min_cooldown,
+                max_cooldown=max_cooldown,
+            ).as_dict()
+        return cooldown.as_dict()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Shut down the scheduler."""
+        self._pending.clear()
+        self._due.clear()
+        self._async_cancel_timer()
+
+    @callback
+    def async_get_stats(self) -> dict[str, Any]:
+        """Return statistics of the scheduler."""
+        return {
+            "cycles": self.cycles,
+            "triggers": self.triggers,
+            "inspections": self.inspections,
+            "coalesced": self.triggers - self.inspections,
+            "pending": len(self._pending),
+            "max_cooldown": max(
+                (cooldown.window for cooldown in self._cooldowns.values()),
+                default=0.0,
+            ),
+            "worst_slice": max(
+                (repair.worst_slice for repair in self._durations), default=0.0
+            ),
+            "last_cycle": self.last_cycle,
+        }
+
+    async def async_inspect_now(
+        self,
+        repairs: Iterable[AbstractSpookRepair],
+        *,
+        dry_run: bool = False,
+    ) -> dict[str, dict[str, Any]]:
+        """Inspect repairs right away, against a single snapshot.
+
+        Bypasses the cooldowns; pending inspections of the repairs are taken
+        care of by this inspection. On a dry-run, the issue registry is left
+        alone. Returns the findings and timings of each repair.
+        """
+        snapshot = async_get_registry_snapshot(self.hass)
+
+        async def _async_inspect_now(repair: AbstractSpookRepair) -> dict[str, Any]:
+            """Inspect a single repair, within the concurrency limit."""
+            async with self._semaphore:
+                result: dict[str, Any] = {}
+                start = time.perf_counter()
+                try:
+                    if dry_run:
+                        result["issues"] = await repair.async_run_dry_inspection(
+                            snapshot
+                        )
+                    else:
+                        self._pending.pop(repair, None)
+                        self._due.pop(repair, None)
+                        created, removed = await repair.async_run_inspection(
+                            snapshot, ("inspect",)
+                        )
+                        result["issues"] = repair.async_get_findings()
+                        result["issues_created"] = created
+                        result["issues_removed"] = removed
+                # pylint: disable-next=broad-exception-caught
+                except Exception as err:  # noqa: BLE001
+                    LOGGER.exception(
+                        "Spook failed inspecting %s.%s", repair.domain, repair.repair
+                    )
+                    result["error"] = str(err) or type(err).__name__
+                result["wall_time"] = round(time.perf_counter() - start, 6)
+                result["cpu_time"] = round(repair.cpu_time, 6)
+                return result
+
+        repairs = sorted(
+            repairs,
+            key=lambda repair: (
+                -repair.inspect_priority,
+                self._durations.get(repair, 0.0),
+            ),
+        )
+        results = await asyncio.gather(
+            *(_async_inspect_now(repair) for repair in repairs)
+        )
+        return {
+            repair.repair: result
+            for repair, result in zip(repairs, results, strict=True)
+        }
+
+    @callback
+    def _async_schedule_cycle(self) -> None:
+        """Schedule the next cycle, for the first repair that is due."""
+        if self._running or not self._due:
+            return
+        when = min(self._due.values())
+        if self._timer_at is not None and self._timer_at <= when:
+            return
+        self._async_cancel_timer()
+        self._timer_at = when
+        self._unsub_timer = async_call_at(self.hass, self._async_start_cycle, when)
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        """Cancel the timer of the next cycle."""
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._timer_at = None
+
+    @callback
+    def _async_start_cycle(self, _: datetime) -> None:
+        """Start a cycle, as a repair is due."""
+        self._unsub_timer = None
+        self._timer_at = None
+        self.hass.async_create_background_task(
+            self._async_run_cycle(), "spook_inspection_cycle"
+        )
+
+    async def _async_run_cycle(self) -> None:
+        """Run an inspection cycle, for all repairs that are due."""
+        if self.hass.is_stopping or self._running:
+            return
+
+        due = self.hass.loop.time() + INSPECTION_CYCLE_SLACK
+        pending = {
+            repair: self._pending.pop(repair, set())
+            for repair, repair_due in list(self._due.items())
+            if repair_due <= due
+        }
+        for repair in pending:
+            del self._due[repair]
+        if not pending:
+            self._async_schedule_cycle()
+            return
+
+        snapshot = async_get_registry_snapshot(self.hass)
+        repairs = sorted(
+            pending,
+            key=lambda repair: (
+                -repair.inspect_priority,
+                self._durations.get(repair, 0.0),
+            ),
+        )
+
+        start = time.perf_counter()
+        self._running = True
+        try:
+            await asyncio.gather(
+                *(
+                    self._async_inspect(repair, snapshot, pending[repair])
+                    for repair in repairs
+                )
+            )
+        finally:
+            self._running = False
+            self._async_schedule_cycle()
+
+        triggers = set().union(*pending.values())
+        self.cycles += 1
+        self.inspections += len(repairs)
+        self.last_cycle = {
+            "repairs": len(repairs),
+            "triggers": sorted(triggers),
+            "duration": round(time.perf_counter() - start, 3),
+        }
+        LOGGER.debug(
+            "Spook ran inspection cycle %s: %s repairs, for %s, in %.3fs",
+            self.cycles,
+            len(repairs),
+            ", ".join(self.last_cycle["triggers"]),
+            self.last_cycle["duration"],
+        )
+
+    async def _async_inspect(
+        self,
+        repair: AbstractSpookRepair,
+        snapshot: RegistrySnapshot,
+        triggers: Iterable[str],
+    ) -> None:
+        """Inspect a single repair, within the concurrency limit."""
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                await repair.async_run_inspection(snapshot, triggers)
+            # pylint: disable-next=broad-exception-caught
+            except Exception:  # noqa: BLE001
+                LOGGER.exception(
+                    "Spook failed inspecting %s.%s", repair.domain, repair.repair
+                )
+            # Don't track repairs that got deactivated during the inspection
+            if repair not in self._limits:
+                return
+            self._durations[repair] = time.perf_counter() - start
+            if (cooldown := self._cooldowns.get(repair)) is not None:
+                cooldown.last_inspected = self.hass.loop.time()
+
+
+class SpookStartupPlanner:
+    """Plan the first inspections of the Spook repairs after startup.
+
+    Instead of all repairs inspecting at once, right when all other
+    integrations do their own work after startup, the first inspections are
+    ordered by their estimated cost and spread over the startup window;
+    the more a repair costs, the later in the window it goes. Expensive
+    repairs wait until Home Assistant has been idle for a while.
+
+    Repairs activated after the plan was made (for example, because their
+    domain got loaded later on), inspect right away.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        scheduler: SpookInspectionScheduler,
+        *,
+        window: float = STARTUP_WINDOW,
+        idle_period: float = STARTUP_IDLE_PERIOD,
+        max_idle_wait: float = STARTUP_IDLE_MAX_WAIT,
+    ) -> None:
+        """Initialize the startup planner."""
+        self.hass = hass
+        self.scheduler = scheduler
+        self.window = window
+        self.idle_period = idle_period
+        self.max_idle_wait = max_idle_wait
+        self.started: float | None = None
+        self._collecting: list[AbstractSpookRepair] | None = None
+        self._planned: dict[AbstractSpookRepair, float | None] = {}
+        self._unsubs: list[Callable[[], None]] = []
+        self._idle_task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_begin(self) -> None:
+        """Begin collecting the repairs to plan the first inspections for."""
+        self.started = time.monotonic()
+        self._collecting = []
+
+    @callback
+    def async_request_first_inspection(self, repair: AbstractSpookRepair) -> None:
+        """Request the first inspection of a repair, once activated."""
+        if self._collecting is None:
+            repair.async_request_inspection("activate")
+            return
+        self._collecting.append(repair)
+
+    @callback
+    def async_plan(self) -> None:
+        """Plan the first inspections of all collected repairs."""
+        repairs, self._collecting = self._collecting or [], None
+
+        expensive = [
+            repair
+            for repair in repairs
+            if repair.inspect_startup_cost >= STARTUP_COST_EXPENSIVE
+        ]
+        spread = sorted(
+            (repair for repair in repairs if repair not in expensive),
+            key=lambda repair: (
+                repair.inspect_startup_cost,
+                -repair.inspect_priority,
+                repair.repair,
+            ),
+        )
+
+        total_cost = sum(repair.inspect_startup_cost for repair in spread)
+        cost = 0
+        for repair in spread:
+            delay = self.window * cost / total_cost
+            cost += repair.inspect_startup_cost
+            self._planned[repair] = delay
+            if not delay:
+                repair.async_request_inspection("startup")
+                continue
+            self._unsubs.append(
+                async_call_later(
+                    self.hass,
+                    delay,
+                    partial(self._async_request_inspection, repair, "startup"),
+                )
+            )
+
+        if expensive:
+            self._planned.update(dict.fromkeys(expensive))
+            self._idle_task = self.hass.async_create_background_task(
+                self._async_inspect_when_idle(expensive),
+                "spook_startup_inspect_when_idle",
+            )
+
+        LOGGER.debug(
+            "Spook planned first inspections: %s spread over %ss, "
+            "%s waiting for Home Assistant to be idle",
+            len(spread),
+            self.window,
+            len(expensive),
+        )
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Shut down the startup planner."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        if self._idle_task is not None:
+            self._idle_task.cancel()
+            self._idle_task = None
+
+    @callback
+    def async_get_stats(self) -> dict[str, Any]:
+        """Return the plan, and the time to the first result of each repair."""
+        return {
+            "window": self.window,
+            "repairs": {
+                f"{repair.domain}.{repair.repair}": {
+                    "planned_delay": ("idle" if delay is None else round(delay, 3)),
+                    "first_result": (
+                        round(first_inspected - self.started, 3)
+                        if self.started is not None
+                        and (first_inspected := repair.telemetry.first_inspected)
+                        else None
+                    ),
+                }
+                for repair, delay in sorted(
+                    self._planned.items(),
+                    key=lambda item: (item[0].domain, item[0].repair),
+                )
+            },
+        }
+
+    @callback
+    def _async_request_inspection(
+        self,
+        repair: AbstractSpookRepair,
+        trigger: str,
+        _now: datetime | None = None,
+    ) -> None:
+        """Request the first inspection of a repair."""
+        repair.async_request_inspection(trigger)
+
+    async def _async_inspect_when_idle(
+        self, repairs: list[AbstractSpookRepair]
+    ) -> None:
+        """Request the first inspection of repairs, once Home Assistant is idle.
+
+        Home Assistant is idle once the event loop has been quiet, and no
+        inspections have been pending or running, for the idle period.
+        """
+        loop = self.hass.loop
+        deadline = loop.time() + self.max_idle_wait
+        quiet_since = loop.time()
+        while (now := loop.time()) < deadline and now - quiet_since < self.idle_period:
+            await asyncio.sleep(STARTUP_IDLE_PROBE_INTERVAL)
+            lag = loop.time() - now - STARTUP_IDLE_PROBE_INTERVAL
+            if lag > STARTUP_IDLE_MAX_LAG or not self.scheduler.is_idle:
+                quiet_since = loop.time()
+
+        self._idle_task = None
+        for repair in repairs:
+            self._async_request_inspection(repair, "startup_idle")
+
+
+class SpookReloadNotifier:
+    """Notify Spook repairs of domains that completed reloading.
+
+    Instead of every repair watching all service calls for reloads, the
+    notifier hooks the events fired once a domain completed reloading, and
+    the reloads of config entries. Each is hooked only once, and only for
+    the domains repairs are interested in; the reload is then dispatched to
+    the repairs interested in that domain.
+
+    Repairs interested in any domain, are notified of all reload events
+    hooked, but not of config entry reloads. Domains that fire no event once
+    reloaded, are notified when their reload action is called.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the reload notifier."""
+        self.hass = hass
+        self._repairs: dict[str | None, set[AbstractSpookRepair]] = {}
+        self._unsubs: dict[str, Callable[[], None]] = {}
+        self._service_domains: set[str] = set()
+
+    @callback
+    def async_register(
+        self,
+        repair: AbstractSpookRepair,
+        domain: str | None,
+    ) -> Callable[[], None]:
+        """Register a repair for reloads of a domain, or of any domain (None).
+
+        Returns a callable to unregister the repair.
+        """
+        self._repairs.setdefault(domain, set()).add(repair)
+
+        if SIGNAL_CONFIG_ENTRY_CHANGED not in self._unsubs:
+            self._unsubs[SIGNAL_CONFIG_ENTRY_CHANGED] = async_dispatcher_connect(
+                self.hass,
+                SIGNAL_CONFIG_ENTRY_CHANGED,
+                self._async_config_entry_changed,
+            )
+        for reload_domain in RELOAD_EVENTS if domain is None else (domain,):
+            self._async_hook(reload_domain)
+
+        @callback
+        def _async_unregister() -> None:
+            """Unregister the repair."""
+            self._repairs.get(domain, set()).discard(repair)
+
+        return _async_unregister
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Shut down the reload notifier."""
+        for unsub in self._unsubs.values():
+            unsub()
+        self._unsubs.clear()
+        self._repairs.clear()
+        self._service_domains.clear()
+
+    @callback
+    def _async_hook(self, domain: str) -> None:
+        """Listen for the event fired once a domain completed reloading."""
+        if domain in RELOAD_SERVICE_DOMAINS:
+            self._async_hook_service(domain)
+            return
+
+        event_type = RELOAD_EVENTS.get(domain, f"event_{domain}_reloaded")
+        if event_type in self._unsubs:
+            return
+
+        @callback
+        def _async_reloaded(_: Event) -> None:
+            """Handle a domain that completed reloading."""
+            self._async_dispatch(domain, event_type, include_any=True)
+
+        self._unsubs[event_type] = self.hass.bus.async_listen(
+            event_type, _async_reloaded
+        )
+
+    @callback
+    def _async_hook_service(self, domain: str) -> None:
+        """Listen for calls of the reload action of a domain."""
+        self._service_domains.add(domain)
+        if EVENT_CALL_SERVICE in self._unsubs:
+            return
+
+        @callback
+        def _filter_call_service(event_data: Mapping[str, Any]) -> bool:
+            """Filter for reload actions of the hooked domains."""
+            if (service := event_data.get("service")) == SERVICE_RELOAD_ALL:
+                return event_data.get("domain") == HOMEASSISTANT_DOMAIN
+            return (
+                service == SERVICE_RELOAD
+                and event_data.get("domain") in self._service_domains
+            )
+
+        @callback
+        def _async_call_service(event: Event) -> None:
+            """Handle a reload action of a hooked domain."""
+            if event.data["service"] == SERVICE_RELOAD_ALL:
+                domains: Iterable[str] = list(self._service_domains)
+            else:
+                domains = (event.data["domain"],)
+            for reload_domain in domains:
+                self._async_dispatch(
+                    reload_domain, EVENT_CALL_SERVICE, include_any=False
+                )
+
+        self._unsubs[EVENT_CALL_SERVICE] = self.hass.bus.async_listen(
+            EVENT_CALL_SERVICE,
+            _async_call_service,
+            event_filter=_filter_call_service,
+        )
+
+    @callback
+    def _async_config_entry_changed(
+        self,
+        change: ConfigEntryChange,
+        entry: ConfigEntry,
+    ) -> None:
+        """Handle a config entry that completed (re)loading."""
+        if (
+            change is not ConfigEntryChange.UPDATED
+            or entry.state is not ConfigEntryState.LOADED
+        ):
+            return
+        self._async_dispatch(entry.domain, "config_entry_reloaded", include_any=False)
+
+    @callback
+    def _async_dispatch(self, domain: str, trigger: str, *, include_any: bool) -> None:
+        """Request an inspection from the repairs interested in a domain."""
+        repairs = self._repairs.get(domain, set())
+        if include_any:
+            repairs = repairs | self._repairs.get(None, set())
+        for repair in repairs:
+            repair.async_request_inspection(trigger)
+
+
 @dataclass
 class SpookRepairManager:
     """Class to manage Spook repairs."""
@@ -261,33 +1710,109 @@ class SpookRepairManager:
     hass: HomeAssistant
 
     _repairs: set[AbstractSpookRepair] = field(default_factory=set)
+    # Options of the config entry: the preset, disabled repairs, the
+    # settings of individual repairs, the startup settings and the
+    # reference analysis workers
+    options: Mapping[str, Any] = field(default_factory=dict)
+
+    _modules: dict[str, ModuleType] = field(default_factory=dict)
+    _pending_domains: dict[str, list[str]] = field(default_factory=dict)
+    _unsub_analysis_pool: Callable[[], None] | None = None
+    _unsub_references_cache: Callable[[], None] | None = None
+    _unsub_component_loaded: Callable[[], None] | None = None
+    _is_set_up: bool = False
 
     def __post_init__(self) -> None:
         """Post initialization."""
         self.issue_registry = ir.async_get(self.hass)
+        self.scheduler = SpookInspectionScheduler(self.hass)
+        self.reload_notifier = SpookReloadNotifier(self.hass)
+        self.startup_planner = SpookStartupPlanner(self.hass, self.scheduler)
+        self._async_configure_startup()
         LOGGER.debug("Spook repair manager initialized")
 
     async def async_setup(self) -> None:
-        """Set up the Spook repairs."""
+        """Set up the Spook repairs.
+
+        Repairs are only imported and activated for the domains (ectoplasms)
+        that are loaded. Repairs for domains that are not loaded yet, are
+        set up once their domain gets loaded.
+        """
         LOGGER.debug("Setting up Spook repairs")
 
-        modules: list[ModuleType] = []
+        self._unsub_references_cache = await async_setup_persistent_references_cache(
+            self.hass
+        )
 
-        def _load_all_repair_modules() -> None:
-            """Load all repair modules."""
-            for module_file in Path(__file__).parent.rglob("ectoplasms/*/repairs/*.py"):
-                if module_file.name == "__init__.py":
-                    continue
-                module_path = str(module_file.relative_to(Path(__file__).parent))[
-                    :-3
-                ].replace("/", ".")
-                modules.append(importlib.import_module(f".{module_path}", __package__))
+        self._is_set_up = True
+        self._async_setup_analysis_pool()
+
+        self._pending_domains = {
+            domain: list(module_paths)
+            for domain, module_paths in get_ectoplasm_index().repairs.items()
+        }
+
+        @callback
+        def _filter_component_loaded(event_data: Mapping[str, Any]) -> bool:
+            """Filter for domains with repairs pending activation."""
+            return event_data["component"] in self._pending_domains
+
+        @callback
+        def _async_component_loaded(event: Event) -> None:
+            """Set up the repairs of a domain that got loaded."""
+            domain = event.data["component"]
+            module_paths = self._pending_domains.pop(domain, None)
+            if module_paths is None:
+                return
+            self.hass.async_create_task(
+                self._async_setup_modules(module_paths),
+                f"spook_repairs_{domain}",
+            )
 
-        await self.hass.async_add_import_executor_job(_load_all_repair_modules)
+        self._unsub_component_loaded = self.hass.bus.async_listen(
+            EVENT_COMPONENT_LOADED,
+            _async_component_loaded,
+            event_filter=_filter_component_loaded,
+        )
+
+        loaded = self.hass.config.components
+        self.startup_planner.async_begin()
+        await self._async_setup_modules(
+            [
+                module_path
+                for domain in list(self._pending_domains)
+                if domain in loaded
+                for module_path in self._pending_domains.pop(domain)
+            ]
+        )
+        self.startup_planner.async_plan()
+        LOGGER.debug(
+            "Spook repairs waiting for domains to load: %s",
+            ", ".join(sorted(self._pending_domains)),
+        )
+
+    async def _async_setup_modules(self, module_paths: list[str]) -> None:
+        """Import repair modules and activate their repairs."""
+        if not module_paths:
+            return
+
+        def _load_repair_modules() -> list[ModuleType]:
+            """Load repair modules."""
+            return [
+                importlib.import_module(f".{module_path}", __package__)
+                for module_path in module_paths
+            ]
+
+        modules = await self.hass.async_add_import_executor_job(_load_repair_modules)
+        disabled = self.async_get_disabled_repairs()
+        for module in modules:
+            self._modules[module.SpookRepair.repair] = module
         await asyncio.gather(
             *(
                 create_eager_task(self.async_activate(module.SpookRepair(self.hass)))
                 for module in modules
+                # Disabled repairs aren't activated, so they don't listen at all
+                if module.SpookRepair.repair not in disabled
             )
         )
 
@@ -298,26 +1823,233 @@ class SpookRepairManager:
             repair.domain,
             repair.repair,
         )
+        repair.inspect_scheduler = self.scheduler
+        repair.reload_notifier = self.reload_notifier
+        repair.startup_planner = self.startup_planner
+        self._async_configure(repair)
         await repair.async_activate()
         self._repairs.add(repair)
 
+    async def async_deactivate(self, repair: AbstractSpookRepair) -> None:
+        """Unregister a Spook repair, and remove the issues it created."""
+        LOGGER.debug(
+            "Unregistering Spook repair: %s.%s",
+            repair.domain,
+            repair.repair,
+        )
+        self._repairs.discard(repair)
+        await repair.async_deactivate()
+
+        # Remove issues created by this Spook repair
+        for domain, issue_id in list(self.issue_registry.issues):
+            if domain == DOMAIN and issue_id.startswith(
+                f"{repair.domain}_{repair.repair}",
+            ):
+                self.issue_registry.async_delete(domain, issue_id)
+
+    @callback
+    def async_get_disabled_repairs(self) -> set[str]:
+        """Return the names of the repairs that are disabled."""
+        return set(self.options.get(CONF_DISABLED_REPAIRS, ()))
+
+    @callback
+    def async_get_repair_settings(self, repair: str) -> dict[str, float]:
+        """Return the inspection settings of a repair.
+
+        Those are the settings of the preset, overridden by the settings
+        of the repair itself.
+        """
+        return {
+            **PRESETS.get(self.options.get(CONF_PRESET), PRESETS[PRESET_BALANCED]),
+            **self.options.get(CONF_REPAIRS, {}).get(repair, {}),
+        }
+
+    @callback
+    def async_get_startup_settings(self) -> dict[str, float]:
+        """Return the startup settings.
+
+        Those are the settings of the preset, overridden by the options.
+        """
+        preset = PRESETS.get(self.options.get(CONF_PRESET), PRESETS[PRESET_BALANCED])
+        return {
+            key: self.options.get(key, preset[key])
+            for key in (CONF_STARTUP_WINDOW, CONF_STARTUP_IDLE_PERIOD)
+        }
+
+    @callback
+    def _async_configure_startup(self) -> None:
+        """Apply the startup settings to the startup planner."""
+        settings = self.async_get_startup_settings()
+        self.startup_planner.window = settings[CONF_STARTUP_WINDOW]
+        self.startup_planner.idle_period = settings[CONF_STARTUP_IDLE_PERIOD]
+
+    @callback
+    def _async_configure(self, repair: AbstractSpookRepair) -> None:
+        """Apply the inspection settings to a repair."""
+        settings = self.async_get_repair_settings(repair.repair)
+        repair.inspect_slice_budget = settings[CONF_SLICE_LENGTH] / 1000
+        repair.inspect_runtime_budget = settings[CONF_MAX_RUNTIME] / 1000
+        self.scheduler.async_configure(
+            repair,
+            min_cooldown=settings[CONF_MIN_INTERVAL],
+            max_cooldown=settings[CONF_MAX_INTERVAL],
+        )
+        limit = int(
+            self.options.get(CONF_PLACEHOLDER_LIST_LIMIT, PLACEHOLDER_LIST_LIMIT)
+        )
+        if repair.placeholder_list_limit != limit:
+            repair.placeholder_list_limit = limit
+            # Render the placeholder lists of the issues found again
+            if repair in self._repairs:
+                repair.async_request_inspection(INSPECTION_OPTIONS)
+
+    @callback
+    def _async_setup_analysis_pool(self) -> None:
+        """Start, restart or stop the reference analysis worker processes.
+
+        The number of worker processes to analyze references in, 0 to analyze
+        them in the event loop. Only pays off on installations with lots of
+        automations and scripts, on hosts with spare cores.
+        """
+        workers = int(self.options.get(CONF_REFERENCE_ANALYSIS_WORKERS, 0))
+        pool = async_get_reference_analysis_pool()
+        if self._unsub_analysis_pool and pool and pool.max_workers == workers:
+            return
+        if self._unsub_analysis_pool:
+            self._unsub_analysis_pool()
+            self._unsub_analysis_pool = None
+        if workers:
+            self._unsub_analysis_pool = async_setup_reference_analysis_pool(
+                self.hass, workers
+            )
+
+    async def async_update_options(self, options: Mapping[str, Any]) -> None:
+        """Apply changed options, without restarting.
+
+        Repairs that got disabled are deactivated, and repairs that got
+        enabled are activated. All other repairs get their new settings.
+        """
+        self.options = options
+        self._async_configure_startup()
+        if self._is_set_up:
+            self._async_setup_analysis_pool()
+
+        disabled = self.async_get_disabled_repairs()
+        active = set()
+        for repair in list(self._repairs):
+            if repair.repair in disabled:
+                await self.async_deactivate(repair)
+                continue
+            active.add(repair.repair)
+            self._async_configure(repair)
+
+        await asyncio.gather(
+            *(
+                create_eager_task(self.async_activate(module.SpookRepair(self.hass)))
+                for repair, module in self._modules.items()
+                if repair not in disabled and repair not in active
+            )
+        )
+
+    @callback
+    def async_get_telemetry(self) -> dict[str, dict[str, Any]]:
+        """Return the inspection telemetry of all Spook repairs."""
+        return {
+            f"{repair.domain}.{repair.repair}": {
+                **repair.telemetry.as_dict(),
+                "slices": repair.slices,
+                "worst_slice": round(repair.worst_slice, 4),
+                "cooldown": self.scheduler.async_get_cooldown(repair),
+            }
+            for repair in sorted(
+                self._repairs,
+                key=lambda repair: (repair.domain, repair.repair),
+            )
+            if isinstance(repair, AbstractSpookRepair)
+        }
+
+    async def async_inspect(
+        self,
+        repairs: Iterable[str] | None = None,
+        *,
+        dry_run: bool = False,
+    ) -> dict[str, dict[str, Any]]:
+        """Inspect the given repairs (or all) right away.
+
+        Repairs are given by name, for example, "automation_unknown_entity_references".
+        Raises a ServiceValidationError for unknown repairs.
+        """
+        by_name = {
+            repair.repair: repair
+            for repair in self._repairs
+            if isinstance(repair, AbstractSpookRepair)
+        }
+        if repairs is None:
+            selected = list(by_name.values())
+        elif unknown := sorted(set(repairs) - by_name.keys()):
+            msg = f"Unknown or inactive Spook repairs: {', '.join(unknown)}"
+            raise ServiceValidationError(msg)
+        else:
+            selected = [by_name[repair] for repair in dict.fromkeys(repairs)]
+        return await self.scheduler.async_inspect_now(selected, dry_run=dry_run)
+
+    @callback
+    def async_get_issue_lists(
+        self,
+        issue_id: str | None = None,
+    ) -> dict[str, dict[str, list[str]]]:
+        """Return the full placeholder lists of issues, by issue ID.
+
+        Returns the lists of all issues, or of the given issue only.
+        """
+        issue_lists: dict[str, dict[str, list[str]]] = {}
+        for repair in self._repairs:
+            for repair_issue_id, lists in repair.issue_lists.items():
+                registry_issue_id = f"{repair.repair}_{repair_issue_id}"
+                if issue_id is None or registry_issue_id == issue_id:
+                    issue_lists[registry_issue_id] = lists
+        return issue_lists
+
+    @callback
+    def async_get_telemetry_totals(self) -> dict[str, float]:
+        """Return the inspection telemetry, totalled over all Spook repairs."""
+        repairs = [
+            repair
+            for repair in self._repairs
+            if isinstance(repair, AbstractSpookRepair)
+        ]
+        return {
+            "inspections": sum(repair.telemetry.wall_time.count for repair in repairs),
+            "slowest_inspection": max(
+                (repair.telemetry.wall_time.max for repair in repairs), default=0
+            ),
+            "issues_created": sum(
+                repair.telemetry.issues_created for repair in repairs
+            ),
+            "issues_removed": sum(
+                repair.telemetry.issues_removed for repair in repairs
+            ),
+        }
+
     async def async_on_unload(self) -> None:
         """Tear down the Spook reapris."""
         LOGGER.debug("Tearing down Spook repairs")
-        for repair in self._repairs:
-            LOGGER.debug(
-                "Unregistering Spook repair: %s.%s",
-                repair.domain,
-                repair.repair,
-            )
-            await repair.async_deactivate()
-
-            # Remove issues created by this Spook repair
-            for domain, issue_id in self.issue_registry.issues:
-                if domain == DOMAIN and issue_id.startswith(
-                    f"{repair.domain}_{repair.repair}",
-                ):
-                    self.issue_registry.async_delete(domain, issue_id)
+        if self._unsub_component_loaded:
+            self._unsub_component_loaded()
+            self._unsub_component_loaded = None
+        self._pending_domains.clear()
+        if self._unsub_analysis_pool:
+            self._unsub_analysis_pool()
+            self._unsub_analysis_pool = None
+        if self._unsub_references_cache:
+            self._unsub_references_cache()
+            self._unsub_references_cache = None
+        self.startup_planner.async_shutdown()
+        self.scheduler.async_shutdown()
+        self.reload_notifier.async_shutdown()
+        for repair in list(self._repairs):
+            await self.async_deactivate(repair)
+        self._modules.clear()
 
 
 class RestartRequiredFixFlow(RepairsFlow):
@@ -5,7 +5,6 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 import importlib
-from pathlib import Path
 from typing import TYPE_CHECKING, Any, Generic, TypeVar, cast, final
 
 import voluptuous as vol
@@ -30,6 +29,7 @@ from homeassistant.helpers.service import (
 from homeassistant.loader import async_get_integration
 
 from .const import DOMAIN, LOGGER
+from .util import get_ectoplasm_index
 
 if TYPE_CHECKING:
     from types import ModuleType
@@ -274,15 +274,10 @@ class SpookServiceManager:
 
         def _load_all_service_modules() -> None:
             """Load all service modules."""
-            for module_file in Path(__file__).parent.rglob(
-                "ectoplasms/*/services/*.py"
-            ):
-                if module_file.name == "__init__.py":
-                    continue
-                module_path = str(module_file.relative_to(Path(__file__).parent))[
-                    :-3
-                ].replace("/", ".")
-                modules.append(importlib.import_module(f".{module_path}", __package__))
+            modules.extend(
+                importlib.import_module(f".{module_path}", __package__)
+                for module_path in get_ectoplasm_index().services
+            )
 
         await self.hass.async_add_import_executor_job(_load_all_service_modules)
 
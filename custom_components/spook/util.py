@@ -3,11 +3,17 @@
 from __future__ import annotations
 
 import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
 import importlib
 from pathlib import Path
 import re
+import time
 from typing import TYPE_CHECKING, Any
 
+from jinja2 import Environment, TemplateSyntaxError, nodes
+
 from homeassistant.const import (
     CONF_CHOOSE,
     CONF_DEFAULT,
@@ -20,15 +26,16 @@ from homeassistant.const import (
     CONF_THEN,
     ENTITY_MATCH_ALL,
     ENTITY_MATCH_NONE,
-    EVENT_COMPONENT_LOADED,
     EVENT_HOMEASSISTANT_START,
+    EVENT_SERVICE_REGISTERED,
+    EVENT_SERVICE_REMOVED,
+    EVENT_STATE_CHANGED,
     Platform,
 )
 from homeassistant.core import (
     callback,
     valid_entity_id,
 )
-from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import (
     area_registry as ar,
     config_validation as cv,
@@ -37,16 +44,29 @@ from homeassistant.helpers import (
     floor_registry as fr,
     label_registry as lr,
 )
-from homeassistant.helpers.template import Template
 
-from .const import DOMAIN, LOGGER
+from . import ectoplasm_index
+from .const import DOMAIN, LOGGER, PLATFORMS
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable, Sequence
+    from collections.abc import (
+        Callable,
+        Iterable,
+        Iterator,
+        Mapping,
+        Sequence,
+        Set as AbstractSet,
+    )
     from types import ModuleType
 
     from homeassistant.config_entries import ConfigEntry
-    from homeassistant.core import HomeAssistant
+    from homeassistant.core import (
+        Event,
+        EventServiceRegisteredData,
+        EventServiceRemovedData,
+        EventStateChangedData,
+        HomeAssistant,
+    )
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 
@@ -83,15 +103,13 @@ ADDITIONAL_DOMAINS = [
 
 # Build a list of all known domains
 KNOWN_DOMAINS = [platform.value for platform in Platform] + ADDITIONAL_DOMAINS
+_KNOWN_DOMAINS = frozenset(KNOWN_DOMAINS)
 
 # Home Assistant core entity ID validation patterns (from homeassistant/core.py)
 _OBJECT_ID = r"(?!_)[\da-z_]+(?<!_)"
-# Modified _DOMAIN pattern to only match known domains
-_DOMAIN = r"(?:" + "|".join(KNOWN_DOMAINS) + r")"
-_ENTITY_ID_PATTERN = _DOMAIN + r"\." + _OBJECT_ID
 
-# Template function names that accept entity IDs as first parameter
-_ENTITY_FUNCTIONS = [
+# Template function, filter and test names that accept entity IDs as parameter
+_ENTITY_FUNCTIONS = {
     "states",
     "is_state",
     "state_attr",
@@ -111,37 +129,216 @@ _ENTITY_FUNCTIONS = [
     "expand",
     "distance",
     "closest",
-]
+}
 
-# Build regex patterns using Home Assistant's core validation patterns
-ENTITY_ID_TEMPLATE_PATTERNS = [
-    # Template functions with entity ID as first parameter
-    rf"(?:{'|'.join(_ENTITY_FUNCTIONS)})\s*\(\s*['\"]({_ENTITY_ID_PATTERN})['\"]",
+# Template functions that take entity IDs as any of their arguments; all
+# other entity functions only take the entity ID as their first argument.
+_ENTITY_FUNCTIONS_ALL_ARGUMENTS = {
+    "closest",
+    "distance",
+    "expand",
+}
+
+# Single pass scanner for entity IDs in templates, built using Home Assistant's
+# core validation patterns. Entity IDs passed to template functions or filters
+# are always quoted, so these are covered by the quoted entity ID alternative.
+# The domain is matched generically and checked against a set of known
+# domains afterwards, which is a lot cheaper than a huge regex alternation.
+_ENTITY_ID_TEMPLATE_SCANNER = re.compile(
     # Direct entity state access patterns (states.domain.entity)
-    rf"states\.({_DOMAIN})\.({_OBJECT_ID})(?:\.state|\.attributes)",
+    rf"states\.(?P<states_domain>[\da-z_]+)\.(?P<states_object_id>{_OBJECT_ID})"
+    r"(?=\.state|\.attributes)"
     # Entity IDs in any quoted context (captures all entity IDs in lists, etc.)
-    rf"['\"]({_ENTITY_ID_PATTERN})['\"]",
-    # Entity IDs followed by filter functions (entity_id | function)
-    rf"['\"]({_ENTITY_ID_PATTERN})['\"](?:\s*\|\s*(?:{'|'.join(_ENTITY_FUNCTIONS)}))",
-]
+    rf"|['\"](?P<domain>[\da-z_]+)\.(?P<object_id>{_OBJECT_ID})(?=['\"])"
+)
+
+_KNOWN_DOMAINS_CACHE: tuple[int, frozenset[str]] = (-1, _KNOWN_DOMAINS)
+
+# Jinja environment used to parse templates for static analysis only, using
+# the same extensions as Home Assistant's template environment.
+_TEMPLATE_ENVIRONMENT = Environment(  # noqa: S701 - Never used for rendering
+    extensions=["jinja2.ext.loopcontrols", "jinja2.ext.do"],
+)
+
+
+class _KnownIdsIndex:
+    """Incrementally maintained set of IDs, known to Home Assistant.
+
+    The set is populated lazily on first use. After that, the changes carried
+    by registry events are applied to it, and every change to the set bumps
+    the generation of the index.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        populate: Callable[[HomeAssistant], Iterable[str]],
+    ) -> None:
+        """Initialize the index."""
+        self.name = name
+        self.generation = 0
+        self._populate = populate
+        self._ids: set[str] | None = None
+        self._snapshot: frozenset[str] = frozenset()
+        self._snapshot_generation = -1
+
+    @callback
+    def async_clear(self) -> None:
+        """Clear the index, it will be populated again on next use."""
+        LOGGER.debug("Clearing Spook's %s ID index.", self.name)
+        self._ids = None
+        self.generation += 1
+
+    @callback
+    def async_add(self, id_: str) -> None:
+        """Add an ID to the index."""
+        if self._ids is None or id_ in self._ids:
+            return
+        self._ids.add(id_)
+        self.generation += 1
+
+    @callback
+    def async_discard(self, id_: str) -> None:
+        """Discard an ID from the index."""
+        if self._ids is None or id_ not in self._ids:
+            return
+        self._ids.discard(id_)
+        self.generation += 1
+
+    @callback
+    def async_get(self, hass: HomeAssistant) -> frozenset[str]:
+        """Return a read-only snapshot of all IDs in the index.
+
+        The snapshot is only rebuilt when the index changed since the
+        previous snapshot was taken.
+        """
+        if self._ids is None:
+            LOGGER.debug("Spook's %s ID index is empty, populating...", self.name)
+            self._ids = set(self._populate(hass))
+            LOGGER.debug(
+                "Spook's %s ID index populated with %s IDs",
+                self.name,
+                len(self._ids),
+            )
+
+        if self._snapshot_generation != self.generation:
+            self._snapshot = frozenset(self._ids)
+            self._snapshot_generation = self.generation
+
+        return self._snapshot
+
+
+def _populate_entity_ids(hass: HomeAssistant) -> set[str]:
+    """Return all entity IDs from the entity registry and the state machine."""
+    entity_registry = er.async_get(hass)
+    entity_ids_from_registry = {
+        entity.entity_id for entity in entity_registry.entities.values()
+    }
+    entity_ids_from_states = hass.states.async_entity_ids()
+
+    combined_entity_ids = entity_ids_from_registry.union(entity_ids_from_states)
+
+    # Filter out ignored domains
+    return {
+        entity_id
+        for entity_id in combined_entity_ids
+        if not entity_id.startswith(IGNORED_ENTITY_DOMAINS)
+    }
+
+
+def _populate_services(hass: HomeAssistant) -> set[str]:
+    """Return all services, known to Home Assistant."""
+    return {
+        f"{domain}.{service}"
+        for domain, services in hass.services.async_services().items()
+        for service in services
+    }
+
+
+_ENTITY_IDS = _KnownIdsIndex("entity", _populate_entity_ids)
+_AREA_IDS = _KnownIdsIndex("area", lambda hass: ar.async_get(hass).areas)
+_DEVICE_IDS = _KnownIdsIndex("device", lambda hass: dr.async_get(hass).devices)
+_FLOOR_IDS = _KnownIdsIndex("floor", lambda hass: fr.async_get(hass).floors)
+_LABEL_IDS = _KnownIdsIndex("label", lambda hass: lr.async_get(hass).labels)
+_SERVICES = _KnownIdsIndex("service", _populate_services)
+
+_KNOWN_IDS_INDEXES = (
+    _ENTITY_IDS,
+    _AREA_IDS,
+    _DEVICE_IDS,
+    _FLOOR_IDS,
+    _LABEL_IDS,
+    _SERVICES,
+)
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """Read-only snapshot of all IDs, known to Home Assistant.
 
-_CACHED_ALL_ENTITY_IDS: set[str] | None = None
+    Holds the known entity, area, device, floor, label IDs and services,
+    together with the generation of each of them at the time the snapshot
+    was taken.
+    """
+
+    entity_ids: frozenset[str]
+    area_ids: frozenset[str]
+    device_ids: frozenset[str]
+    floor_ids: frozenset[str]
+    label_ids: frozenset[str]
+    services: frozenset[str]
+    generations: Mapping[str, int]
+
+    @cached_property
+    def entity_ids_with_all_none(self) -> frozenset[str]:
+        """Return all entity IDs, including the special ALL and NONE IDs."""
+        return self.entity_ids | {ENTITY_MATCH_ALL, ENTITY_MATCH_NONE}
+
+    @callback
+    def async_changed_since(self, other: RegistrySnapshot | None) -> set[str]:
+        """Return the names of the ID sets that changed since another snapshot."""
+        if other is None:
+            return set(self.generations)
+        return {
+            name
+            for name, generation in self.generations.items()
+            if other.generations.get(name) != generation
+        }
+
+
+_REGISTRY_SNAPSHOT: RegistrySnapshot | None = None
 _UNSUB_CACHE_INVALIDATION: Callable[[], None] | None = None
 
 
 @callback
-def _clear_all_entity_ids_cache(*_args: Any) -> None:
-    """Clear the cached set of all entity IDs."""
-    # pylint: disable-next=global-statement
-    global _CACHED_ALL_ENTITY_IDS  # noqa: PLW0603
-    LOGGER.debug("Clearing all_entity_ids cache.")
-    _CACHED_ALL_ENTITY_IDS = None
+def _clear_known_ids_indexes(*_args: Any) -> None:
+    """Clear all known IDs indexes."""
+    for index in _KNOWN_IDS_INDEXES:
+        index.async_clear()
 
 
-def async_setup_all_entity_ids_cache_invalidation(
+@callback
+def _filter_state_added_or_removed(event_data: Mapping[str, Any]) -> bool:
+    """Filter state changed events for states being added or removed."""
+    return event_data["old_state"] is None or event_data["new_state"] is None
+
+
+@callback
+def _async_add_entity_id(entity_id: str) -> None:
+    """Add an entity ID to the entity ID index, unless it is ignored."""
+    if not entity_id.startswith(IGNORED_ENTITY_DOMAINS):
+        _ENTITY_IDS.async_add(entity_id)
+
+
+def async_setup_registry_snapshot(  # noqa: C901
     hass: HomeAssistant,
 ) -> Callable[[], None]:
-    """Set up event listeners to invalidate the all_entity_ids cache.
+    """Set up event listeners to keep the known IDs indexes up to date.
+
+    Instead of throwing away the indexes on every change, the delta carried by
+    each registry, state changed and service event is applied to them.
+    An entity ID is known as long as it is in the entity registry or in the
+    state machine, so it is only removed once it is gone from both.
 
     Returns a callable to unsubscribe the listeners.
     """
@@ -150,78 +347,336 @@ def async_setup_all_entity_ids_cache_invalidation(
 
     if _UNSUB_CACHE_INVALIDATION is not None:
         LOGGER.debug(
-            "Spook's entity ID cache invalidation already set up. Skipping.",
+            "Spook's known IDs indexes already set up. Skipping.",
         )
         return _UNSUB_CACHE_INVALIDATION
 
-    LOGGER.debug("Setting up Spook's all_entity_ids cache invalidation listeners.")
-
-    # Listen for entity registry updates
-    unsub_registry_update = hass.bus.async_listen(
-        er.EVENT_ENTITY_REGISTRY_UPDATED, _clear_all_entity_ids_cache
-    )
-    # Listen for Home Assistant start to ensure cache is clear then
-    unsub_hass_start = hass.bus.async_listen_once(
-        EVENT_HOMEASSISTANT_START, _clear_all_entity_ids_cache
-    )
-    # Listen for components loading
-    unsub_component_loaded = hass.bus.async_listen(
-        EVENT_COMPONENT_LOADED, _clear_all_entity_ids_cache
-    )
+    LOGGER.debug("Setting up Spook's known IDs indexes listeners.")
+
+    entity_registry = er.async_get(hass)
+
+    @callback
+    def _async_entity_registry_updated(
+        event: Event[er.EventEntityRegistryUpdatedData],
+    ) -> None:
+        """Apply an entity registry update to the entity ID index."""
+        entity_id = event.data["entity_id"]
+        if event.data["action"] == "create":
+            _async_add_entity_id(entity_id)
+        elif event.data["action"] == "remove":
+            if hass.states.get(entity_id) is None:
+                _ENTITY_IDS.async_discard(entity_id)
+        elif old_entity_id := event.data.get("old_entity_id"):
+            if hass.states.get(old_entity_id) is None:
+                _ENTITY_IDS.async_discard(old_entity_id)
+            _async_add_entity_id(entity_id)
+
+    @callback
+    def _async_state_changed(event: Event[EventStateChangedData]) -> None:
+        """Apply a state being added or removed to the entity ID index."""
+        entity_id = event.data["entity_id"]
+        if event.data["new_state"] is not None:
+            _async_add_entity_id(entity_id)
+        elif not entity_registry.async_is_registered(entity_id):
+            _ENTITY_IDS.async_discard(entity_id)
+
+    def _registry_updated_listener(
+        index: _KnownIdsIndex, key: str
+    ) -> Callable[[Event[Any]], None]:
+        """Create a listener that applies registry updates to an index."""
+
+        @callback
+        def _async_registry_updated(event: Event[Any]) -> None:
+            """Apply a registry update to the index."""
+            if (id_ := event.data.get(key)) is None:
+                return
+            if event.data["action"] == "create":
+                index.async_add(id_)
+            elif event.data["action"] == "remove":
+                index.async_discard(id_)
+
+        return _async_registry_updated
+
+    @callback
+    def _async_service_registered(event: Event[EventServiceRegisteredData]) -> None:
+        """Add a newly registered service to the service index."""
+        _SERVICES.async_add(f"{event.data['domain']}.{event.data['service']}")
+
+    @callback
+    def _async_service_removed(event: Event[EventServiceRemovedData]) -> None:
+        """Remove a removed service from the service index."""
+        _SERVICES.async_discard(f"{event.data['domain']}.{event.data['service']}")
+
+    unsubs = [
+        # Listen for entity registry updates
+        hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, _async_entity_registry_updated
+        ),
+        # Listen for states being added to or removed from the state machine
+        hass.bus.async_listen(
+            EVENT_STATE_CHANGED,
+            _async_state_changed,
+            event_filter=_filter_state_added_or_removed,
+        ),
+        # Listen for the other registries
+        hass.bus.async_listen(
+            ar.EVENT_AREA_REGISTRY_UPDATED,
+            _registry_updated_listener(_AREA_IDS, "area_id"),
+        ),
+        hass.bus.async_listen(
+            dr.EVENT_DEVICE_REGISTRY_UPDATED,
+            _registry_updated_listener(_DEVICE_IDS, "device_id"),
+        ),
+        hass.bus.async_listen(
+            fr.EVENT_FLOOR_REGISTRY_UPDATED,
+            _registry_updated_listener(_FLOOR_IDS, "floor_id"),
+        ),
+        hass.bus.async_listen(
+            lr.EVENT_LABEL_REGISTRY_UPDATED,
+            _registry_updated_listener(_LABEL_IDS, "label_id"),
+        ),
+        # Listen for services being registered or removed
+        hass.bus.async_listen(EVENT_SERVICE_REGISTERED, _async_service_registered),
+        hass.bus.async_listen(EVENT_SERVICE_REMOVED, _async_service_removed),
+        # Listen for Home Assistant start to ensure the indexes are clear then
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, _clear_known_ids_indexes),
+    ]
 
     # Perform an initial clear, just in case.
-    _clear_all_entity_ids_cache()
+    _clear_known_ids_indexes()
 
     def _unsubscribe_listeners() -> None:
         # pylint: disable-next=global-statement
         global _UNSUB_CACHE_INVALIDATION  # noqa: PLW0603
         LOGGER.debug(
-            "Unsubscribing from Spook's all_entity_ids cache invalidation listeners.",
+            "Unsubscribing from Spook's known IDs indexes listeners.",
         )
-        unsub_registry_update()
-        unsub_hass_start()
-        unsub_component_loaded()
+        for unsub in unsubs:
+            unsub()
+        _clear_known_ids_indexes()
         _UNSUB_CACHE_INVALIDATION = None  # Mark as unsubscribed
 
     _UNSUB_CACHE_INVALIDATION = _unsubscribe_listeners
     return _unsubscribe_listeners
 
 
+@callback
+def async_get_registry_snapshot(hass: HomeAssistant) -> RegistrySnapshot:
+    """Return a read-only snapshot of all IDs, known to Home Assistant.
+
+    The snapshot is shared between all callers, and only rebuilt when any of
+    the known ID sets changed since the previous snapshot was taken.
+    """
+    # pylint: disable-next=global-statement
+    global _REGISTRY_SNAPSHOT  # noqa: PLW0603
+
+    # Make sure all indexes are populated before reading their generations.
+    id_sets = {index.name: index.async_get(hass) for index in _KNOWN_IDS_INDEXES}
+    generations = {index.name: index.generation for index in _KNOWN_IDS_INDEXES}
+
+    if _REGISTRY_SNAPSHOT is None or _REGISTRY_SNAPSHOT.generations != generations:
+        _REGISTRY_SNAPSHOT = RegistrySnapshot(
+            entity_ids=id_sets[_ENTITY_IDS.name],
+            area_ids=id_sets[_AREA_IDS.name],
+            device_ids=id_sets[_DEVICE_IDS.name],
+            floor_ids=id_sets[_FLOOR_IDS.name],
+            label_ids=id_sets[_LABEL_IDS.name],
+            services=id_sets[_SERVICES.name],
+            generations=generations,
+        )
+
+    return _REGISTRY_SNAPSHOT
+
+
 @callback
 def async_get_all_entity_ids(
     hass: HomeAssistant, *, include_all_none: bool = False
-) -> set[str]:
-    """Return all entity IDs, known to Home Assistant, using a cache."""
-    # pylint: disable-next=global-statement
-    global _CACHED_ALL_ENTITY_IDS  # noqa: PLW0603
+) -> frozenset[str]:
+    """Return all entity IDs, known to Home Assistant, using a cache.
 
-    if _CACHED_ALL_ENTITY_IDS is None:
-        LOGGER.debug(
-            "Spook's all_entity_ids cache is empty, populating...",
+    The returned set is shared between all callers and must not be modified.
+    """
+    snapshot = async_get_registry_snapshot(hass)
+    if include_all_none:
+        return snapshot.entity_ids_with_all_none
+    return snapshot.entity_ids
+
+
+@dataclass(frozen=True)
+class EctoplasmIndex:
+    """Index of all Spook ectoplasms and their modules.
+
+    Module paths are relative to the Spook package. Platforms and repairs
+    are grouped by the platform or domain they are for.
+    """
+
+    ectoplasms: tuple[str, ...]
+    platforms: Mapping[str, tuple[str, ...]]
+    services: tuple[str, ...]
+    repairs: Mapping[str, tuple[str, ...]]
+    integrations: tuple[str, ...]
+
+
+def scan_ectoplasm_index() -> EctoplasmIndex:
+    """Scan the Spook package for all ectoplasms and their modules.
+
+    Only lists the directories that can contain modules, instead of
+    recursively walking the whole package.
+    """
+    root = Path(__file__).parent
+    platforms = {str(platform) for platform in PLATFORMS}
+
+    def _modules(directory: Path) -> list[Path]:
+        """Return the modules in a directory, excluding the package itself."""
+        if not directory.is_dir():
+            return []
+        return sorted(
+            module_file
+            for module_file in directory.iterdir()
+            if module_file.suffix == ".py" and module_file.name != "__init__.py"
         )
-        entity_registry = er.async_get(hass)
-        entity_ids_from_registry = {
-            entity.entity_id for entity in entity_registry.entities.values()
-        }
-        entity_ids_from_states = hass.states.async_entity_ids()
 
-        combined_entity_ids = entity_ids_from_registry.union(entity_ids_from_states)
+    ectoplasms: list[str] = []
+    platform_modules: dict[str, list[str]] = {}
+    services: list[str] = []
+    repairs: dict[str, tuple[str, ...]] = {}
+    for ectoplasm in sorted((root / "ectoplasms").iterdir()):
+        if not (init := ectoplasm / "__init__.py").is_file():
+            continue
+        package = f"ectoplasms.{ectoplasm.name}"
+        if "def async_setup_entry(" in init.read_text(encoding="utf-8"):
+            ectoplasms.append(package)
+        for module_file in _modules(ectoplasm):
+            if module_file.stem in platforms:
+                platform_modules.setdefault(module_file.stem, []).append(
+                    f"{package}.{module_file.stem}"
+                )
+        services.extend(
+            f"{package}.services.{module_file.stem}"
+            for module_file in _modules(ectoplasm / "services")
+        )
+        if repair_modules := _modules(ectoplasm / "repairs"):
+            repairs[ectoplasm.name] = tuple(
+                f"{package}.repairs.{module_file.stem}"
+                for module_file in repair_modules
+            )
+
+    return EctoplasmIndex(
+        ectoplasms=tuple(ectoplasms),
+        platforms={
+            platform: tuple(modules)
+            for platform, modules in sorted(platform_modules.items())
+        },
+        services=tuple(services),
+        repairs=repairs,
+        integrations=tuple(
+            sorted(
+                manifest.parent.name
+                for manifest in (root / "integrations").glob("*/manifest.json")
+            )
+        ),
+    )
+
+
+def render_ectoplasm_index(index: EctoplasmIndex) -> str:
+    """Render an ectoplasm index as the source of the index module."""
+
+    def _tuple(items: Iterable[str], indent: str) -> str:
+        """Render a tuple of strings, one item per line."""
+        if not (lines := "".join(f'{indent}    "{item}",\n' for item in items)):
+            return "()"
+        return f"(\n{lines}{indent})"
+
+    def _mapping(items: Mapping[str, tuple[str, ...]]) -> str:
+        """Render a mapping of strings to tuples of strings."""
+        lines = "".join(
+            f'    "{key}": {_tuple(value, "    ")},\n' for key, value in items.items()
+        )
+        return f"{{\n{lines}}}"
+
+    return (
+        '"""Spook - Your homie.\n\n'
+        "Index of all Spook ectoplasms and their modules.\n\n"
+        "This file is generated by script/generate_ectoplasm_index.py, do not\n"
+        "edit it manually. Generate it again after adding or removing modules.\n"
+        '"""\n\n'
+        "from typing import Final\n\n"
+        f"ECTOPLASMS: Final = {_tuple(index.ectoplasms, '')}\n\n"
+        f"PLATFORMS: Final = {_mapping(index.platforms)}\n\n"
+        f"SERVICES: Final = {_tuple(index.services, '')}\n\n"
+        f"REPAIRS: Final = {_mapping(index.repairs)}\n\n"
+        f"INTEGRATIONS: Final = {_tuple(index.integrations, '')}\n"
+    )
 
-        # Filter out ignored domains
-        _CACHED_ALL_ENTITY_IDS = {
-            entity_id
-            for entity_id in combined_entity_ids
-            if not entity_id.startswith(IGNORED_ENTITY_DOMAINS)
+
+_ECTOPLASM_INDEX: EctoplasmIndex | None = None
+_ECTOPLASM_INDEX_STATS: dict[str, Any] = {"lookups": 0}
+
+
+def get_ectoplasm_index() -> EctoplasmIndex:
+    """Return the index of all Spook ectoplasms.
+
+    The index is read from the generated index module, instead of scanning
+    the package on every lookup. Safe to call from any thread.
+    """
+    # pylint: disable-next=global-statement
+    global _ECTOPLASM_INDEX  # noqa: PLW0603
+
+    _ECTOPLASM_INDEX_STATS["lookups"] += 1
+    if _ECTOPLASM_INDEX is None:
+        _ECTOPLASM_INDEX = EctoplasmIndex(
+            ectoplasms=ectoplasm_index.ECTOPLASMS,
+            platforms=ectoplasm_index.PLATFORMS,
+            services=ectoplasm_index.SERVICES,
+            repairs=ectoplasm_index.REPAIRS,
+            integrations=ectoplasm_index.INTEGRATIONS,
+        )
+    return _ECTOPLASM_INDEX
+
+
+async def async_verify_ectoplasm_index(hass: HomeAssistant) -> None:
+    """Verify the ectoplasm index is up to date, by scanning the package.
+
+    Runs after setting up, so the scan doesn't delay startup. If the index
+    is outdated, the scanned index is used from then on.
+    """
+    # pylint: disable-next=global-statement
+    global _ECTOPLASM_INDEX  # noqa: PLW0603
+
+    start = time.perf_counter()
+    scanned = await hass.async_add_executor_job(scan_ectoplasm_index)
+    duration = time.perf_counter() - start
+
+    index = get_ectoplasm_index()
+    lookups = _ECTOPLASM_INDEX_STATS["lookups"] - 1
+    _ECTOPLASM_INDEX_STATS.update(
+        {
+            "scan_duration": round(duration, 4),
+            "up_to_date": scanned == index,
+            # Every lookup would otherwise have scanned the package
+            "time_saved": round(duration * lookups, 4),
         }
-        LOGGER.debug(
-            "Spook's all_entity_ids cache populated with %s entities",
-            len(_CACHED_ALL_ENTITY_IDS),
+    )
+    if scanned != index:
+        LOGGER.warning(
+            "Spook's ectoplasm index is outdated, using a scan of the package "
+            "instead. Please generate the index again"
         )
+        _ECTOPLASM_INDEX = scanned
+        return
+
+    LOGGER.debug(
+        "Spook's ectoplasm index is up to date; using it saved %s package scans, "
+        "about %.1f ms",
+        lookups,
+        duration * lookups * 1000,
+    )
 
-    # Return a copy from the cache, optionally adding ALL/NONE
-    if include_all_none:
-        return _CACHED_ALL_ENTITY_IDS.union({ENTITY_MATCH_ALL, ENTITY_MATCH_NONE})
-    return _CACHED_ALL_ENTITY_IDS.copy()
+
+@callback
+def async_get_ectoplasm_index_stats() -> dict[str, Any]:
+    """Return statistics of the ectoplasm index."""
+    return dict(_ECTOPLASM_INDEX_STATS)
 
 
 async def async_forward_setup_entry(
@@ -235,13 +690,7 @@ async def async_forward_setup_entry(
 
     def _load_all_ectoplasm_modules() -> None:
         """Load all Spook ectoplasm modules."""
-        for module_file in Path(__file__).parent.rglob("ectoplasms/*/__init__.py"):
-            module_path = str(module_file.relative_to(Path(__file__).parent))[
-                :-3
-            ].replace(
-                "/",
-                ".",
-            )
+        for module_path in get_ectoplasm_index().ectoplasms:
             LOGGER.debug("Loading Spook ectoplasm: %s", module_path)
             module = importlib.import_module(f".{module_path}", __package__)
             if hasattr(module, "async_setup_entry"):
@@ -265,13 +714,7 @@ async def async_forward_platform_entry_setups_to_ectoplasm(
 
     def _load_all_ectoplasm_platform_modules() -> None:
         """Load all Spook ectoplasm platform modules."""
-        for module_file in Path(__file__).parent.rglob(f"ectoplasms/*/{platform}.py"):
-            module_path = str(module_file.relative_to(Path(__file__).parent))[
-                :-3
-            ].replace(
-                "/",
-                ".",
-            )
+        for module_path in get_ectoplasm_index().platforms.get(platform, ()):
             LOGGER.debug("Loading Spook %s from ectoplasm: %s", platform, module_path)
             modules.append(importlib.import_module(f".{module_path}", __package__))
             LOGGER.debug("Setting up Spook ectoplasm %s: %s", platform, module_path)
@@ -290,16 +733,16 @@ def link_sub_integrations(hass: HomeAssistant) -> bool:
     LOGGER.debug("Linking up Spook sub integrations")
 
     changes = False
-    for manifest in Path(__file__).parent.rglob("integrations/*/manifest.json"):
-        LOGGER.debug("Linking Spook sub integration: %s", manifest.parent.name)
-        dest = Path(hass.config.config_dir) / "custom_components" / manifest.parent.name
+    for integration in get_ectoplasm_index().integrations:
+        LOGGER.debug("Linking Spook sub integration: %s", integration)
+        dest = Path(hass.config.config_dir) / "custom_components" / integration
         if not dest.exists():
             src = (
                 Path(hass.config.config_dir)
                 / "custom_components"
                 / DOMAIN
                 / "integrations"
-                / manifest.parent.name
+                / integration
             )
             dest.symlink_to(src)
             changes = True
@@ -309,23 +752,25 @@ def link_sub_integrations(hass: HomeAssistant) -> bool:
 def unlink_sub_integrations(hass: HomeAssistant) -> None:
     """Unlink Spook sub integrations."""
     LOGGER.debug("Unlinking Spook sub integrations")
-    for manifest in Path(__file__).parent.rglob("integrations/*/manifest.json"):
-        LOGGER.debug("Unlinking Spook sub integration: %s", manifest.parent.name)
-        dest = Path(hass.config.config_dir) / "custom_components" / manifest.parent.name
+    for integration in get_ectoplasm_index().integrations:
+        LOGGER.debug("Unlinking Spook sub integration: %s", integration)
+        dest = Path(hass.config.config_dir) / "custom_components" / integration
         if dest.exists():
             dest.unlink()
 
 
 @callback
-def async_get_all_area_ids(hass: HomeAssistant) -> set[str]:
+def async_get_all_area_ids(hass: HomeAssistant) -> frozenset[str]:
     """Return all area IDs, known to Home Assistant."""
-    area_registry = ar.async_get(hass)
-    return set(area_registry.areas)
+    return _AREA_IDS.async_get(hass)
 
 
 @callback
 def async_filter_known_area_ids(
-    hass: HomeAssistant, *, area_ids: set[str], known_area_ids: set[str] | None = None
+    hass: HomeAssistant,
+    *,
+    area_ids: set[str],
+    known_area_ids: AbstractSet[str] | None = None,
 ) -> set[str]:
     """Filter out known area IDs."""
     if known_area_ids is None:
@@ -336,10 +781,9 @@ def async_filter_known_area_ids(
 
 
 @callback
-def async_get_all_device_ids(hass: HomeAssistant) -> set[str]:
+def async_get_all_device_ids(hass: HomeAssistant) -> frozenset[str]:
     """Return all device IDs, known to Home Assistant."""
-    device_registry = dr.async_get(hass)
-    return {device.id for device in device_registry.devices.values()}
+    return _DEVICE_IDS.async_get(hass)
 
 
 @callback
@@ -347,7 +791,7 @@ def async_filter_known_device_ids(
     hass: HomeAssistant,
     *,
     device_ids: set[str],
-    known_device_ids: set[str] | None = None,
+    known_device_ids: AbstractSet[str] | None = None,
 ) -> set[str]:
     """Filter out known device IDs."""
     if known_device_ids is None:
@@ -363,12 +807,12 @@ def async_filter_known_device_ids(
 def async_filter_known_entity_ids(
     hass: HomeAssistant,
     entity_ids: Iterable[str],
-    known_entity_ids: set[str] | None = None,
+    known_entity_ids: AbstractSet[str] | None = None,
 ) -> set[str]:
     """Filter out known entity IDs.
 
-    This callback version skips template processing. For template support,
-    use async_filter_known_entity_ids_with_templates instead.
+    Templates aren't processed; their entity IDs are extracted while the
+    references of a config are analyzed.
     """
     if known_entity_ids is None:
         known_entity_ids = async_get_all_entity_ids(hass)
@@ -391,10 +835,9 @@ def async_filter_known_entity_ids(
 
 
 @callback
-def async_get_all_floor_ids(hass: HomeAssistant) -> set[str]:
+def async_get_all_floor_ids(hass: HomeAssistant) -> frozenset[str]:
     """Return all floor IDs, known to Home Assistant."""
-    floor_registry = fr.async_get(hass)
-    return {floor.floor_id for floor in floor_registry.floors.values()}
+    return _FLOOR_IDS.async_get(hass)
 
 
 @callback
@@ -402,11 +845,11 @@ def async_filter_known_floor_ids(
     hass: HomeAssistant,
     *,
     floor_ids: set[str],
-    known_floor_ids: set[str] | None = None,
+    known_floor_ids: AbstractSet[str] | None = None,
 ) -> set[str]:
     """Filter out known floor IDs."""
     if known_floor_ids is None:
-        known_floor_ids = async_get_all_label_ids(hass)
+        known_floor_ids = async_get_all_floor_ids(hass)
     return {
         floor_id
         for floor_id in floor_ids - known_floor_ids
@@ -415,10 +858,9 @@ def async_filter_known_floor_ids(
 
 
 @callback
-def async_get_all_label_ids(hass: HomeAssistant) -> set[str]:
+def async_get_all_label_ids(hass: HomeAssistant) -> frozenset[str]:
     """Return all label IDs, known to Home Assistant."""
-    label_registry = lr.async_get(hass)
-    return {label.label_id for label in label_registry.labels.values()}
+    return _LABEL_IDS.async_get(hass)
 
 
 @callback
@@ -426,7 +868,7 @@ def async_filter_known_label_ids(
     hass: HomeAssistant,
     *,
     label_ids: set[str],
-    known_label_ids: set[str] | None = None,
+    known_label_ids: AbstractSet[str] | None = None,
 ) -> set[str]:
     """Filter out known label IDs."""
     if known_label_ids is None:
@@ -439,18 +881,17 @@ def async_filter_known_label_ids(
 
 
 @callback
-def async_get_all_services(hass: HomeAssistant) -> set[str]:
+def async_get_all_services(hass: HomeAssistant) -> frozenset[str]:
     """Return all services, known to Home Assistant."""
-    return {
-        f"{domain}.{service}"
-        for domain, services in hass.services.async_services().items()
-        for service in services
-    }
+    return _SERVICES.async_get(hass)
 
 
 @callback
 def async_filter_known_services(
-    hass: HomeAssistant, *, services: set[str], known_services: set[str] | None = None
+    hass: HomeAssistant,
+    *,
+    services: set[str],
+    known_services: AbstractSet[str] | None = None,
 ) -> set[str]:
     """Filter out known services."""
     if known_services is None:
@@ -469,184 +910,308 @@ def is_template_string(value: str) -> bool:
     return ("{{" in value and "}}" in value) or ("{%" in value and "%}" in value)
 
 
-async def async_extract_entities_from_template_string(
-    hass: HomeAssistant, template_str: str
-) -> set[str]:
-    """Extract entity IDs from a template string using both RenderInfo and regex analysis.
+# Maximum number of template sources to keep the extracted entities cached for
+TEMPLATE_ENTITIES_CACHE_SIZE = 1024
+
 
-    This function combines two approaches:
-    1. Home Assistant's Template.async_render_to_info() for comprehensive analysis
-    2. Regex patterns to catch entity IDs that might be missed by template parsing
+class TemplateEntitiesCache:
+    """Size-bounded LRU cache of entities extracted from template sources.
 
-    This dual approach ensures maximum coverage of entity dependencies.
+    Entities are extracted from the template source by static analysis only,
+    without rendering. Which string literals count as entity IDs, depends on
+    the known domains though, which grow as integrations are loaded. The
+    cache is therefore cleared whenever the known domains change.
     """
-    if not is_template_string(template_str):
-        return set()
 
-    entities = set()
+    def __init__(self, max_size: int = TEMPLATE_ENTITIES_CACHE_SIZE) -> None:
+        """Initialize the cache."""
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[str, frozenset[str]] = OrderedDict()
+        self._domains: AbstractSet[str] | None = None
+
+    @callback
+    def async_get(
+        self, source: str, domains: AbstractSet[str] | None
+    ) -> frozenset[str] | None:
+        """Return the cached entities for a template source.
+
+        The known domains are those the entities are extracted for.
+        """
+        if domains is not self._domains:
+            if self._entries:
+                self._entries.clear()
+                self.invalidations += 1
+            self._domains = domains
+
+        if (entities := self._entries.get(source)) is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(source)
+        self.hits += 1
+        return entities
+
+    @callback
+    def async_set(self, source: str, entities: frozenset[str]) -> None:
+        """Cache the entities extracted from a template source."""
+        self._entries[source] = entities
+        self._entries.move_to_end(source)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    @callback
+    def async_clear(self) -> None:
+        """Clear the cache."""
+        self._entries.clear()
+
+    @callback
+    def async_get_stats(self) -> dict[str, int]:
+        """Return the cache statistics."""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+_TEMPLATE_ENTITIES_CACHE = TemplateEntitiesCache()
+
+
+@callback
+def async_get_template_entities_cache_stats() -> dict[str, int]:
+    """Return the statistics of the template entities cache."""
+    return _TEMPLATE_ENTITIES_CACHE.async_get_stats()
+
+
+@callback
+def async_get_template_entities(
+    hass: HomeAssistant | None,
+    template_str: str,
+) -> frozenset[str]:
+    """Extract entity IDs from a template, using the template entities cache.
+
+    The returned set is shared and must not be modified.
+
+    The template is analyzed statically, see extract_entities_from_template_ast.
+    If the template can't be parsed, the regex scanner is used as a fallback.
+    """
+    domains = async_get_known_domains(hass) if hass else None
+    if (
+        entities := _TEMPLATE_ENTITIES_CACHE.async_get(template_str, domains)
+    ) is not None:
+        return entities
+
+    entities = extract_template_entities(template_str, domains)
+    _TEMPLATE_ENTITIES_CACHE.async_set(template_str, entities)
+    return entities
+
+
+def extract_template_entities(
+    template_str: str,
+    domains: AbstractSet[str] | None,
+) -> frozenset[str]:
+    """Extract entity IDs from a template, without using the cache.
 
-    # Method 1: Use Home Assistant's RenderInfo analysis
+    Doesn't need Home Assistant, so it can be used outside the event loop.
+    """
     try:
-        template = Template(template_str, hass)
-        render_info = template.async_render_to_info()
-        if render_info and render_info.entities:
-            entities.update(render_info.entities)
-    except TemplateError:
-        # Logged by Home Assistant core
-        pass
-    # pylint: disable-next=broad-exception-caught
-    except Exception as exc:  # noqa: BLE001 - Keep broad for unexpected template issues
-        # Fallback to regex if template rendering fails for other reasons
+        return frozenset(extract_entities_from_template_ast(template_str, domains))
+    except TemplateSyntaxError:
         LOGGER.debug(
-            "Failed to render template '%s...' for entity extraction, "
+            "Failed to parse template '%s...' for entity extraction, "
             "falling back to regex.",
             template_str[:50],
-            exc_info=exc,  # Pass the exception for logging
         )
+        return frozenset(extract_entities_from_template_regex(template_str, domains))
 
-    # Method 2: Use regex patterns to find additional entities
-    try:
-        regex_entities = extract_entities_from_template_regex(template_str)
-        entities.update(regex_entities)
-    # pylint: disable-next=broad-exception-caught
-    except Exception as exc:  # noqa: BLE001 - Keep broad for unexpected regex issues
-        LOGGER.debug(
-            "Failed to extract entities from template '%s...' using regex.",
-            template_str[:50],
-            exc_info=exc,  # Pass the exception for logging
+
+@callback
+def async_get_known_domains(hass: HomeAssistant) -> frozenset[str]:
+    """Return all known entity domains, including all loaded integrations."""
+    # pylint: disable-next=global-statement
+    global _KNOWN_DOMAINS_CACHE  # noqa: PLW0603
+
+    components = hass.config.components
+    if _KNOWN_DOMAINS_CACHE[0] != len(components):
+        _KNOWN_DOMAINS_CACHE = (
+            len(components),
+            _KNOWN_DOMAINS.union(
+                component for component in components if "." not in component
+            ),
         )
+    return _KNOWN_DOMAINS_CACHE[1]
 
-    return entities
+
+# Jinja AST node types that can reference entities
+_TEMPLATE_ENTITY_NODES = (
+    nodes.Call,
+    nodes.Const,
+    nodes.Filter,
+    nodes.Getattr,
+    nodes.Getitem,
+    nodes.Test,
+)
 
 
-def extract_entities_from_template_regex(template_str: str) -> set[str]:
-    """Extract entity IDs from template string using regex patterns.
+def _iter_template_string_constants(node: nodes.Node) -> Iterator[str]:
+    """Iterate over string constants in a template node, or in a literal list."""
+    if isinstance(node, nodes.Const) and isinstance(node.value, str):
+        yield node.value
+    elif isinstance(node, (nodes.List, nodes.Tuple)):
+        for item in node.items:
+            yield from _iter_template_string_constants(item)
 
-    This function uses regex patterns based on Home Assistant's core validation
-    patterns to find entity IDs referenced in template functions. It's designed
-    to complement the RenderInfo analysis by catching entities that might be
-    missed by template parsing.
+
+def _iter_template_arguments_entity_ids(
+    node: nodes.Call | nodes.Filter | nodes.Test,
+    domains: AbstractSet[str],
+) -> Iterator[str]:
+    """Iterate over entity IDs passed to template functions, filters and tests.
+
+    Only the entity ID arguments are looked at, so states, attribute names
+    and other arguments that happen to contain a dot, aren't mistaken for
+    entity IDs. Only entity IDs for the given domains are returned.
     """
-    if not isinstance(template_str, str):
-        return set()
+    if isinstance(node, nodes.Call):
+        if (
+            not isinstance(node.node, nodes.Name)
+            or node.node.name not in _ENTITY_FUNCTIONS
+        ):
+            return
+        name = node.node.name
+        arguments = node.args
+    elif node.name in _ENTITY_FUNCTIONS and node.node is not None:
+        # The filtered or tested value is the first argument
+        name = node.name
+        arguments = [node.node, *node.args]
+    else:
+        return
+
+    if name not in _ENTITY_FUNCTIONS_ALL_ARGUMENTS:
+        arguments = arguments[:1]
+
+    for argument in arguments:
+        for value in _iter_template_string_constants(argument):
+            for entity_id in split_comma_separated_entity_ids(value):
+                if entity_id.partition(".")[0] in domains and valid_entity_id(
+                    entity_id
+                ):
+                    yield entity_id
 
-    entities = set()
-    # Number of capture groups in states.domain.entity pattern
-    domain_entity_groups = 2
-
-    for pattern in ENTITY_ID_TEMPLATE_PATTERNS:
-        matches = re.findall(pattern, template_str, re.IGNORECASE)
-        for match in matches:
-            # Handle the states.domain.entity pattern that captures (domain, object_id)
-            if isinstance(match, tuple) and len(match) == domain_entity_groups:
-                entity_id = f"{match[0]}.{match[1]}"
-            else:
-                entity_id = match
-
-            # For each entity ID (which might be comma-separated), add all valid ones
-            for individual_id in split_comma_separated_entity_ids(entity_id):
-                if valid_entity_id(individual_id):
-                    entities.add(individual_id)
 
-    return entities
+def _template_states_access_entity_id(
+    node: nodes.Getattr | nodes.Getitem,
+    domains: AbstractSet[str],
+) -> str | None:
+    """Return the entity ID accessed as states.domain.object_id.
 
+    Also handles the states.domain['object_id'] notation. Only entity IDs
+    for the given domains are returned.
+    """
+    if not (
+        isinstance(node.node, nodes.Getattr)
+        and isinstance(node.node.node, nodes.Name)
+        and node.node.node.name == "states"
+    ):
+        return None
+    if isinstance(node, nodes.Getattr):
+        object_id = node.attr
+    elif isinstance(node.arg, nodes.Const) and isinstance(node.arg.value, str):
+        object_id = node.arg.value
+    else:
+        return None
+    if node.node.attr in domains and valid_entity_id(
+        entity_id := f"{node.node.attr}.{object_id}"
+    ):
+        return entity_id
+    return None
+
+
+def extract_entities_from_template_ast(
+    template_str: str,
+    domains: AbstractSet[str] | None = None,
+) -> set[str]:
+    """Extract entity IDs from a template string, using static analysis.
 
-async def _process_template_object(
-    template: Template, known_entity_ids: set[str], unknown_entities: set[str]
-) -> None:
-    """Process a Template object and add unknown entities to the set."""
-    template_entities = set()
+    The template is parsed into a Jinja AST once, which is walked to find
+    every possible entity reference, without rendering anything. This finds
+    references in all branches of the template, not just the one that would
+    be rendered given the current state. It finds:
 
-    # Method 1: Use Home Assistant's RenderInfo analysis
-    try:
-        render_info = template.async_render_to_info()
-        template_entities.update(render_info.entities)
-    except TemplateError:
-        LOGGER.debug("Failed to analyze Template object for entities")
-    # pylint: disable-next=broad-exception-caught
-    except Exception:  # noqa: BLE001
-        LOGGER.debug("Unexpected error analyzing Template object for entities")
-
-    # Method 2: Use regex patterns on the template string as fallback
-    try:
-        if hasattr(template, "template") and template.template:
-            regex_entities = extract_entities_from_template_regex(template.template)
-            template_entities.update(regex_entities)
-    # pylint: disable-next=broad-exception-caught
-    except Exception:  # noqa: BLE001
-        LOGGER.debug("Error in regex entity extraction for Template object")
+    - Entity IDs passed to template functions, filters and tests that take
+      entity IDs, like states(), is_state(), state_attr() and expand().
+      Only the entity ID argument is used; for most of them that's the
+      first one, expand(), closest() and distance() take them anywhere.
+    - Attribute access on states, like states.<domain>.<object_id>.
+    - Any other string literal that is an entity ID, for example, in
+      literal lists.
 
-    # Check if any of the template entities are unknown
-    for template_entity in template_entities:
-        if template_entity not in known_entity_ids:
-            unknown_entities.add(template_entity)
+    Only entity IDs for the given domains (or the known domains by default)
+    are returned.
 
+    Raises TemplateSyntaxError if the template can't be parsed.
+    """
+    if domains is None:
+        domains = _KNOWN_DOMAINS
 
-async def _process_template_string(
-    hass: HomeAssistant,
-    template_str: str,
-    known_entity_ids: set[str],
-    unknown_entities: set[str],
-) -> None:
-    """Process a template string and add unknown entities to the set."""
-    template_entities = await async_extract_entities_from_template_string(
-        hass, template_str
-    )
-    # Check if any of the template entities are unknown
-    for template_entity in template_entities:
-        # Handle comma-separated entity lists
-        for entity_id in split_comma_separated_entity_ids(template_entity):
+    entities: set[str] = set()
+    tree = _TEMPLATE_ENVIRONMENT.parse(template_str)
+    for node in tree.find_all(_TEMPLATE_ENTITY_NODES):
+        if isinstance(node, nodes.Const):
             if (
-                entity_id not in known_entity_ids
-                and valid_entity_id(entity_id)
-                and not entity_id.startswith(IGNORED_ENTITY_DOMAINS)
+                isinstance(node.value, str)
+                and node.value.partition(".")[0] in domains
+                and valid_entity_id(node.value)
             ):
-                unknown_entities.add(entity_id)
+                entities.add(node.value)
+        elif isinstance(node, (nodes.Getattr, nodes.Getitem)):
+            if entity_id := _template_states_access_entity_id(node, domains):
+                entities.add(entity_id)
+        else:
+            entities.update(_iter_template_arguments_entity_ids(node, domains))
 
+    return entities
 
-async def async_filter_known_entity_ids_with_templates(
-    hass: HomeAssistant,
-    entity_ids: Iterable[str],
-    known_entity_ids: set[str] | None = None,
+
+def extract_entities_from_template_regex(
+    template_str: str,
+    domains: AbstractSet[str] | None = None,
 ) -> set[str]:
-    """Async version that can process templates to extract entity dependencies.
+    """Extract entity IDs from template string using a precompiled scanner.
 
-    This function processes both regular entity IDs and template strings,
-    extracting entity dependencies from templates using RenderInfo.
+    This function finds all entity IDs referenced in a template in a single
+    pass, using a scanner based on Home Assistant's core validation patterns.
+    Only entity IDs for the given domains (or the known domains by default)
+    are returned. It's used as a fallback for templates that can't be parsed
+    for static analysis.
     """
-    if known_entity_ids is None:
-        known_entity_ids = async_get_all_entity_ids(hass)
-
-    unknown_entities = set()
+    if not isinstance(template_str, str):
+        return set()
 
-    for entity_id_raw in entity_ids:
-        # Handle Template objects
-        if isinstance(entity_id_raw, Template):
-            await _process_template_object(
-                entity_id_raw, known_entity_ids, unknown_entities
-            )
-            continue
+    if domains is None:
+        domains = _KNOWN_DOMAINS
 
-        if not isinstance(entity_id_raw, str):
-            continue
-
-        # Check if this looks like a template string
-        if is_template_string(entity_id_raw):
-            await _process_template_string(
-                hass, entity_id_raw, known_entity_ids, unknown_entities
-            )
+    entities = set()
+    for match in _ENTITY_ID_TEMPLATE_SCANNER.finditer(template_str):
+        if (domain := match["domain"]) is not None:
+            object_id = match["object_id"]
         else:
-            # Process as regular entity ID(s), handling comma-separated lists
-            for entity_id in split_comma_separated_entity_ids(entity_id_raw):
-                if (
-                    not entity_id.startswith(IGNORED_ENTITY_DOMAINS)
-                    and entity_id not in known_entity_ids
-                    and valid_entity_id(entity_id)
-                ):
-                    # Process as regular entity ID
-                    unknown_entities.add(entity_id)
+            domain = match["states_domain"]
+            object_id = match["states_object_id"]
+
+        if domain in domains and valid_entity_id(entity_id := f"{domain}.{object_id}"):
+            entities.add(entity_id)
 
-    return unknown_entities
+    return entities
 
 
 def split_comma_separated_entity_ids(entity_id: str) -> list[str]:
@@ -672,54 +1237,6 @@ def split_comma_separated_entity_ids(entity_id: str) -> list[str]:
     return [entity_id]
 
 
-def extract_template_strings_from_config(
-    config: Any, strings: list[str] | None = None
-) -> list[str]:
-    """Recursively extract template strings from configuration data."""
-    if strings is None:
-        strings = []
-
-    if isinstance(config, str):
-        if is_template_string(config):  # Uses the util's is_template_string
-            strings.append(config)
-    elif isinstance(config, dict):
-        for value in config.values():
-            extract_template_strings_from_config(value, strings)
-    elif isinstance(config, (list, tuple)):
-        for item in config:
-            extract_template_strings_from_config(item, strings)
-    return strings
-
-
-async def async_extract_entities_from_config(
-    hass: HomeAssistant, config: Any
-) -> set[str]:
-    """Extract all entity IDs referenced in templates within a configuration structure."""
-    entities = set()
-    if not config:
-        return entities
-
-    template_strings = extract_template_strings_from_config(config)
-    for template_str in template_strings:
-        try:
-            # async_extract_entities_from_template_string already handles
-            # TemplateError and other exceptions internally, logging them.
-            referenced_entities = await async_extract_entities_from_template_string(
-                hass, template_str
-            )
-            entities.update(referenced_entities)
-        # pylint: disable-next=broad-exception-caught
-        except Exception as exc:  # noqa: BLE001 - Keep broad for unexpected issues
-            # This catch is a safeguard; internal function should handle most.
-            LOGGER.debug(
-                "Unexpected error extracting entities from template string "
-                "'%s...' in config: %s",
-                template_str[:50],
-                exc,  # Pass the exception for logging
-            )
-    return entities
-
-
 @callback
 def async_find_services_in_sequence(  # noqa: C901
     sequence: Sequence[dict[str, Any]],
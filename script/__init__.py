@@ -0,0 +1 @@
+"""Spook - Your homie. Development scripts."""
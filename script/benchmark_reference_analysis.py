@@ -0,0 +1,152 @@
+"""Benchmark analyzing references in worker processes.
+
+Compares the time the event loop spends analyzing automation configurations
+itself, with the time it spends when the analysis is sent to worker
+processes (serializing the configurations), and the time it takes for the
+results to come back (including the IPC).
+
+Run from the root of the repository:
+
+    uv run python -m script.benchmark_reference_analysis --workers 2
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import sys
+import time
+from typing import Any
+
+from custom_components.spook.references import (
+    _serialize_for_analysis,
+    _walk_automation_config,
+    analyze_configs,
+)
+from custom_components.spook.util import KNOWN_DOMAINS, extract_template_entities
+
+
+def _automation(index: int) -> dict[str, Any]:
+    """Return a synthetic automation configuration."""
+    return {
+        "id": f"benchmark_{index}",
+        "alias": f"Benchmark {index}",
+        "triggers": [
+            {"trigger": "state", "entity_id": f"binary_sensor.motion_{index}"},
+            {
+                "trigger": "template",
+                "value_template": (
+                    f"{{{{ states('sensor.temperature_{index}') | float > 20 "
+                    f"and is_state('input_boolean.enabled_{index}', 'on') }}}}"
+                ),
+            },
+        ],
+        "conditions": [
+            {"condition": "state", "entity_id": "sun.sun", "state": "below_horizon"}
+        ],
+        "actions": [
+            {
+                "action": "light.turn_on",
+                "target": {"entity_id": [f"light.room_{index}", "light.hallway"]},
+                "data": {
+                    "brightness_pct": (
+                        f"{{{{ state_attr('light.room_{index}', 'brightness') }}}}"
+                    )
+                },
+            },
+            {
+                "choose": [
+                    {
+                        "conditions": [
+                            {
+                                "condition": "template",
+                                "value_template": (
+                                    f"{{{{ expand('group.room_{index}') "
+                                    "| selectattr('state', 'eq', 'on') | list }}"
+                                ),
+                            }
+                        ],
+                        "sequence": [
+                            {
+                                "action": "notify.mobile_app",
+                                "data": {"message": f"Room {index} is occupied"},
+                            }
+                        ],
+                    }
+                ],
+            },
+        ],
+    }
+
+
+def _analyze_in_loop(configs: list[dict[str, Any]], domains: frozenset[str]) -> float:
+    """Analyze configurations the way the event loop does, returns the time."""
+    start = time.perf_counter()
+    for config in configs:
+        templates: set[str] = set()
+        entities: set[str] = set()
+        _walk_automation_config(config, templates, entities)
+        for template in templates:
+            entities.update(extract_template_entities(template, domains))
+    return time.perf_counter() - start
+
+
+def _analyze_offloaded(
+    executor: ProcessPoolExecutor,
+    workers: int,
+    configs: list[dict[str, Any]],
+    domains: frozenset[str],
+) -> tuple[float, float, float]:
+    """Analyze configurations in worker processes.
+
+    Returns the time spent serializing, waiting for the workers and the time
+    spent in the workers.
+    """
+    start = time.perf_counter()
+    serialized = [(True, _serialize_for_analysis(config)) for config in configs]
+    serialize_time = time.perf_counter() - start
+
+    size = -(-len(serialized) // workers)
+    start = time.perf_counter()
+    futures = [
+        executor.submit(analyze_configs, serialized[index : index + size], domains)
+        for index in range(0, len(serialized), size)
+    ]
+    worker_time = sum(future.result()[1] for future in futures)
+    return serialize_time, time.perf_counter() - start, worker_time
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 250, 1000, 5000])
+    args = parser.parse_args()
+
+    domains = frozenset(KNOWN_DOMAINS)
+    with ProcessPoolExecutor(
+        max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        # Start the workers, so starting them isn't part of the benchmark
+        for future in [executor.submit(time.perf_counter) for _ in range(args.workers)]:
+            future.result()
+
+        sys.stdout.write(
+            f"{'configs':>8} {'in loop':>10} {'serialize':>10} "
+            f"{'wait':>10} {'workers':>10} {'loop saved':>11}\n"
+        )
+        for size in args.sizes:
+            configs = [_automation(index) for index in range(size)]
+            in_loop = _analyze_in_loop(configs, domains)
+            serialize, wait, worker = _analyze_offloaded(
+                executor, args.workers, configs, domains
+            )
+            sys.stdout.write(
+                f"{size:>8} {in_loop * 1000:>8.1f}ms {serialize * 1000:>8.1f}ms "
+                f"{wait * 1000:>8.1f}ms {worker * 1000:>8.1f}ms "
+                f"{(in_loop - serialize) * 1000:>9.1f}ms\n"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Benchmark scanning templates for entity IDs.
+
+Compares the single pass scanner of extract_entities_from_template_regex
+with the four regex passes it replaced, on a corpus of real-world templates
+(script/template_corpus.json). Both have to find the same entity IDs for
+every template in the corpus. The static analysis of the template AST is
+measured as well, for reference; it has to find exactly the entity IDs the
+corpus lists for each template, so states and attribute names that contain
+a dot aren't mistaken for entity IDs.
+
+Run from the root of the repository:
+
+    uv run python -m script.benchmark_template_entities --number 2000
+"""
+
+import argparse
+import json
+from pathlib import Path
+import re
+import sys
+import timeit
+from typing import Any
+
+from custom_components.spook.util import (
+    KNOWN_DOMAINS,
+    extract_entities_from_template_ast,
+    extract_entities_from_template_regex,
+    split_comma_separated_entity_ids,
+)
+
+from homeassistant.core import valid_entity_id
+
+CORPUS = Path(__file__).parent / "template_corpus.json"
+
+# The previous implementation: four passes, each with a regex alternation
+# of all known domains.
+_OBJECT_ID = r"(?!_)[\da-z_]+(?<!_)"
+_DOMAIN = r"(?:" + "|".join(KNOWN_DOMAINS) + r")"
+_ENTITY_ID_PATTERN = _DOMAIN + r"\." + _OBJECT_ID
+_ENTITY_FUNCTIONS = [
+    "states",
+    "is_state",
+    "state_attr",
+    "is_state_attr",
+    "has_value",
+    "state_translated",
+    "device_id",
+    "device_name",
+    "device_attr",
+    "is_device_attr",
+    "config_entry_id",
+    "area_id",
+    "area_name",
+    "floor_id",
+    "floor_name",
+    "is_hidden_entity",
+    "expand",
+    "distance",
+    "closest",
+]
+_PREVIOUS_PATTERNS = [
+    rf"(?:{'|'.join(_ENTITY_FUNCTIONS)})\s*\(\s*['\"]({_ENTITY_ID_PATTERN})['\"]",
+    rf"states\.({_DOMAIN})\.({_OBJECT_ID})(?:\.state|\.attributes)",
+    rf"['\"]({_ENTITY_ID_PATTERN})['\"]",
+    rf"['\"]({_ENTITY_ID_PATTERN})['\"](?:\s*\|\s*(?:{'|'.join(_ENTITY_FUNCTIONS)}))",
+]
+
+
+def _previous_extract(template_str: str) -> set[str]:
+    """Extract entity IDs from a template, the way it was done previously."""
+    entities = set()
+    for pattern in _PREVIOUS_PATTERNS:
+        for match in re.findall(pattern, template_str, re.IGNORECASE):
+            entity_id = f"{match[0]}.{match[1]}" if isinstance(match, tuple) else match
+            for individual_id in split_comma_separated_entity_ids(entity_id):
+                if valid_entity_id(individual_id):
+                    entities.add(individual_id)
+    return entities
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--corpus", type=Path, default=CORPUS)
+    args = parser.parse_args()
+
+    corpus: list[dict[str, Any]] = json.loads(args.corpus.read_text())
+    templates: list[str] = [item["template"] for item in corpus]
+    domains = frozenset(KNOWN_DOMAINS)
+
+    for item in corpus:
+        template = item["template"]
+        previous = _previous_extract(template)
+        scanner = extract_entities_from_template_regex(template, domains)
+        if previous != scanner:
+            sys.stdout.write(
+                f"Results differ for {template!r}\n"
+                f"  previous: {sorted(previous)}\n"
+                f"  scanner:  {sorted(scanner)}\n"
+            )
+            return 1
+        static = extract_entities_from_template_ast(template, domains)
+        if static != set(item["entities"]):
+            sys.stdout.write(
+                f"Static analysis is wrong for {template!r}\n"
+                f"  expected: {sorted(item['entities'])}\n"
+                f"  found:    {sorted(static)}\n"
+            )
+            return 1
+
+    runs = {
+        "previous": lambda: [_previous_extract(template) for template in templates],
+        "scanner": lambda: [
+            extract_entities_from_template_regex(template, domains)
+            for template in templates
+        ],
+        "static": lambda: [
+            extract_entities_from_template_ast(template, domains)
+            for template in templates
+        ],
+    }
+    sys.stdout.write(f"{len(templates)} templates, {args.number} runs\n")
+    timings = {
+        name: timeit.timeit(run, number=args.number) / args.number / len(templates)
+        for name, run in runs.items()
+    }
+    for name, timing in timings.items():
+        sys.stdout.write(
+            f"{name:>9}: {timing * 1e6:>6.1f}us per template "
+            f"({timings['previous'] / timing:.1f}x)\n"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""Generate the Spook ectoplasm index.
+
+Run from the root of the repository, after adding or removing ectoplasms,
+platform, service or repair modules:
+
+    uv run python -m script.generate_ectoplasm_index
+"""
+
+from pathlib import Path
+import subprocess
+import sys
+
+from custom_components.spook.util import render_ectoplasm_index, scan_ectoplasm_index
+
+INDEX_FILE = Path("custom_components/spook/ectoplasm_index.py")
+
+
+def main() -> int:
+    """Generate the ectoplasm index, returns 1 if it changed."""
+    previous = INDEX_FILE.read_text(encoding="utf-8") if INDEX_FILE.exists() else ""
+    INDEX_FILE.write_text(
+        render_ectoplasm_index(scan_ectoplasm_index()), encoding="utf-8"
+    )
+    subprocess.run(["ruff", "format", str(INDEX_FILE)], check=True)  # noqa: S603, S607
+    if INDEX_FILE.read_text(encoding="utf-8") == previous:
+        return 0
+    sys.stdout.write(f"Generated {INDEX_FILE}\n")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())